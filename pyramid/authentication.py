@@ -30,6 +30,7 @@ from pyramid.interfaces import (
 from pyramid.security import (
     Authenticated,
     Everyone,
+    _cached,
     )
 
 from pyramid.util import strings_differ
@@ -56,6 +57,13 @@ class CallbackAuthenticationPolicy(object):
             princid = None
         return princid
 
+    def _groups(self, userid, request):
+        # the callback is shared by authenticated_userid and
+        # effective_principals, so it is only called once per request when
+        # authentication results are cached
+        return _cached(request, (id(self), 'callback', userid),
+                       self.callback, userid, request)
+
     def authenticated_userid(self, request):
         """ Return the authenticated userid or ``None``.
 
@@ -88,7 +96,7 @@ class CallbackAuthenticationPolicy(object):
                 'authenticated_userid',
                 request)
             return userid
-        callback_ok = self.callback(userid, request)
+        callback_ok = self._groups(userid, request)
         if callback_ok is not None: # is not None!
             debug and self._log(
                 'groupfinder callback returned %r; returning %r' % (
@@ -155,7 +163,7 @@ class CallbackAuthenticationPolicy(object):
                 request)
             groups = []
         else:
-            groups = self.callback(userid, request)
+            groups = self._groups(userid, request)
             debug and self._log(
                 'groupfinder callback returned %r as groups' % (groups,),
                 'effective_principals',
@@ -216,6 +224,12 @@ class RepozeWho1AuthenticationPolicy(CallbackAuthenticationPolicy):
     def _get_identity(self, request):
         return request.environ.get('repoze.who.identity')
 
+    def _groups(self, identity, request):
+        # the callback is passed the identity rather than the userid
+        return _cached(request,
+                       (id(self), 'callback', identity['repoze.who.userid']),
+                       self.callback, identity, request)
+
     def _get_identifier(self, request):
         plugins = request.environ.get('repoze.who.plugins')
         if plugins is None:
@@ -262,7 +276,7 @@ class RepozeWho1AuthenticationPolicy(CallbackAuthenticationPolicy):
         if self.callback is None:
             return userid
 
-        if self.callback(identity, request) is not None: # is not None!
+        if self._groups(identity, request) is not None: # is not None!
             return userid
 
     def unauthenticated_userid(self, request):
@@ -300,7 +314,7 @@ class RepozeWho1AuthenticationPolicy(CallbackAuthenticationPolicy):
         if self.callback is None:
             groups = []
         else:
-            groups = self.callback(identity, request)
+            groups = self._groups(identity, request)
 
         if groups is None: # is None!
             self.debug and self._log(
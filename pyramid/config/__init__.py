@@ -49,6 +49,7 @@ from pyramid.registry import (
     Introspectable,
     Introspector,
     Registry,
+    _make_view_miss_cache,
     undefer,
     )
 
@@ -65,6 +66,8 @@ from pyramid.util import (
     object_description,
     )
 
+from pyramid.view import _precompute_views
+
 from pyramid.config.adapters import AdaptersConfiguratorMixin
 from pyramid.config.assets import AssetsConfiguratorMixin
 from pyramid.config.factories import FactoriesConfiguratorMixin
@@ -365,7 +368,11 @@ class Configurator(
 
         self._fix_registry()
 
-        self._set_settings(settings)
+        settings = self._set_settings(settings)
+
+        registry.view_miss_cache_size = int(
+            settings.get('pyramid.view_miss_cache_size', 0))
+        registry._clear_view_lookup_cache()
 
         if isinstance(debug_logger, string_types):
             debug_logger = logging.getLogger(debug_logger)
@@ -377,6 +384,7 @@ class Configurator(
 
         self.add_default_response_adapters()
         self.add_default_renderers()
+        self.add_default_fragment_cache()
         self.add_default_view_predicates()
         self.add_default_route_predicates()
 
@@ -492,6 +500,7 @@ class Configurator(
         if not hasattr(_registry, '_clear_view_lookup_cache'):
             def _clear_view_lookup_cache():
                 _registry._view_lookup_cache = {}
+                _registry.view_miss_cache = _make_view_miss_cache(_registry)
             _registry._clear_view_lookup_cache = _clear_view_lookup_cache
 
 
@@ -973,14 +982,26 @@ class Configurator(
         scanner.scan(package, categories=categories, onerror=onerror,
                      ignore=ignore)
 
-    def make_wsgi_app(self):
+    def make_wsgi_app(self, precompute_views=False):
         """ Commits any pending configuration statements, sends a
         :class:`pyramid.events.ApplicationCreated` event to all listeners,
         adds this configuration's registry to
         :attr:`pyramid.config.global_registries`, and returns a
         :app:`Pyramid` WSGI application representing the committed
-        configuration state."""
+        configuration state.
+
+        If ``precompute_views`` is ``True``, the views matching each
+        combination of request type, context type and view name used in the
+        committed view configuration are looked up ahead of time, rather than
+        by the first request which needs them.  This makes the application
+        slower to create but avoids slow first requests.
+
+        .. versionadded:: 1.7
+           The ``precompute_views`` argument.
+        """
         self.commit()
+        if precompute_views:
+            _precompute_views(self.registry)
         app = Router(self.registry)
 
         # Allow tools like "pshell development.ini" to find the 'last'
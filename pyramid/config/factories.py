@@ -190,6 +190,7 @@ class FactoriesConfiguratorMixin(object):
 
             plist = exts.descriptors if property else exts.methods
             plist[name] = callable
+            exts._request_classes.clear()
 
         if callable is None:
             self.action(('request extensions', name), None)
@@ -237,3 +238,5 @@ class _RequestExtensions(object):
     def __init__(self):
         self.descriptors = {}
         self.methods = {}
+        # request class -> subclass with the extensions applied
+        self._request_classes = {}
@@ -1,4 +1,5 @@
 from pyramid.interfaces import (
+    IFragmentCache,
     IRendererFactory,
     PHASE1_CONFIG,
     )
@@ -15,7 +16,16 @@ class RenderingConfiguratorMixin(object):
     def add_default_renderers(self):
         for name, renderer in DEFAULT_RENDERERS:
             self.add_renderer(name, renderer)
-    
+
+    def add_default_fragment_cache(self):
+        settings = self.registry.settings or {}
+        size = int(settings.get('pyramid.fragment_cache_size', 1000))
+        if size:
+            ttl = settings.get('pyramid.fragment_cache_ttl')
+            if ttl is not None:
+                ttl = float(ttl)
+            self.set_fragment_cache(renderers.FragmentCache(size, ttl))
+
     @action_method
     def add_renderer(self, name, factory):
         """
@@ -49,3 +59,30 @@ class RenderingConfiguratorMixin(object):
         self.action((IRendererFactory, name), register, order=PHASE1_CONFIG,
                     introspectables=(intr,))
 
+    @action_method
+    def set_fragment_cache(self, cache):
+        """
+        Set the :class:`~pyramid.interfaces.IFragmentCache` used by
+        :func:`pyramid.renderers.render_cached`.  The ``cache`` argument
+        is the cache object or a :term:`dotted Python name` to same, or
+        ``None`` to disable fragment caching.
+
+        By default, a :class:`pyramid.renderers.FragmentCache` is used, with
+        the size given by the ``pyramid.fragment_cache_size`` setting and
+        the time to live given by the ``pyramid.fragment_cache_ttl``
+        setting.
+
+        .. versionadded:: 1.7
+        """
+        cache = self.maybe_dotted(cache)
+        def register():
+            if cache is None:
+                self.registry.unregisterUtility(provided=IFragmentCache)
+            else:
+                self.registry.registerUtility(cache, IFragmentCache)
+        intr = self.introspectable('fragment cache', None,
+                                   self.object_description(cache),
+                                   'fragment cache')
+        intr['cache'] = cache
+        self.action(IFragmentCache, register, introspectables=(intr,))
+
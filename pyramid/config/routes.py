@@ -40,6 +40,7 @@ class RoutesConfiguratorMixin(object):
                   path=None,
                   pregenerator=None,
                   static=False,
+                  host=None,
                   **predicates):
         """ Add a :term:`route configuration` to the current
         configuration state, as well as possibly a :term:`view
@@ -232,6 +233,19 @@ class RoutesConfiguratorMixin(object):
           case of the header name is not significant.  If this
           predicate returns ``False``, route matching continues.
 
+        host
+
+          A host name (e.g. ``example.com``), a host name wildcard (e.g.
+          ``*.example.com``, which matches any subdomain of ``example.com``
+          but not ``example.com`` itself) or a sequence of these.  If this
+          argument is specified, the route will only match requests whose
+          ``Host`` header (ignoring case and any port number) matches one of
+          the values; the route is not even tried for requests to other
+          hosts.  Routes without a ``host`` are tried for requests to any
+          host, in the order in which all routes were added.
+
+          .. versionadded:: 1.7
+
         effective_principals
 
           If specified, this value should be a :term:`principal` identifier or
@@ -293,6 +307,15 @@ class RoutesConfiguratorMixin(object):
         if request_method is not None:
             request_method = as_sorted_tuple(request_method)
 
+        if host is not None:
+            host = as_sorted_tuple(host)
+            for each in host:
+                wildcard = each.startswith('*.')
+                if not each or '*' in (each[2:] if wildcard else each):
+                    raise ConfigurationError(
+                        'Invalid host %r: a host must be a host name or a '
+                        'host name preceded by "*."' % (each,))
+
         factory = self.maybe_dotted(factory)
         if pattern is None:
             pattern = path
@@ -358,6 +381,7 @@ class RoutesConfiguratorMixin(object):
         intr['pregenerator'] = pregenerator
         intr['static'] = static
         intr['use_global_views'] = use_global_views
+        intr['host'] = host
 
         if static is True:
             intr['external_url'] = external_url
@@ -384,6 +408,9 @@ class RoutesConfiguratorMixin(object):
                 request_iface = route_request_iface(name, bases)
                 self.registry.registerUtility(
                     request_iface, IRouteRequest, name=name)
+                # routers remember the request interface of each route
+                # alongside the current view lookup cache
+                self.registry._clear_view_lookup_cache()
 
         def register_connect():
             pvals = predicates.copy()
@@ -402,9 +429,14 @@ class RoutesConfiguratorMixin(object):
 
             predlist = self.get_predlist('route')
             _, preds, _ = predlist.make(self, **pvals)
+            kw = {}
+            if host is not None:
+                # mappers which predate the host argument still work for
+                # routes without a host
+                kw['host'] = host
             route = mapper.connect(
                 name, pattern, factory, predicates=preds,
-                pregenerator=pregenerator, static=static
+                pregenerator=pregenerator, static=static, **kw
                 )
             intr['object'] = route
             return route
@@ -465,7 +497,16 @@ class RoutesConfiguratorMixin(object):
         this configurator's :term:`registry`."""
         mapper = self.registry.queryUtility(IRoutesMapper)
         if mapper is None:
-            mapper = RoutesMapper()
+            settings = self.registry.settings or {}
+            matching = settings.get('pyramid.route_matching', 'prefix')
+            cache_size = settings.get('pyramid.route_match_cache_size', 0)
+            try:
+                mapper = RoutesMapper(
+                    matching=matching,
+                    cache_size=int(cache_size),
+                    )
+            except ValueError as e:
+                raise ConfigurationError(e.args[0])
             self.registry.registerUtility(mapper, IRoutesMapper)
         return mapper
 
@@ -123,6 +123,11 @@ class Settings(dict):
         eff_prevent_cachebust = asbool(eget('PYRAMID_PREVENT_CACHEBUST',
                                              config_prevent_cachebust))
 
+        eff_cache_authentication = asbool(
+            self.get('pyramid.cache_authentication', False))
+
+        eff_auto_etag = asbool(self.get('pyramid.auto_etag', False))
+
         update = {
             'debug_authorization': eff_debug_all or eff_debug_auth,
             'debug_notfound': eff_debug_all or eff_debug_notfound,
@@ -145,6 +150,8 @@ class Settings(dict):
             'pyramid.default_locale_name':eff_locale_name,
             'pyramid.prevent_http_cache':eff_prevent_http_cache,
             'pyramid.prevent_cachebust':eff_prevent_cachebust,
+            'pyramid.cache_authentication':eff_cache_authentication,
+            'pyramid.auto_etag':eff_auto_etag,
             }
 
         self.update(update)
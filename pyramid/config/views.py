@@ -1,8 +1,14 @@
+import datetime
 import inspect
 import operator
 import os
 import warnings
 
+from repoze.lru import (
+    ExpiringLRUCache,
+    LRUCache,
+    )
+
 from zope.interface import (
     Interface,
     implementedBy,
@@ -37,6 +43,7 @@ from pyramid import renderers
 from pyramid.static import PathSegmentMd5CacheBuster
 
 from pyramid.compat import (
+    exec_,
     string_types,
     urlparse,
     url_quote,
@@ -54,6 +61,7 @@ from pyramid.exceptions import (
 from pyramid.httpexceptions import (
     HTTPForbidden,
     HTTPNotFound,
+    HTTPNotModified,
     default_exceptionresponse_view,
     )
 
@@ -64,7 +72,10 @@ from pyramid.registry import (
 
 from pyramid.response import Response
 
-from pyramid.security import NO_PERMISSION_REQUIRED
+from pyramid.security import (
+    NO_PERMISSION_REQUIRED,
+    _call_policy,
+    )
 from pyramid.static import static_view
 from pyramid.threadlocal import get_current_registry
 
@@ -92,6 +103,8 @@ from pyramid.config.util import (
 urljoin = urlparse.urljoin
 url_parse = urlparse.urlparse
 
+_marker = object()
+
 def view_description(view):
     try:
         return view.__text__
@@ -130,8 +143,8 @@ def preserve_view_attrs(view, wrapper):
     # attrs that may not exist on "view", but, if so, must be attached to
     # "wrapped view"
     for attr in ('__permitted__', '__call_permissive__', '__permission__',
-                 '__predicated__', '__predicates__', '__accept__',
-                 '__order__', '__text__'):
+                 '__predicated__', '__predicates__', '__call_unpredicated__',
+                 '__accept__', '__order__', '__text__'):
         try:
             setattr(wrapper, attr, getattr(view, attr))
         except AttributeError:
@@ -148,16 +161,27 @@ class ViewDeriver(object):
         self.logger = self.registry.queryUtility(IDebugLogger)
 
     def __call__(self, view):
+        view = self.mapped_view(view)
+        if self.kw.get('decorator') is None:
+            to_response = self.result_converter(view)
+        else:
+            # the decorator wraps the rendered view, so rendering can't be
+            # done by the fused view
+            view = self.decorated_view(self.rendered_view(view))
+            to_response = None
+        derived_view = self.fused_view(
+            view,
+            to_response=to_response,
+            response_cache=self.response_cache(),
+            http_cache=self.http_cache(),
+            wrapper_viewname=self.kw.get('wrapper_viewname'),
+            auto_etag=self.auto_etag(),
+            permitted=self.permitted(),
+            authdebug=self.authdebug(),
+            predicates=self.kw.get('predicates', ()),
+            )
         return self.attr_wrapped_view(
-            self.predicated_view(
-                self.authdebug_view(
-                    self.secured_view(
-                        self.owrapped_view(
-                            self.http_cached_view(
-                                self.decorated_view(
-                                    self.rendered_view(
-                                        self.mapped_view(
-                                            view)))))))))
+            derived_view, fused=derived_view is not view)
 
     @wraps_view
     def mapped_view(self, view):
@@ -172,14 +196,154 @@ class ViewDeriver(object):
         mapped_view = mapper(**self.kw)(view)
         return mapped_view
 
-    @wraps_view
-    def owrapped_view(self, view):
-        wrapper_viewname = self.kw.get('wrapper_viewname')
-        viewname = self.kw.get('viewname')
-        if not wrapper_viewname:
+    def fused_view(self, view, to_response=None, response_cache=None,
+                   http_cache=None, wrapper_viewname=None, auto_etag=None,
+                   permitted=None, authdebug=None, predicates=()):
+        """ Return a single view callable which calls ``view`` and performs
+        each of the stages given around it, or ``view`` itself if none are
+        given.  Only the code of the stages given is generated; from the
+        outside in, they are:
+
+        - ``predicates``: raise :exc:`PredicateMismatch` unless every
+          predicate is true.
+
+        - ``authdebug``: a callable logging the authorization decision.
+
+        - ``permitted``: a callable returning a true value if the view may
+          be called; if not, :exc:`HTTPForbidden` is raised.
+
+        - ``auto_etag``: an :class:`AutoETag` setting the ``ETag`` of the
+          response and answering a matching ``If-None-Match`` header.
+
+        - ``wrapper_viewname``: the name of a view rendering the response
+          of the view within itself.
+
+        - ``http_cache``: ``(seconds, options)`` for
+          ``response.cache_expires``.
+
+        - ``response_cache``: a :class:`ResponseCache` whose responses are
+          returned instead of calling ``view``.
+
+        - ``to_response``: a callable converting a result of ``view`` which
+          is not a :class:`pyramid.response.Response` into a response.
+
+        The ``__call_permissive__`` and ``__call_unpredicated__`` attributes
+        of the fused view are fused views of the stages below security and
+        predicates, respectively."""
+        if not (to_response or response_cache or http_cache or
+                wrapper_viewname or auto_etag or permitted or authdebug or
+                predicates):
             return view
-        def _owrapped_view(context, request):
-            response = view(context, request)
+
+        view_name = getattr(view, '__name__', view)
+        namespace = {
+            'view': view,
+            'view_name': view_name,
+            'Response': Response,
+            }
+        body = []
+        if predicates:
+            namespace['predicates'] = predicates
+            namespace['PredicateMismatch'] = PredicateMismatch
+            body.extend([
+                'for predicate in predicates:',
+                '    if not predicate(context, request):',
+                '        raise PredicateMismatch(',
+                "            'predicate mismatch for view %s (%s)' % (",
+                '                view_name, predicate.text()))',
+                ])
+        if authdebug:
+            namespace['authdebug'] = authdebug
+            body.append('authdebug(context, request)')
+        if permitted:
+            namespace['permitted'] = permitted
+            namespace['HTTPForbidden'] = HTTPForbidden
+            namespace['forbidden_msg'] = (
+                'Unauthorized: %s failed permission check' % view_name)
+            body.extend([
+                'result = permitted(context, request)',
+                'if not result:',
+                "    msg = getattr(request, 'authdebug_message',"
+                " forbidden_msg)",
+                '    raise HTTPForbidden(msg, result=result)',
+                ])
+        cache_expires = []
+        if http_cache:
+            namespace['seconds'], namespace['options'] = http_cache
+            cache_expires.extend([
+                "if not getattr(response.cache_control, 'prevent_auto',"
+                " False):",
+                '    response.cache_expires(seconds, **options)',
+                ])
+        if auto_etag:
+            namespace['auto_etag'] = auto_etag
+            if auto_etag.key is None:
+                body.append('etag = None')
+            else:
+                # answer with a 304 before calling the view if the etag
+                # computed from the request alone matches
+                body.extend([
+                    'etag = auto_etag.key(request)',
+                    'if auto_etag.matches(request, etag):',
+                    '    response = auto_etag.not_modified(etag)',
+                    ])
+                body.extend('    ' + line for line in cache_expires)
+                body.append('    return response')
+        call = ['response = view(context, request)']
+        if to_response:
+            namespace['to_response'] = to_response
+            call.extend([
+                'if response.__class__ is not Response:',
+                '    response = to_response(context, request, response)',
+                ])
+        if response_cache:
+            namespace['response_cache'] = response_cache
+            body.extend([
+                'key, response = response_cache.get(request)',
+                'if response is None:',
+                ])
+            body.extend('    ' + line for line in call)
+            body.extend([
+                '    if key is not None:',
+                '        response_cache.put(key, request, response)',
+                ])
+        else:
+            body.extend(call)
+        body.extend(cache_expires)
+        if wrapper_viewname:
+            namespace['owrap'] = self.owrapper(
+                self.fused_view(view, to_response, response_cache,
+                                http_cache),
+                wrapper_viewname)
+            body.append('response = owrap(context, request, response)')
+        if auto_etag:
+            body.append('response = auto_etag(request, response, etag)')
+        body.append('return response')
+        source = 'def derived_view(context, request):\n%s\n' % (
+            '\n'.join('    ' + line for line in body))
+        exec_(source, namespace)
+        derived_view = preserve_view_attrs(view, namespace['derived_view'])
+
+        if permitted:
+            derived_view.__call_permissive__ = self.fused_view(
+                view, to_response, response_cache, http_cache,
+                wrapper_viewname, auto_etag)
+            derived_view.__permitted__ = permitted
+            derived_view.__permission__ = self.permission()
+        if predicates:
+            def checker(context, request):
+                return all((predicate(context, request) for predicate in
+                            predicates))
+            derived_view.__predicated__ = checker
+            derived_view.__predicates__ = predicates
+            derived_view.__call_unpredicated__ = self.fused_view(
+                view, to_response, response_cache, http_cache,
+                wrapper_viewname, auto_etag, permitted, authdebug)
+        return derived_view
+
+    def owrapper(self, view, wrapper_viewname):
+        viewname = self.kw.get('viewname')
+        def owrap(context, request, response):
             request.wrapped_response = response
             request.wrapped_body = response.body
             request.wrapped_view = view
@@ -190,17 +354,16 @@ class ViewDeriver(object):
                     'No wrapper view named %r found when executing view '
                     'named %r' % (wrapper_viewname, viewname))
             return wrapped_response
-        return _owrapped_view
+        return owrap
 
-    @wraps_view
-    def http_cached_view(self, view):
+    def http_cache(self):
         if self.registry.settings.get('prevent_http_cache', False):
-            return view
+            return None
 
         seconds = self.kw.get('http_cache')
 
         if seconds is None:
-            return view
+            return None
 
         options = {}
 
@@ -212,67 +375,89 @@ class ViewDeriver(object):
                     'If http_cache parameter is a tuple or list, it must be '
                     'in the form (seconds, options); not %s' % (seconds,))
 
-        def wrapper(context, request):
-            response = view(context, request)
-            prevent_caching = getattr(response.cache_control, 'prevent_auto',
-                                      False)
-            if not prevent_caching:
-                response.cache_expires(seconds, **options)
-            return response
+        return seconds, options
 
-        return wrapper
+    def response_cache(self):
+        value = self.kw.get('response_cache')
 
-    @wraps_view
-    def secured_view(self, view):
+        if value is None:
+            return None
+
+        options = {}
+
+        if isinstance(value, (tuple, list)):
+            try:
+                value, options = value
+            except ValueError:
+                raise ConfigurationError(
+                    'If response_cache parameter is a tuple or list, it must '
+                    'be in the form (seconds, options); not %s' % (value,))
+
+        unknown = set(options) - set(('key', 'size'))
+        if unknown:
+            raise ConfigurationError(
+                'Unknown response_cache options: %s' %
+                ', '.join(sorted(unknown)))
+
+        if isinstance(value, datetime.timedelta):
+            value = value.days * 86400 + value.seconds
+
+        return ResponseCache(value, **options)
+
+    def auto_etag(self):
+        etag = self.kw.get('etag')
+        etag_key = self.kw.get('etag_key')
+        if etag is None:
+            if etag_key is not None:
+                etag = True
+            else:
+                # the pyramid.auto_etag setting applies to rendered views
+                renderer = self.kw.get('renderer')
+                settings = self.registry.settings
+                etag = (
+                    settings and settings.get('pyramid.auto_etag', False) and
+                    renderer is not None and
+                    renderer is not renderers.null_renderer
+                    )
+        if etag:
+            return AutoETag(etag_key)
+
+    def permission(self):
         permission = self.kw.get('permission')
         if permission == NO_PERMISSION_REQUIRED:
             # allow views registered within configurations that have a
             # default permission to explicitly override the default
             # permission, replacing it with no permission at all
             permission = None
+        return permission
 
-        wrapped_view = view
+    def permitted(self):
+        permission = self.permission()
         if (
                 self.authn_policy and
                 self.authz_policy and
                 (permission is not None)
         ):
             def _permitted(context, request):
-                principals = self.authn_policy.effective_principals(request)
+                principals = _call_policy(
+                    self.authn_policy, 'effective_principals', request)
                 return self.authz_policy.permits(context, principals,
                                                  permission)
-            def _secured_view(context, request):
-                result = _permitted(context, request)
-                if result:
-                    return view(context, request)
-                view_name = getattr(view, '__name__', view)
-                msg = getattr(
-                    request, 'authdebug_message',
-                    'Unauthorized: %s failed permission check' % view_name)
-                raise HTTPForbidden(msg, result=result)
-            _secured_view.__call_permissive__ = view
-            _secured_view.__permitted__ = _permitted
-            _secured_view.__permission__ = permission
-            wrapped_view = _secured_view
-
-        return wrapped_view
+            return _permitted
 
-    @wraps_view
-    def authdebug_view(self, view):
-        wrapped_view = view
+    def authdebug(self):
         settings = self.registry.settings
         permission = self.kw.get('permission')
         if settings and settings.get('debug_authorization', False):
-            def _authdebug_view(context, request):
-                view_name = getattr(request, 'view_name', None)
-
+            def _authdebug(context, request):
                 if self.authn_policy and self.authz_policy:
                     if permission is NO_PERMISSION_REQUIRED:
                         msg = 'Allowed (NO_PERMISSION_REQUIRED)'
                     elif permission is None:
                         msg = 'Allowed (no permission registered)'
                     else:
-                        principals = self.authn_policy.effective_principals(
+                        principals = _call_policy(
+                            self.authn_policy, 'effective_principals',
                             request)
                         msg = str(self.authz_policy.permits(context,
                                                             principals,
@@ -287,51 +472,30 @@ class ViewDeriver(object):
                 self.logger and self.logger.debug(msg)
                 if request is not None:
                     request.authdebug_message = msg
-                return view(context, request)
 
-            wrapped_view = _authdebug_view
+            return _authdebug
 
-        return wrapped_view
-
-    @wraps_view
-    def predicated_view(self, view):
-        preds = self.kw.get('predicates', ())
-        if not preds:
-            return view
-
-        def predicate_wrapper(context, request):
-            for predicate in preds:
-                if not predicate(context, request):
-                    view_name = getattr(view, '__name__', view)
-                    raise PredicateMismatch(
-                        'predicate mismatch for view %s (%s)' % (
-                            view_name, predicate.text()))
-            return view(context, request)
-
-        def checker(context, request):
-            return all((predicate(context, request) for predicate in
-                        preds))
-        predicate_wrapper.__predicated__ = checker
-        predicate_wrapper.__predicates__ = preds
-        return predicate_wrapper
-
-    @wraps_view
-    def attr_wrapped_view(self, view):
+    def attr_wrapped_view(self, view, fused=False):
         kw = self.kw
         accept, order, phash = (kw.get('accept', None),
                                 kw.get('order', MAX_ORDER),
                                 kw.get('phash', DEFAULT_PHASH))
-        # this is a little silly but we don't want to decorate the original
-        # function with attributes that indicate accept, order, and phash,
-        # so we use a wrapper
         if (
             (accept is None) and
             (order == MAX_ORDER) and
             (phash == DEFAULT_PHASH)
         ):
             return view # defaults
-        def attr_view(context, request):
-            return view(context, request)
+        attr_view = view
+        if not fused:
+            # this is a little silly but we don't want to decorate the
+            # original function with attributes that indicate accept, order,
+            # and phash, so we use a wrapper unless the view is a fused view
+            # made by this deriver
+            def _attr_view(context, request):
+                return view(context, request)
+            attr_view = _attr_view
+            preserve_view_attrs(view, attr_view)
         attr_view.__accept__ = accept
         attr_view.__order__ = order
         attr_view.__phash__ = phash
@@ -339,77 +503,71 @@ class ViewDeriver(object):
         attr_view.__permission__ = self.kw.get('permission')
         return attr_view
 
-    @wraps_view
     def rendered_view(self, view):
         # one way or another this wrapper must produce a Response (unless
         # the renderer is a NullRendererHelper)
+        return self.fused_view(view, to_response=self.result_converter(view))
+
+    def result_converter(self, view):
         renderer = self.kw.get('renderer')
         if renderer is None:
             # register a default renderer if you want super-dynamic
             # rendering.  registering a default renderer will also allow
             # override_renderer to work if a renderer is left unspecified for
             # a view registration.
-            return self._response_resolved_view(view)
+            return self._response_resolver(view)
         if renderer is renderers.null_renderer:
-            return view
-        return self._rendered_view(view, renderer)
-
-    def _rendered_view(self, view, view_renderer):
-        def rendered_view(context, request):
-            result = view(context, request)
-            if result.__class__ is Response:  # potential common case
-                response = result
-            else:
-                registry = self.registry
-                # this must adapt, it can't do a simple interface check
-                # (avoid trying to render webob responses)
-                response = registry.queryAdapterOrSelf(result, IResponse)
-                if response is None:
-                    attrs = getattr(request, '__dict__', {})
-                    if 'override_renderer' in attrs:
-                        # renderer overridden by newrequest event or other
-                        renderer_name = attrs.pop('override_renderer')
-                        renderer = renderers.RendererHelper(
-                            name=renderer_name,
-                            package=self.kw.get('package'),
-                            registry=registry)
-                    else:
-                        renderer = view_renderer.clone()
+            return None
+        return self._renderer(view, renderer)
+
+    def _renderer(self, view, view_renderer):
+        def render(context, request, result):
+            registry = self.registry
+            # this must adapt, it can't do a simple interface check
+            # (avoid trying to render webob responses)
+            response = registry.queryAdapterOrSelf(result, IResponse)
+            if response is None:
+                attrs = getattr(request, '__dict__', {})
+                if 'override_renderer' in attrs:
+                    # renderer overridden by newrequest event or other
+                    renderer_name = attrs.pop('override_renderer')
+                    renderer = renderers.RendererHelper(
+                        name=renderer_name,
+                        package=self.kw.get('package'),
+                        registry=registry)
+                else:
+                    renderer = view_renderer.clone()
 
-                    if '__view__' in attrs:
-                        view_inst = attrs.pop('__view__')
-                    else:
-                        view_inst = getattr(view, '__original_view__', view)
-                    response = renderer.render_view(request, result, view_inst,
-                                                    context)
+                if '__view__' in attrs:
+                    view_inst = attrs.pop('__view__')
+                else:
+                    view_inst = getattr(view, '__original_view__', view)
+                response = renderer.render_view(request, result, view_inst,
+                                                context)
             return response
 
-        return rendered_view
+        return render
 
-    def _response_resolved_view(self, view):
+    def _response_resolver(self, view):
         registry = self.registry
 
-        def viewresult_to_response(context, request):
-            result = view(context, request)
-            if result.__class__ is Response:  # common case
-                response = result
-            else:
-                response = registry.queryAdapterOrSelf(result, IResponse)
-                if response is None:
-                    if result is None:
-                        append = (' You may have forgotten to return a value '
-                                  'from the view callable.')
-                    elif isinstance(result, dict):
-                        append = (' You may have forgotten to define a '
-                                  'renderer in the view configuration.')
-                    else:
-                        append = ''
+        def viewresult_to_response(context, request, result):
+            response = registry.queryAdapterOrSelf(result, IResponse)
+            if response is None:
+                if result is None:
+                    append = (' You may have forgotten to return a value '
+                              'from the view callable.')
+                elif isinstance(result, dict):
+                    append = (' You may have forgotten to define a '
+                              'renderer in the view configuration.')
+                else:
+                    append = ''
 
-                    msg = ('Could not convert return value of the view '
-                           'callable %s into a response object. '
-                           'The value returned was %r.' + append)
+                msg = ('Could not convert return value of the view '
+                       'callable %s into a response object. '
+                       'The value returned was %r.' + append)
 
-                    raise ValueError(msg % (view_description(view), result))
+                raise ValueError(msg % (view_description(view), result))
 
             return response
 
@@ -417,10 +575,7 @@ class ViewDeriver(object):
 
     @wraps_view
     def decorated_view(self, view):
-        decorator = self.kw.get('decorator')
-        if decorator is None:
-            return view
-        return decorator(view)
+        return self.kw['decorator'](view)
 
 
 @implementer(IViewMapper)
@@ -530,14 +685,148 @@ class DefaultViewMapper(object):
 def requestonly(view, attr=None):
     return takes_one_arg(view, attr=attr, argname='request')
 
+class ResponseCache(object):
+    """ An in-process cache of the responses of a view, used by the
+    ``response_cache`` view option.  Responses are remembered for
+    ``seconds`` under the value returned by ``key(request)``, and at most
+    ``size`` of them are kept.  A key of ``None`` bypasses the cache.
+
+    Only responses to ``GET`` requests with a ``200`` status and no
+    ``Set-Cookie`` header are cached; they are also returned to ``HEAD``
+    requests, whose own responses may lack a body and are never cached.
+    The request headers named by
+    the ``Vary`` header of a cached response are part of its key; such a
+    response takes up two of the ``size`` entries."""
+    default_size = 100
+    methods = ('GET', 'HEAD')
+
+    def __init__(self, seconds, key=None, size=None):
+        if key is not None:
+            self.key = key
+        if size is None:
+            size = self.default_size
+        self.seconds = seconds
+        self.cache = ExpiringLRUCache(size, seconds)
+
+    def key(self, request):
+        route = getattr(request, 'matched_route', None)
+        if route is None:
+            location = request.path_info
+        else:
+            location = (route.name, tuple(sorted(request.matchdict.items())))
+        return (request.application_url, location,
+                tuple(sorted(request.GET.items())))
+
+    def get(self, request):
+        """ Return ``(key, response)``, where ``response`` is ``None`` if
+        no response is cached and ``key`` is ``None`` if the response to
+        ``request`` mustn't be cached."""
+        if request.method not in self.methods:
+            return None, None
+        key = self.key(request)
+        if key is None:
+            return None, None
+        vary, entry = self.cache.get(key, (None, None))
+        if vary:
+            # the response is kept under its own key, made of the values of
+            # the request headers it varies by
+            entry = self.cache.get((key, self._vary_values(request, vary)))
+        if entry is None:
+            return key, None
+        status, headerlist, body = entry
+        response = Response(status=status, headerlist=list(headerlist))
+        response.body = body
+        return key, response
+
+    def put(self, key, request, response):
+        if request.method != 'GET':
+            return
+        if response.status_int != 200 or 'Set-Cookie' in response.headers:
+            return
+        vary = tuple(response.vary or ())
+        if '*' in vary:
+            return
+        entry = (response.status, tuple(response.headerlist), response.body)
+        if vary:
+            self.cache.put(key, (vary, None))
+            self.cache.put((key, self._vary_values(request, vary)), entry)
+        else:
+            self.cache.put(key, (vary, entry))
+
+    def clear(self):
+        self.cache.clear()
+
+    @staticmethod
+    def _vary_values(request, vary):
+        headers = request.headers
+        return tuple(headers.get(name) for name in vary)
+
+class AutoETag(object):
+    """ Set a strong ``ETag`` on the successful responses of a view and
+    answer requests whose ``If-None-Match`` header matches it with an empty
+    ``304 Not Modified`` response, as requested by the ``etag`` and
+    ``etag_key`` view options.  Unless ``key`` is given or the view sets
+    one itself, the etag is a hash of the response body; responses whose
+    body is streamed, i.e. which have no ``Content-Length`` or whose
+    ``app_iter`` isn't a list or tuple, are left alone rather than being
+    read into memory to be hashed.
+
+    ``key`` is called with the request before the view is; if it returns an
+    etag which matches, the view isn't called at all.  Otherwise the etag
+    it returns is set on the response."""
+    methods = ('GET', 'HEAD')
+    not_modified_headers = (
+        'Cache-Control', 'Content-Location', 'Date', 'Expires', 'Vary')
+
+    def __init__(self, key=None):
+        self.key = key
+
+    def __call__(self, request, response, etag=None):
+        if request.method not in self.methods or response.status_int != 200:
+            return response
+        if etag is not None:
+            response.etag = etag
+        elif response.etag is None:
+            if (response.content_length is None or
+                not isinstance(response.app_iter, (list, tuple))):
+                return response
+            response.md5_etag()
+        if response.etag in request.if_none_match:
+            return self.not_modified(response.etag, response)
+        return response
+
+    def matches(self, request, etag):
+        return (
+            etag is not None and
+            request.method in self.methods and
+            etag in request.if_none_match
+            )
+
+    def not_modified(self, etag, response=None):
+        not_modified = HTTPNotModified()
+        if response is not None:
+            headers = response.headers
+            for name in self.not_modified_headers:
+                value = headers.get(name)
+                if value is not None:
+                    not_modified.headers[name] = value
+        not_modified.etag = etag
+        return not_modified
+
 @implementer(IMultiView)
 class MultiView(object):
 
+    # the number of distinct Accept headers for which the ordering of views
+    # is remembered
+    accept_cache_size = 100
+
     def __init__(self, name):
         self.name = name
         self.media_views = {}
         self.views = []
         self.accepts = []
+        self.accept_cache = LRUCache(self.accept_cache_size)
+        self.predicate_tree = _PredicateTree(())
 
     def __discriminator__(self, context, request):
         # used by introspection systems like so:
@@ -549,6 +838,14 @@ class MultiView(object):
         return view.__discriminator__(context, request)
 
     def add(self, view, order, accept=None, phash=None):
+        self.accept_cache.clear()
+        self._add(view, order, accept, phash)
+        views = [v for (s, v, h) in self.views]
+        for subset in self.media_views.values():
+            views.extend([v for (s, v, h) in subset])
+        self.predicate_tree = _PredicateTree(views)
+
+    def _add(self, view, order, accept, phash):
         if phash is not None:
             for i, (s, v, h) in enumerate(list(self.views)):
                 if phash == h:
@@ -573,22 +870,36 @@ class MultiView(object):
 
     def get_views(self, request):
         if self.accepts and hasattr(request, 'accept'):
+            accept = request.accept
+            # the ordering only depends on the Accept header, so it is
+            # remembered for each header value; accept objects which do not
+            # expose their header value are not cached
+            header = getattr(accept, 'header_value', _marker)
+            if header is not _marker:
+                if header is not None:
+                    header = ''.join(header.split())
+                views = self.accept_cache.get(header)
+                if views is not None:
+                    return views
             accepts = self.accepts[:]
             views = []
             while accepts:
-                match = request.accept.best_match(accepts)
+                match = accept.best_match(accepts)
                 if match is None:
                     break
                 subset = self.media_views[match]
                 views.extend(subset)
                 accepts.remove(match)
             views.extend(self.views)
+            if header is not _marker:
+                self.accept_cache.put(header, views)
             return views
         return self.views
 
     def match(self, context, request):
-        for order, view, phash in self.get_views(request):
-            if not hasattr(view, '__predicated__'):
+        views = self.get_views(request)
+        for view, checked in self.predicate_tree(context, request, views):
+            if checked or not hasattr(view, '__predicated__'):
                 return view
             if view.__predicated__(context, request):
                 return view
@@ -606,13 +917,100 @@ class MultiView(object):
         return view(context, request)
 
     def __call__(self, context, request):
-        for order, view, phash in self.get_views(request):
+        views = self.get_views(request)
+        for view, checked in self.predicate_tree(context, request, views):
+            if checked:
+                # its predicates are known to be true
+                view = getattr(view, '__call_unpredicated__', view)
             try:
                 return view(context, request)
             except PredicateMismatch:
                 continue
         raise PredicateMismatch(self.name)
 
+class _PredicateTree(object):
+    """ Decides which views of a :class:`MultiView` may be tried for a
+    request without raising :exc:`pyramid.exceptions.PredicateMismatch`.
+
+    The views are first narrowed down by the request method and by whether
+    the request is an XMLHttpRequest, using a branch computed in advance for
+    each combination of the ``request_method`` and ``xhr`` predicate values
+    of the views.  The other predicates of the remaining views are then
+    checked in order, and each distinct predicate is only evaluated once per
+    request."""
+    def __init__(self, views):
+        p = pyramid.config.predicates
+        entries = []
+        methods = set()
+        self.has_methods = self.has_xhr = False
+        for view in views:
+            view_methods = view_xhr = None
+            remaining = []
+            for predicate in getattr(view, '__predicates__', ()):
+                if isinstance(predicate, p.RequestMethodPredicate):
+                    self.has_methods = True
+                    vals = set(predicate.val)
+                    if view_methods is not None:
+                        vals &= view_methods
+                    view_methods = vals
+                    methods.update(vals)
+                elif isinstance(predicate, p.XHRPredicate):
+                    self.has_xhr = True
+                    vals = set([predicate.val])
+                    if view_xhr is not None:
+                        vals &= view_xhr
+                    view_xhr = vals
+                else:
+                    phash = getattr(predicate, 'phash', None)
+                    key = predicate
+                    if phash is not None:
+                        key = (predicate.__class__, phash())
+                    remaining.append((key, predicate))
+            entries.append((id(view), view_methods, view_xhr,
+                            tuple(remaining)))
+        self.methods = methods
+        self.known = set([entry[0] for entry in entries])
+        self.branches = {}
+        for method in list(methods) + [None]:
+            for xhr in (False, True):
+                self.branches[(method, xhr)] = dict(
+                    (view_id, remaining)
+                    for view_id, view_methods, view_xhr, remaining in entries
+                    if (view_methods is None or method in view_methods) and
+                       (view_xhr is None or xhr in view_xhr)
+                    )
+
+    def __call__(self, context, request, views):
+        """ Yield ``(view, checked)`` for the ``(order, view, phash)``
+        tuples in ``views`` which may match ``request``; ``checked`` is
+        true if all predicates of ``view`` are known to be true."""
+        method = None
+        if self.has_methods:
+            method = request.method
+            if method not in self.methods:
+                method = None
+        xhr = False
+        if self.has_xhr:
+            xhr = bool(request.is_xhr)
+        branch = self.branches[(method, xhr)]
+        known = self.known
+        results = {}
+        for order, view, phash in views:
+            remaining = branch.get(id(view))
+            if remaining is None:
+                if id(view) not in known:
+                    # not added via MultiView.add
+                    yield view, False
+                continue
+            for key, predicate in remaining:
+                result = results.get(key)
+                if result is None:
+                    result = results[key] = bool(predicate(context, request))
+                if not result:
+                    break
+            else:
+                yield view, True
+
 class ViewsConfiguratorMixin(object):
     @viewdefaults
     @action_method
@@ -641,6 +1039,9 @@ class ViewsConfiguratorMixin(object):
         http_cache=None,
         match_param=None,
         check_csrf=None,
+        response_cache=None,
+        etag=None,
+        etag_key=None,
         **predicates
     ):
         """ Add a :term:`view configuration` to the current
@@ -795,6 +1196,66 @@ class ViewsConfiguratorMixin(object):
           before returning the response from the view.  This effectively
           disables any HTTP caching done by ``http_cache`` for that response.
 
+        response_cache
+
+          .. versionadded:: 1.7
+
+          When you supply a ``response_cache`` value to a view
+          configuration, the responses of the view are kept in memory and
+          returned to later requests with the same cache key without
+          calling the view callable or its renderer.  The value may be an
+          integer number of seconds or a :class:`datetime.timedelta`
+          instance for which a response is kept, or a two-tuple of such a
+          value and a dictionary of options, e.g.
+          ``response_cache=(600, {'size': 1000})``.  The options are:
+
+          - ``key``: a callable accepting a request and returning a
+            hashable cache key for its response, or ``None`` if the
+            response must not be cached.  By default the key is made of the
+            application URL, the matched route name and matchdict (or the
+            path if no route matched) and the ``GET`` parameters.
+
+          - ``size``: the largest number of responses kept for the view.
+            Least recently used responses are discarded first.  The
+            default is 100.
+
+          Only responses to ``GET`` requests with a ``200`` status and no
+          ``Set-Cookie`` header are cached; ``HEAD`` requests are answered
+          from them too.  The values of
+          the request headers named by the ``Vary`` header of a response
+          are part of its key.  Permissions and predicates are still
+          checked for every request, and ``http_cache`` and ``wrapper``
+          are applied to cached responses too, but response callbacks
+          added by the view callable are not called again for them.
+
+        etag
+
+          .. versionadded:: 1.7
+
+          If ``True``, a strong ``ETag`` header is set on the successful
+          responses to ``GET`` and ``HEAD`` requests of this view, and a
+          request whose ``If-None-Match`` header matches it is answered with
+          an empty ``304 Not Modified`` response.  Unless ``etag_key`` is
+          supplied or the view sets an ``ETag`` itself, the etag is a hash
+          of the response body; streamed responses, such as those of the
+          ``StreamingJSON`` renderer, get no such etag, as hashing would
+          read their whole body into memory.  If ``False``, no etag is set
+          even if the ``pyramid.auto_etag`` setting is true.  The default is
+          ``None``: etags are set only if ``etag_key`` is supplied, or if the
+          view uses a renderer and the ``pyramid.auto_etag`` setting is true.
+
+        etag_key
+
+          .. versionadded:: 1.7
+
+          A callable accepting a request and returning a string used as the
+          ``ETag`` of the response, or ``None`` to fall back to a hash of
+          the response body.  It is called before the view callable, so a
+          request whose ``If-None-Match`` header matches the etag it returns
+          is answered with a ``304 Not Modified`` response without calling
+          the view callable or its renderer.  Supplying ``etag_key`` implies
+          ``etag=True``.
+
         wrapper
 
           The :term:`view name` of a different :term:`view
@@ -1272,6 +1733,9 @@ class ViewsConfiguratorMixin(object):
                 mapper=mapper,
                 decorator=decorator,
                 http_cache=http_cache,
+                response_cache=response_cache,
+                etag=etag,
+                etag_key=etag_key,
                 )
             derived_view = deriver(view)
             derived_view.__discriminator__ = lambda *arg: discriminator
@@ -1871,6 +2335,20 @@ class ViewsConfiguratorMixin(object):
         is modified to be ten years.  ``cache_max_age`` may still be explicitly
         provided to override this default.
 
+        The ``file_cache`` keyword argument may be set to cause the static
+        view to keep the files it serves in memory, serving large files from
+        memory-mapped slices, so that frequently requested assets are served
+        without any filesystem access.  Its value may be ``True``, in which
+        case a :class:`pyramid.static.StaticFileCache` with default
+        arguments is used, or an instance of
+        :class:`~pyramid.static.StaticFileCache`, e.g. to change how often a
+        cached file is checked for changes on disk.  Note that this argument
+        has no effect when the ``name`` is a *url prefix*.  By default, files
+        are not cached.
+
+        .. versionchanged:: 1.7
+           Added the ``file_cache`` argument.
+
         The ``permission`` keyword argument is used to specify the
         :term:`permission` required by a user to execute the static view.  By
         default, it is the string
@@ -2055,11 +2533,13 @@ class StaticURLInfo(object):
             ten_years = 10 * 365 * 24 * 60 * 60  # more or less
             default = ten_years if cb else None
             cache_max_age = extra.pop('cache_max_age', default)
+            file_cache = extra.pop('file_cache', None)
 
             # create a view
             cb_match = getattr(cb, 'match', None)
             view = static_view(spec, cache_max_age=cache_max_age,
-                               use_subpath=True, cachebust_match=cb_match)
+                               use_subpath=True, cachebust_match=cb_match,
+                               file_cache=file_cache)
 
             # Mutate extra to allow factory, etc to be passed through here.
             # Treat permission specially because we'd like to default to
@@ -392,6 +392,33 @@ class IRendererFactory(Interface):
         object that implements :class:`pyramid.interfaces.IRendererInfo`.
         """
 
+class IFragmentCache(Interface):
+    """ A cache of rendered fragments, used by
+    :func:`pyramid.renderers.render_cached`.
+
+    .. versionadded:: 1.7
+    """
+    hits = Attribute('The number of lookups which found a fragment')
+    misses = Attribute('The number of lookups which found no fragment')
+
+    def get(key, default=None):
+        """ Return the fragment cached as ``key``, or ``default`` if there
+        is none, or if it expired or was invalidated."""
+
+    def put(key, value, ttl=None, tags=()):
+        """ Cache the fragment ``value`` as ``key`` for ``ttl`` seconds, or
+        for the default time of the cache if ``ttl`` is ``None``.  The
+        fragment is invalidated along with any of the ``tags``."""
+
+    def invalidate(key):
+        """ Discard the fragment cached as ``key``."""
+
+    def invalidate_tag(tag):
+        """ Discard the fragments cached with the tag ``tag``."""
+
+    def clear():
+        """ Discard all fragments."""
+
 class IRenderer(Interface):
     def __call__(value, system):
         """ Call the renderer with the result of the
@@ -728,6 +755,9 @@ class IRoute(Interface):
     pregenerator = Attribute('This attribute should either be ``None`` or '
                              'a callable object implementing the '
                              '``IRoutePregenerator`` interface')
+    host = Attribute('A tuple of host names (or ``*.``-prefixed host name '
+                     'wildcards) the route is restricted to, or ``None`` if '
+                     'it may match a request for any host.')
 
     def match(path):
         """
@@ -760,8 +790,15 @@ class IRoutesMapper(Interface):
         was registered, otherwise return ``None``."""
 
     def connect(name, pattern, factory=None, predicates=(), pregenerator=None,
-                static=True):
-        """ Add a new route. """
+                static=True, host=None):
+        """ Add a new route.
+
+        ``host`` is only passed if the route was added with a ``host``, so
+        mappers which do not accept it keep working for other routes.
+
+        .. versionchanged:: 1.7
+           Added the ``host`` argument.
+        """
 
     def generate(name, kw):
         """ Generate a URL using the route named ``name`` with the
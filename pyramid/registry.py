@@ -1,6 +1,8 @@
 import operator
 import threading
 
+from repoze.lru import LRUCache
+
 from zope.interface import implementer
 
 from zope.interface.registry import Components
@@ -40,16 +42,22 @@ class Registry(Components, dict):
 
     _settings = None
 
+    # the number of view lookup misses remembered by ``view_miss_cache``
+    view_miss_cache_size = 0
+
     def __init__(self, *arg, **kw):
         # add a registry-instance-specific lock, which is used when the lookup
         # cache is mutated
         self._lock = threading.Lock()
         # add a view lookup cache
         self._clear_view_lookup_cache()
+        # add a cache of whether events are listened to, per event type
+        self._subscribed = {}
         Components.__init__(self, *arg, **kw)
 
     def _clear_view_lookup_cache(self):
         self._view_lookup_cache = {}
+        self.view_miss_cache = _make_view_miss_cache(self)
 
     def __nonzero__(self):
         # defeat bool determination via dict.__len__
@@ -62,6 +70,12 @@ class Registry(Components, dict):
     def registerSubscriptionAdapter(self, *arg, **kw):
         result = Components.registerSubscriptionAdapter(self, *arg, **kw)
         self.has_listeners = True
+        self._subscribed = {}
+        return result
+
+    def unregisterSubscriptionAdapter(self, *arg, **kw):
+        result = Components.unregisterSubscriptionAdapter(self, *arg, **kw)
+        self._subscribed = {}
         return result
 
     def registerSelfAdapter(self, required=None, provided=None, name=empty,
@@ -83,6 +97,12 @@ class Registry(Components, dict):
     def registerHandler(self, *arg, **kw):
         result = Components.registerHandler(self, *arg, **kw)
         self.has_listeners = True
+        self._subscribed = {}
+        return result
+
+    def unregisterHandler(self, *arg, **kw):
+        result = Components.unregisterHandler(self, *arg, **kw)
+        self._subscribed = {}
         return result
 
     def notify(self, *events):
@@ -90,6 +110,18 @@ class Registry(Components, dict):
             # iterating over subscribers assures they get executed
             [ _ for _ in self.subscribers(events, None) ]
 
+    def _has_subscribers(self, event_spec):
+        # true if notifying an event which provides ``event_spec``, e.g. the
+        # ``implementedBy`` of its class, would call any subscriber
+        if not self.has_listeners:
+            return False
+        subscribed = self._subscribed
+        result = subscribed.get(event_spec)
+        if result is None:
+            result = bool(self.adapters.subscriptions((event_spec,), None))
+            subscribed[event_spec] = result
+        return result
+
     # backwards compatibility for code that wants to look up a settings
     # object via ``registry.getUtility(ISettings)``
     def _get_settings(self):
@@ -101,6 +133,13 @@ class Registry(Components, dict):
 
     settings = property(_get_settings, _set_settings)
 
+def _make_view_miss_cache(registry):
+    # view lookup misses are remembered in a separate, bounded cache so that
+    # requests for arbitrary missing URLs cannot grow it without bound
+    size = getattr(registry, 'view_miss_cache_size', 0)
+    if size:
+        return LRUCache(size)
+
 @implementer(IIntrospector)
 class Introspector(object):
     def __init__(self):
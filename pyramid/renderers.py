@@ -1,15 +1,20 @@
 import contextlib
+import itertools
 import json
 import os
 import re
 
+from repoze.lru import ExpiringLRUCache
+
 from zope.interface import (
+    implementedBy,
     implementer,
     providedBy,
     )
 from zope.interface.registry import Components
 
 from pyramid.interfaces import (
+    IFragmentCache,
     IJSONAdapter,
     IRendererFactory,
     IRendererInfo,
@@ -82,6 +87,44 @@ def render(renderer_name, value, request=None, package=None):
 
     return result
 
+def render_cached(renderer_name, value_factory, key, ttl=None, tags=(),
+                  request=None, package=None):
+    """ Return the fragment cached as ``key`` by the
+    :class:`~pyramid.interfaces.IFragmentCache` utility of the application
+    registry.  If there is none, call ``value_factory`` without arguments
+    and render its result as :func:`pyramid.renderers.render` would, then
+    cache and return the result of the renderer, which should be a string.
+
+    The ``key`` must be hashable, and it must be distinct for every
+    distinct fragment: it should include the renderer name and everything
+    the rendered value depends upon, including anything it takes from the
+    ``request``.  The fragment is kept for ``ttl`` seconds, or for the
+    default time of the cache if ``ttl`` is ``None``, and is discarded when
+    any of the ``tags`` is invalidated using the ``invalidate_tag`` method
+    of the cache.
+
+    The ``renderer_name``, ``request`` and ``package`` arguments mean the
+    same thing as the arguments of :func:`pyramid.renderers.render`.  If no
+    fragment cache is registered, the fragment is rendered every time.
+
+    .. versionadded:: 1.7
+    """
+    registry = getattr(request, 'registry', None)
+    if registry is None:
+        registry = get_current_registry()
+    cache = registry.queryUtility(IFragmentCache)
+    if cache is not None:
+        result = cache.get(key, _marker)
+        if result is not _marker:
+            return result
+    if package is None:
+        package = caller_package()
+    result = render(renderer_name, value_factory(), request=request,
+                    package=package)
+    if cache is not None:
+        cache.put(key, result, ttl=ttl, tags=tags)
+    return result
+
 def render_to_response(renderer_name,
                        value,
                        request=None,
@@ -238,6 +281,13 @@ class JSON(object):
         explained in :ref:`json_serializing_custom_objects` instead
         of replacing the serializer.
 
+        The ``default`` callback has an ``encoders`` attribute, a dictionary
+        mapping classes to the adapters already found for their instances,
+        and a ``request`` attribute, the request being rendered.  A custom
+        serializer may call ``default.encoders[obj.__class__](obj,
+        default.request)`` directly for the classes in the dictionary, and
+        call ``default(obj)`` for other objects.
+
     .. versionadded:: 1.4
        Prior to this version, there was no public API for supplying options
        to the underlying serializer without defining a custom renderer.
@@ -249,6 +299,7 @@ class JSON(object):
         self.serializer = serializer
         self.kw = kw
         self.components = Components()
+        self.encoders = {}
         for type, adapter in adapters:
             self.add_adapter(type, adapter)
 
@@ -276,6 +327,7 @@ class JSON(object):
 
         self.components.registerAdapter(adapter, (type_or_iface,),
                                         IJSONAdapter)
+        self.encoders.clear()
 
     def __call__(self, info):
         """ Returns a plain JSON-encoded string with content-type
@@ -294,16 +346,26 @@ class JSON(object):
         return _render
 
     def _make_default(self, request):
+        encoders = self.encoders
+        lookup = self.components.adapters.lookup
         def default(obj):
             if hasattr(obj, '__json__'):
                 return obj.__json__(request)
-            obj_iface = providedBy(obj)
-            adapters = self.components.adapters
-            result = adapters.lookup((obj_iface,), IJSONAdapter,
-                                     default=_marker)
-            if result is _marker:
-                raise TypeError('%r is not JSON serializable' % (obj,))
+            cls = obj.__class__
+            result = encoders.get(cls)
+            # the adapter found for a class applies to all of its instances
+            # unless they directly provide interfaces of their own
+            shared = '__provides__' not in getattr(obj, '__dict__', ())
+            if result is None or not shared:
+                result = lookup((providedBy(obj),), IJSONAdapter,
+                                default=_marker)
+                if result is _marker:
+                    raise TypeError('%r is not JSON serializable' % (obj,))
+                if shared:
+                    encoders[cls] = result
             return result(obj, request)
+        default.encoders = encoders
+        default.request = request
         return default
 
 json_renderer_factory = JSON() # bw compat
@@ -403,6 +465,216 @@ class JSONP(JSON):
             return body
         return _render
 
+class StreamingJSON(JSON):
+    """ Renderer that returns a JSON-encoded iterable of UTF-8 encoded
+    byte chunks, which is used as the ``app_iter`` of the response, rather
+    than one string.  If the value to render is a list, a tuple, an iterator
+    or a generator, its items are encoded one at a time as the response body
+    is sent, as are the items of such values among its items, so that the
+    memory used is bounded by the size of a chunk and of an item rather than
+    by the size of the whole result.  Other values, and iterators found
+    anywhere else within the value, are encoded as the
+    :class:`pyramid.renderers.JSON` renderer would.
+
+    Configure it using the
+    :meth:`~pyramid.config.Configurator.add_renderer` API at application
+    startup time:
+
+    .. code-block:: python
+
+       from pyramid.config import Configurator
+
+       config = Configurator()
+       config.add_renderer('jsonstream', StreamingJSON())
+
+    The ``chunk_size`` argument is the size, in characters, above which the
+    encoded output is handed to the server; the default is 64KB.  Custom
+    objects can be serialized by implementing the ``__json__`` method or by
+    registering adapters, as with the ``JSON`` renderer.  Other keyword
+    arguments are passed to the ``json.JSONEncoder`` class, or to the
+    class given as the ``cls`` keyword argument.
+
+    .. note::
+
+       The value is only encoded while the response is being sent, after
+       the view callable has returned, so encoding errors can't change the
+       status of the response anymore, and iterators must still be usable
+       then (e.g. they mustn't depend on a database transaction committed
+       at the end of the request).
+
+    .. versionadded:: 1.7
+    """
+    def __init__(self, chunk_size=65536, adapters=(), **kw):
+        self.chunk_size = chunk_size
+        JSON.__init__(self, adapters=adapters, **kw)
+
+    def __call__(self, info):
+        """ Returns an iterable of JSON-encoded byte chunks with
+        content-type ``application/json``. The content-type may be
+        overridden by setting ``request.response.content_type``."""
+        def _render(value, system):
+            request = system.get('request')
+            if request is not None:
+                response = request.response
+                ct = response.content_type
+                if ct == response.default_content_type:
+                    response.content_type = 'application/json'
+            encoder = self._make_encoder(request)
+            return self._chunks(self._iterencode(encoder, value, 0))
+
+        return _render
+
+    def _make_encoder(self, request):
+        kw = self.kw.copy()
+        cls = kw.pop('cls', json.JSONEncoder)
+        return cls(default=self._make_default(request), **kw)
+
+    def _streams(self, value):
+        if isinstance(value, (list, tuple)):
+            return True
+        # any other iterator, but not an object with its own JSON form
+        return (
+            not hasattr(value, '__json__') and
+            hasattr(value, '__iter__') and
+            not isinstance(value, (dict, bytes) + string_types) and
+            iter(value) is value
+            )
+
+    def _iterencode(self, encoder, value, level):
+        indent = encoder.indent
+        if indent is not None and not isinstance(indent, string_types):
+            indent = ' ' * indent
+        if not self._streams(value):
+            # encode() rather than iterencode(): only the former uses the C
+            # accelerated encoder, and an item is held in memory anyway
+            chunk = encoder.encode(value)
+            if indent and level:
+                # JSON strings never contain newlines, so every newline
+                # starts a line to be indented to the level of the value
+                chunk = chunk.replace('\n', '\n' + indent * level)
+            yield chunk
+            return
+        yield '['
+        first = True
+        for item in value:
+            if first:
+                first = False
+            else:
+                yield encoder.item_separator
+            if indent is not None:
+                yield '\n' + indent * (level + 1)
+            for chunk in self._iterencode(encoder, item, level + 1):
+                yield chunk
+        if indent is not None and not first:
+            yield '\n' + indent * level
+        yield ']'
+
+    def _chunks(self, pieces):
+        chunk_size = self.chunk_size
+        buffered = []
+        size = 0
+        for piece in pieces:
+            buffered.append(piece)
+            size += len(piece)
+            if size >= chunk_size:
+                yield ''.join(buffered).encode('utf-8')
+                buffered = []
+                size = 0
+        if buffered:
+            yield ''.join(buffered).encode('utf-8')
+
+@implementer(IFragmentCache)
+class FragmentCache(object):
+    """ An in-process :class:`~pyramid.interfaces.IFragmentCache` keeping
+    at most ``size`` fragments, by default for ``ttl`` seconds or for as
+    long as they fit if ``ttl`` is ``None``.  The least recently used
+    fragments are discarded first.
+
+    Besides ``hits`` and ``misses``, the ``evictions`` attribute counts the
+    fragments discarded to make room for newer ones.  These counters are
+    kept when the cache is cleared.
+
+    The invalidations of at most ``size`` tags are remembered.  When more
+    tags are invalidated, the oldest half of the invalidations are
+    forgotten, and tagged fragments cached before them are then treated as
+    invalidated too.
+
+    .. versionadded:: 1.7
+    """
+    def __init__(self, size=1000, ttl=None):
+        if ttl is None:
+            self.cache = ExpiringLRUCache(size)
+        else:
+            self.cache = ExpiringLRUCache(size, ttl)
+        self.ttl = ttl
+        self.max_tags = size
+        # fragments and tag invalidations are numbered in sequence; a
+        # fragment is stale if one of its tags was invalidated after it was
+        # cached, or if it was cached before the invalidations which were
+        # forgotten (the horizon)
+        self.sequence = itertools.count(1)
+        self.invalidated = {}
+        self.horizon = 0
+        self.hits = 0
+        self.misses = 0
+        self._evictions = 0
+
+    @property
+    def evictions(self):
+        return self._evictions + self.cache.evictions
+
+    def get(self, key, default=None):
+        entry = self.cache.get(key)
+        if entry is not None and self._fresh(*entry):
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return default
+
+    def _fresh(self, value, tags, seq):
+        if not tags:
+            return True
+        if seq < self.horizon:
+            return False
+        invalidated = self.invalidated
+        for tag in tags:
+            if invalidated.get(tag, 0) > seq:
+                return False
+        return True
+
+    def put(self, key, value, ttl=None, tags=()):
+        self.cache.put(key, (value, tuple(tags), next(self.sequence)), ttl)
+
+    def invalidate(self, key):
+        self.cache.invalidate(key)
+
+    def invalidate_tag(self, tag):
+        invalidated = self.invalidated
+        invalidated[tag] = next(self.sequence)
+        if len(invalidated) > self.max_tags:
+            seqs = sorted(invalidated.values())
+            horizon = seqs[len(seqs) // 2]
+            self.invalidated = dict(
+                (tag, seq) for tag, seq in invalidated.items()
+                if seq > horizon)
+            self.horizon = horizon
+
+    def clear(self):
+        self._evictions += self.cache.evictions
+        self.cache.clear()
+        self.invalidated = {}
+        self.horizon = 0
+
+_before_render_spec = implementedBy(BeforeRender)
+
+def _before_render_subscribed(registry):
+    # creating and sending a BeforeRender event is skipped if it would not
+    # be received by any subscriber
+    has_subscribers = getattr(registry, '_has_subscribers', None)
+    if has_subscribers is None:
+        return True
+    return has_subscribers(_before_render_spec)
+
 @implementer(IRendererInfo)
 class RendererHelper(object):
     def __init__(self, name=None, package=None, registry=None):
@@ -450,6 +722,8 @@ class RendererHelper(object):
 
     def render(self, value, system_values, request=None):
         renderer = self.renderer
+        registry = self.registry
+        subscribed = _before_render_subscribed(registry)
         if system_values is None:
             system_values = {
                 'view':None,
@@ -459,11 +733,13 @@ class RendererHelper(object):
                 'request':request,
                 'req':request,
                 }
+        elif not subscribed:
+            # renderers may change the system values they are passed
+            system_values = dict(system_values)
 
-        system_values = BeforeRender(system_values, value)
-
-        registry = self.registry
-        registry.notify(system_values)
+        if subscribed:
+            system_values = BeforeRender(system_values, value)
+            registry.notify(system_values)
 
         result = renderer(value, system_values)
         return result
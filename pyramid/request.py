@@ -17,7 +17,6 @@ from pyramid.compat import (
     text_,
     bytes_,
     native_,
-    iteritems_,
     )
 
 from pyramid.decorator import reify
@@ -320,13 +319,23 @@ def apply_request_extensions(request, extensions=None):
     After invoking this method, the ``request`` should have the methods
     and properties that were defined using
     :meth:`pyramid.config.Configurator.add_request_method`.
+
+    The methods and properties are attributes of a subclass of the class of
+    ``request``, which becomes the new class of ``request``.  The subclass is
+    created only once for each request class and ``extensions`` object.
     """
     if extensions is None:
         extensions = request.registry.queryUtility(IRequestExtensions)
     if extensions is not None:
-        for name, fn in iteritems_(extensions.methods):
-            method = fn.__get__(request, request.__class__)
-            setattr(request, name, method)
-
-        InstancePropertyHelper.apply_properties(
-            request, extensions.descriptors)
+        parent = request.__class__
+        classes = getattr(extensions, '_request_classes', None)
+        newcls = None if classes is None else classes.get(parent)
+        if newcls is None:
+            attrs = dict(extensions.methods)
+            attrs.update(extensions.descriptors)
+            newcls = parent
+            if attrs:
+                newcls = InstancePropertyHelper.make_class(parent, attrs)
+            if classes is not None:
+                classes[parent] = newcls
+        request.__class__ = newcls
@@ -1,4 +1,5 @@
 from zope.interface import (
+    implementedBy,
     implementer,
     providedBy,
     )
@@ -14,6 +15,7 @@ from pyramid.interfaces import (
     IRoutesMapper,
     ITraverser,
     ITweens,
+    VH_ROOT_KEY,
     )
 
 from pyramid.events import (
@@ -22,6 +24,7 @@ from pyramid.events import (
     NewResponse,
     )
 
+from pyramid.compat import is_nonstr_iter
 from pyramid.httpexceptions import HTTPNotFound
 from pyramid.request import Request
 from pyramid.view import _call_view
@@ -31,6 +34,7 @@ from pyramid.threadlocal import manager
 from pyramid.traversal import (
     DefaultRootFactory,
     ResourceTreeTraverser,
+    split_path_info,
     )
 
 from pyramid.tweens import excview_tween_factory
@@ -53,14 +57,51 @@ class Router(object):
         tweens = q(ITweens)
         if tweens is None:
             tweens = excview_tween_factory
-        self.orig_handle_request = self.handle_request
-        self.handle_request = tweens(self.handle_request, registry)
         self.root_policy = self.root_factory # b/w compat
         self.registry = registry
         settings = registry.settings
         if settings is not None:
             self.debug_notfound = settings['debug_notfound']
             self.debug_routematch = settings['debug_routematch']
+        if self.routes_mapper is not None:
+            for route in self.routes_mapper.get_routes():
+                self._resolve_route(route, registry)
+        handle_request = self._choose_handler(registry)
+        self.orig_handle_request = handle_request
+        self.handle_request = tweens(handle_request, registry)
+
+    def _resolve_route(self, route, registry):
+        # Store the request interface and root factory of ``route`` on the
+        # route itself (routes of a custom mapper may lack the attribute
+        # until then).  The registry's view lookup cache is replaced
+        # whenever a view or a route request interface is registered, so its
+        # identity tells the request handlers whether the stored values are
+        # still current.
+        request_info = (
+            registry._view_lookup_cache,
+            registry.queryUtility(IRouteRequest, name=route.name,
+                                  default=IRequest),
+            route.factory or self.root_factory,
+            )
+        route._request_info = request_info
+        return request_info
+
+    def _choose_handler(self, registry):
+        # Pick the most specialized request handler the committed
+        # configuration allows; ``handle_request`` can handle any of them.
+        if (self.routes_mapper is None or
+            self.debug_notfound or
+            self.debug_routematch):
+            return self.handle_request
+        for reg in registry.registeredAdapters():
+            if reg.provided is ITraverser:
+                return self.handle_request
+        if registry.has_listeners:
+            subscriptions = registry.adapters.subscriptions
+            for event_type in (NewRequest, ContextFound):
+                if subscriptions((implementedBy(event_type),), None):
+                    return self.handle_request
+        return self.handle_routed_request
 
     def handle_request(self, request):
         attrs = request.__dict__
@@ -107,12 +148,12 @@ class Router(object):
                         )
                     logger and logger.debug(msg)
 
-                request.request_iface = registry.queryUtility(
-                    IRouteRequest,
-                    name=route.name,
-                    default=IRequest)
-
-                root_factory = route.factory or self.root_factory
+                request_info = getattr(route, '_request_info', None)
+                if (request_info is None or
+                    request_info[0] is not registry._view_lookup_cache):
+                    request_info = self._resolve_route(route, registry)
+                request.request_iface = request_info[1]
+                root_factory = request_info[2]
 
         root = root_factory(request)
         attrs['root'] = root
@@ -163,6 +204,66 @@ class Router(object):
 
         return response
 
+    def handle_routed_request(self, request):
+        """ A specialization of ``handle_request`` used when the
+        application has routes but no custom traverser, no ``NewRequest`` or
+        ``ContextFound`` subscribers and neither ``debug_notfound`` nor
+        ``debug_routematch`` enabled.  Unless the matched route asks for
+        traversal, the context is the root, and the traverser and its result
+        dictionary are skipped entirely. """
+        attrs = request.__dict__
+        registry = attrs['registry']
+
+        request.request_iface = IRequest
+        root_factory = self.root_factory
+        info = self.routes_mapper(request)
+        match, route = info['match'], info['route']
+        if route is not None:
+            attrs['matchdict'] = match
+            attrs['matched_route'] = route
+            request_info = getattr(route, '_request_info', None)
+            if (request_info is None or
+                request_info[0] is not registry._view_lookup_cache):
+                request_info = self._resolve_route(route, registry)
+            request.request_iface = request_info[1]
+            root_factory = request_info[2]
+
+        root = root_factory(request)
+        attrs['root'] = root
+
+        if (route is None or
+            'traverse' in match or
+            VH_ROOT_KEY in request.environ):
+            tdict = ResourceTreeTraverser(root)(request)
+            context, view_name = tdict['context'], tdict['view_name']
+            attrs.update(tdict)
+        else:
+            # what ResourceTreeTraverser would have found
+            subpath = match.get('subpath', ())
+            if not is_nonstr_iter(subpath):
+                subpath = split_path_info(subpath)
+            context = root
+            view_name = ''
+            attrs['context'] = context
+            attrs['view_name'] = view_name
+            attrs['subpath'] = subpath
+            attrs['traversed'] = ()
+            attrs['virtual_root'] = root
+            attrs['virtual_root_path'] = ()
+
+        response = _call_view(
+            registry,
+            request,
+            context,
+            providedBy(context),
+            view_name
+            )
+
+        if response is None:
+            raise HTTPNotFound(request.path_info)
+
+        return response
+
     def invoke_subrequest(self, request, use_tweens=False):
         """Obtain a response object from the Pyramid application based on
         information in the ``request`` object provided.  The ``request``
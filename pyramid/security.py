@@ -44,6 +44,45 @@ def _get_authentication_policy(request):
     registry = _get_registry(request)
     return registry.queryUtility(IAuthenticationPolicy)
 
+def _get_security_cache(request):
+    # the dictionary in which authentication results are remembered for the
+    # rest of the request, or None unless the pyramid.cache_authentication
+    # setting is true
+    attrs = getattr(request, '__dict__', None)
+    if attrs is None:
+        return None
+    cache = attrs.get('_security_cache')
+    if cache is None:
+        settings = getattr(_get_registry(request), 'settings', None)
+        if not (settings and settings.get('pyramid.cache_authentication')):
+            return None
+        cache = attrs['_security_cache'] = {}
+    return cache
+
+def _clear_security_cache(request):
+    attrs = getattr(request, '__dict__', None)
+    if attrs is not None:
+        attrs.pop('_security_cache', None)
+
+def _cached(request, key, compute, *args):
+    """ Return ``compute(*args)``, remembering the result as ``key`` in the
+    security cache of ``request`` if it has one."""
+    cache = _get_security_cache(request)
+    if cache is None:
+        return compute(*args)
+    result = cache.get(key, _marker)
+    if result is _marker:
+        result = cache[key] = compute(*args)
+    if result.__class__ is list:
+        # callers are free to modify lists of principals
+        result = list(result)
+    return result
+
+def _call_policy(policy, name, request):
+    """ Return ``policy.<name>(request)``, remembered for the rest of the
+    request if the ``pyramid.cache_authentication`` setting is true."""
+    return _cached(request, (id(policy), name), getattr(policy, name), request)
+
 def has_permission(permission, context, request):
     """
     A function that calls :meth:`pyramid.request.Request.has_permission`
@@ -161,6 +200,7 @@ def remember(request, userid=_marker, **kw):
     policy = _get_authentication_policy(request)
     if policy is None:
         return []
+    _clear_security_cache(request)
     return policy.remember(request, userid, **kw)
 
 def forget(request):
@@ -185,6 +225,7 @@ def forget(request):
     policy = _get_authentication_policy(request)
     if policy is None:
         return []
+    _clear_security_cache(request)
     return policy.forget(request)
 
 def principals_allowed_by_permission(context, permission):
@@ -341,7 +382,7 @@ class AuthenticationAPIMixin(object):
         policy = self._get_authentication_policy()
         if policy is None:
             return None
-        return policy.authenticated_userid(self)
+        return _call_policy(policy, 'authenticated_userid', self)
 
     @property
     def unauthenticated_userid(self):
@@ -372,7 +413,7 @@ class AuthenticationAPIMixin(object):
         policy = self._get_authentication_policy()
         if policy is None:
             return [Everyone]
-        return policy.effective_principals(self)
+        return _call_policy(policy, 'effective_principals', self)
 
 class AuthorizationAPIMixin(object):
 
@@ -407,5 +448,5 @@ class AuthorizationAPIMixin(object):
         if authz_policy is None:
             raise ValueError('Authentication policy registered without '
                              'authorization policy') # should never happen
-        principals = authn_policy.effective_principals(self)
+        principals = _call_policy(authn_policy, 'effective_principals', self)
         return authz_policy.permits(context, principals, permission)
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import hashlib
+import mmap
 import os
+import time
 
 from os.path import (
     normcase,
@@ -16,7 +18,10 @@ from pkg_resources import (
     resource_isdir,
     )
 
-from repoze.lru import lru_cache
+from repoze.lru import (
+    LRUCache,
+    lru_cache,
+    )
 
 from pyramid.asset import resolve_asset_spec
 
@@ -28,7 +33,12 @@ from pyramid.httpexceptions import (
     )
 
 from pyramid.path import AssetResolver, caller_package
-from pyramid.response import FileResponse
+from pyramid.response import (
+    _BLOCK_SIZE,
+    _guess_type,
+    FileResponse,
+    Response,
+    )
 from pyramid.traversal import traversal_path_info
 
 slash = text_('/')
@@ -68,6 +78,14 @@ class static_view(object):
     the static application will consider request.environ[``PATH_INFO``] as
     ``PATH_INFO`` input. By default, this is ``False``.
 
+    ``file_cache`` may be ``True`` or an instance of
+    :class:`pyramid.static.StaticFileCache`, in which case the files served
+    by the view are kept in that cache, and requests for them are answered
+    without touching the filesystem until the cache's ``stat_interval``
+    elapses.  ``True`` means a :class:`~pyramid.static.StaticFileCache` with
+    its default arguments.  By default, this is ``None``, meaning that the
+    filesystem is consulted on each request.
+
     .. note::
 
        If the ``root_dir`` is relative to a :term:`package`, or is a
@@ -76,10 +94,14 @@ class static_view(object):
        assets within the named ``root_dir`` package-relative directory.
        However, if the ``root_dir`` is absolute, configuration will not be able
        to override the assets it contains.
+
+    .. versionchanged:: 1.7
+       Added the ``file_cache`` argument.
     """
 
     def __init__(self, root_dir, cache_max_age=3600, package_name=None,
-                 use_subpath=False, index='index.html', cachebust_match=None):
+                 use_subpath=False, index='index.html', cachebust_match=None,
+                 file_cache=None):
         # package_name is for bw compat; it is preferred to pass in a
         # package-relative path as root_dir
         # (e.g. ``anotherpackage:foo/static``).
@@ -93,6 +115,9 @@ class static_view(object):
         self.norm_docroot = normcase(normpath(docroot))
         self.index = index
         self.cachebust_match = cachebust_match
+        if file_cache is True:
+            file_cache = StaticFileCache()
+        self.file_cache = file_cache or None
 
     def __call__(self, context, request):
         if self.use_subpath:
@@ -106,6 +131,16 @@ class static_view(object):
         if path is None:
             raise HTTPNotFound('Out of bounds: %s' % request.url)
 
+        file_cache = self.file_cache
+        if file_cache is not None:
+            key = (self.package_name, self.docroot, path)
+            cached = file_cache.get(key)
+            if cached is not None:
+                if cached.is_index and not request.path_url.endswith('/'):
+                    self.add_slash_redirect(request)
+                return cached.response(self.cache_max_age)
+
+        is_index = False
         if self.package_name: # package resource
             resource_path = '%s/%s' % (self.docroot.rstrip('/'), path)
             if resource_isdir(self.package_name, resource_path):
@@ -114,6 +149,7 @@ class static_view(object):
                 resource_path = '%s/%s' % (
                     resource_path.rstrip('/'), self.index
                 )
+                is_index = True
 
             if not resource_exists(self.package_name, resource_path):
                 raise HTTPNotFound(request.url)
@@ -127,9 +163,14 @@ class static_view(object):
                 if not request.path_url.endswith('/'):
                     self.add_slash_redirect(request)
                 filepath = join(filepath, self.index)
+                is_index = True
             if not exists(filepath):
                 raise HTTPNotFound(request.url)
 
+        if file_cache is not None:
+            cached = file_cache.load(key, filepath, is_index)
+            return cached.response(self.cache_max_age)
+
         return FileResponse(filepath, request, self.cache_max_age)
 
     def add_slash_redirect(self, request):
@@ -139,6 +180,124 @@ class static_view(object):
             url = url + '?' + qs
         raise HTTPMovedPermanently(url)
 
+class StaticFileCache(object):
+    """ A cache of the files served by a :class:`pyramid.static.static_view`
+    created with its ``file_cache`` argument, or by a static view added with
+    the ``file_cache`` argument of
+    :meth:`pyramid.config.Configurator.add_static_view`.
+
+    Files no larger than ``max_memory_size`` bytes (default 64KB) are read
+    into memory.  Larger files are mapped into memory with :mod:`mmap`, and
+    served from slices of that mapping.  Each file's ``Content-Type``,
+    ``Last-Modified``, ``ETag`` and ``Content-Length`` headers are computed
+    once, when it is loaded.  At most ``max_entries`` files (default 1000)
+    are kept; the least recently used are discarded first.
+
+    A cached file is served without any filesystem access for
+    ``stat_interval`` seconds (default 2) after it was loaded or last
+    checked.  Once that interval has elapsed, the next request for it
+    checks the file's modification time and size, and loads it again if
+    either has changed or if it no longer exists.  A ``stat_interval`` of
+    ``0`` checks on every request.
+
+    .. note::
+
+       Files served from a memory mapping should be replaced on disk by
+       moving a new file over them, not by rewriting them in place:
+       truncating a mapped file while it is being served may crash the
+       process on some platforms.
+
+    .. versionadded:: 1.7
+    """
+    def __init__(self, max_memory_size=65536, stat_interval=2,
+                 max_entries=1000):
+        self.max_memory_size = max_memory_size
+        self.stat_interval = stat_interval
+        self.files = LRUCache(max_entries)
+
+    def get(self, key):
+        """ Return the :class:`CachedFile` stored under ``key``, or ``None``
+        if there is none or it is stale."""
+        cached = self.files.get(key)
+        if cached is None:
+            return None
+        now = time.time()
+        if now - cached.checked < self.stat_interval:
+            return cached
+        try:
+            st = os.stat(cached.path)
+        except OSError:
+            st = None
+        if st is None or (st.st_mtime, st.st_size) != (
+                cached.mtime, cached.size):
+            self.files.invalidate(key)
+            return None
+        cached.checked = now
+        return cached
+
+    def load(self, key, path, is_index=False):
+        """ Read the file at ``path`` and store it under ``key``, returning
+        its :class:`CachedFile`."""
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if st.st_size <= self.max_memory_size:
+                data = f.read()
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        cached = CachedFile(path, st.st_mtime, st.st_size, data, is_index)
+        self.files.put(key, cached)
+        return cached
+
+    def clear(self):
+        """ Discard all cached files."""
+        self.files.clear()
+
+class CachedFile(object):
+    """ A file held by a :class:`pyramid.static.StaticFileCache`.  ``data``
+    is either the bytes of the file or an :class:`mmap.mmap` of it."""
+    def __init__(self, path, mtime, size, data, is_index=False):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.data = data
+        self.is_index = is_index
+        self.checked = time.time()
+        content_type, content_encoding = _guess_type(path)
+        template = Response(content_type=content_type,
+                            content_encoding=content_encoding)
+        template.last_modified = mtime
+        template.etag = '%x-%x' % (int(mtime * 1000000), size)
+        template.content_length = size
+        self.headerlist = template.headerlist
+
+    def response(self, cache_max_age=None):
+        """ Return a new response serving the file."""
+        if isinstance(self.data, bytes):
+            app_iter = [self.data]
+        else:
+            app_iter = _MmapIter(self.data)
+        response = Response(headerlist=list(self.headerlist),
+                            app_iter=app_iter,
+                            conditional_response=True)
+        if cache_max_age is not None:
+            response.cache_expires = cache_max_age
+        return response
+
+class _MmapIter(object):
+    def __init__(self, data, start=0, stop=None):
+        self.data = data
+        self.start = start
+        self.stop = len(data) if stop is None else min(stop, len(data))
+
+    def __iter__(self):
+        data = self.data
+        stop = self.stop
+        for offset in range(self.start, stop, _BLOCK_SIZE):
+            yield data[offset:min(offset + _BLOCK_SIZE, stop)]
+
+    def app_iter_range(self, start, stop):
+        return _MmapIter(self.data, start, stop)
+
 _seps = set(['/', os.sep])
 def _contains_slash(item):
     for sep in _seps:
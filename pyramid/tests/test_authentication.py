@@ -310,6 +310,23 @@ class TestRepozeWho1AuthenticationPolicy(unittest.TestCase):
         policy = self._makeOne(callback=callback)
         self.assertEqual(policy.effective_principals(request), [Everyone])
 
+    def test_effective_principals_cache_authentication(self):
+        from pyramid.security import Everyone
+        from pyramid.security import Authenticated
+        registry = DummyRegistry({'pyramid.cache_authentication': True})
+        request = DummyRequest(
+            {'repoze.who.identity':{'repoze.who.userid':'fred'}},
+            registry=registry)
+        calls = []
+        def callback(identity, request):
+            calls.append(identity['repoze.who.userid'])
+            return ['quux']
+        policy = self._makeOne(callback=callback)
+        self.assertEqual(policy.authenticated_userid(request), 'fred')
+        self.assertEqual(policy.effective_principals(request),
+                         [Everyone, Authenticated, 'fred', 'quux'])
+        self.assertEqual(calls, ['fred'])
+
     def test_effective_principals_repoze_who_userid_is_None(self):
         from pyramid.security import Everyone
         request = DummyRequest(
@@ -1306,6 +1323,23 @@ class TestSessionAuthenticationPolicy(unittest.TestCase):
         self.assertEqual(policy.effective_principals(request),
                          [Everyone, Authenticated, 'fred', 'group.foo'])
 
+    def test_effective_principals_cache_authentication(self):
+        from pyramid.security import Everyone
+        from pyramid.security import Authenticated
+        registry = DummyRegistry({'pyramid.cache_authentication': True})
+        request = DummyRequest(session={'userid':'fred'}, registry=registry)
+        calls = []
+        def callback(userid, request):
+            calls.append(userid)
+            return ['group.foo']
+        policy = self._makeOne(callback)
+        self.assertEqual(policy.authenticated_userid(request), 'fred')
+        self.assertEqual(policy.effective_principals(request),
+                         [Everyone, Authenticated, 'fred', 'group.foo'])
+        self.assertEqual(policy.effective_principals(request),
+                         [Everyone, Authenticated, 'fred', 'group.foo'])
+        self.assertEqual(calls, ['fred'])
+
     def test_remember(self):
         request = DummyRequest()
         policy = self._makeOne()
@@ -1459,6 +1493,10 @@ class DummyRequest:
     def add_response_callback(self, callback):
         self.callbacks.append(callback)
 
+class DummyRegistry:
+    def __init__(self, settings):
+        self.settings = settings
+
 class DummyWhoPlugin:
     def remember(self, environ, identity):
         return environ, identity
@@ -90,6 +90,15 @@ class TestFactoriesMixin(unittest.TestCase):
         exts = config.registry.getUtility(IRequestExtensions)
         self.assertTrue('foo' in exts.methods)
 
+    def test_add_request_method_clears_request_classes(self):
+        from pyramid.interfaces import IRequestExtensions
+        config = self._makeOne(autocommit=True)
+        config.add_request_method(lambda x: None, name='foo')
+        exts = config.registry.getUtility(IRequestExtensions)
+        exts._request_classes[object] = object
+        config.add_request_method(lambda x: None, name='bar')
+        self.assertEqual(exts._request_classes, {})
+
     def test_add_request_method_with_unnamed_callable(self):
         from pyramid.interfaces import IRequestExtensions
         config = self._makeOne(autocommit=True)
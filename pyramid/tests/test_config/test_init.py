@@ -358,6 +358,7 @@ class ConfiguratorTests(unittest.TestCase):
         self.assertFalse(hasattr(reg, '_view_lookup_cache'))
         reg._clear_view_lookup_cache()
         self.assertEqual(reg._view_lookup_cache, {})
+        self.assertEqual(reg.view_miss_cache, None)
 
     def test_setup_registry_calls_fix_registry(self):
         reg = DummyRegistry()
@@ -383,6 +384,15 @@ class ConfiguratorTests(unittest.TestCase):
         self.assertEqual(views[1], ((default_exceptionresponse_view,),
                                     {'context':WSGIHTTPException}))
 
+    def test_setup_registry_view_miss_cache_size(self):
+        from pyramid.registry import Registry
+        reg = Registry()
+        config = self._makeOne(reg)
+        config.setup_registry(
+            settings={'pyramid.view_miss_cache_size': '100'})
+        self.assertEqual(reg.view_miss_cache_size, 100)
+        self.assertEqual(reg.view_miss_cache.size, 100)
+
     def test_setup_registry_registers_default_view_predicates(self):
         reg = DummyRegistry()
         config = self._makeOne(reg)
@@ -681,6 +691,35 @@ pyramid.tests.test_config.dummy_include2""",
         self.assertTrue(IApplicationCreated.providedBy(subscriber[0]))
         pyramid.config.global_registries.empty()
 
+    def test_make_wsgi_app_precompute_views(self):
+        import pyramid.config
+        from zope.interface import implementedBy
+        from pyramid.interfaces import IRequest
+        class Context(object):
+            pass
+        config = self._makeOne()
+        config.add_view(lambda *arg: None, context=Context, name='view')
+        app = config.make_wsgi_app(precompute_views=True)
+        self.assertTrue(
+            (IRequest, implementedBy(Context), 'view')
+            in app.registry._view_lookup_cache)
+        pyramid.config.global_registries.empty()
+
+    def test_make_wsgi_app_precompute_views_route_request(self):
+        import pyramid.config
+        from pyramid.request import Request
+        from pyramid.response import Response
+        config = self._makeOne()
+        config.add_route('home', '/')
+        config.add_view(lambda *arg: Response('home'), route_name='home')
+        app = config.make_wsgi_app(precompute_views=True)
+        cache = app.registry._view_lookup_cache
+        keys = set(cache)
+        response = Request.blank('/').get_response(app)
+        self.assertEqual(response.body, b'home')
+        self.assertEqual(set(cache), keys)
+        pyramid.config.global_registries.empty()
+
     def test_include_with_dotted_name(self):
         from pyramid.tests import test_config
         config = self._makeOne()
@@ -16,6 +16,37 @@ class TestRenderingConfiguratorMixin(unittest.TestCase):
                 config.registry.queryUtility(IRendererFactory, name) is not None
                 )
 
+    def test_add_default_fragment_cache(self):
+        from pyramid.interfaces import IFragmentCache
+        config = self._makeOne(autocommit=True)
+        cache = config.registry.getUtility(IFragmentCache)
+        self.assertEqual(cache.cache.size, 1000)
+        self.assertEqual(cache.ttl, None)
+
+    def test_add_default_fragment_cache_settings(self):
+        from pyramid.interfaces import IFragmentCache
+        config = self._makeOne(autocommit=True, settings={
+            'pyramid.fragment_cache_size': '5',
+            'pyramid.fragment_cache_ttl': '60'})
+        cache = config.registry.getUtility(IFragmentCache)
+        self.assertEqual(cache.cache.size, 5)
+        self.assertEqual(cache.ttl, 60)
+
+    def test_add_default_fragment_cache_disabled(self):
+        from pyramid.interfaces import IFragmentCache
+        config = self._makeOne(autocommit=True, settings={
+            'pyramid.fragment_cache_size': '0'})
+        self.assertEqual(config.registry.queryUtility(IFragmentCache), None)
+
+    def test_set_fragment_cache(self):
+        from pyramid.interfaces import IFragmentCache
+        config = self._makeOne(autocommit=True)
+        cache = object()
+        config.set_fragment_cache(cache)
+        self.assertEqual(config.registry.getUtility(IFragmentCache), cache)
+        config.set_fragment_cache(None)
+        self.assertEqual(config.registry.queryUtility(IFragmentCache), None)
+
     def test_add_renderer(self):
         from pyramid.interfaces import IRendererFactory
         config = self._makeOne(autocommit=True)
@@ -31,6 +31,28 @@ class RoutesConfiguratorMixinTests(unittest.TestCase):
         mapper = config.get_routes_mapper()
         self.assertEqual(mapper.routelist, [])
 
+    def test_get_routes_mapper_with_matching_setting(self):
+        config = self._makeOne(settings={'pyramid.route_matching':'regex'})
+        mapper = config.get_routes_mapper()
+        self.assertEqual(mapper.matching, 'regex')
+
+    def test_get_routes_mapper_with_bad_matching_setting(self):
+        from pyramid.exceptions import ConfigurationError
+        config = self._makeOne(settings={'pyramid.route_matching':'wrong'})
+        self.assertRaises(ConfigurationError, config.get_routes_mapper)
+
+    def test_get_routes_mapper_with_match_cache_size_setting(self):
+        config = self._makeOne(
+            settings={'pyramid.route_match_cache_size':'100'})
+        mapper = config.get_routes_mapper()
+        self.assertEqual(mapper.match_cache.size, 100)
+
+    def test_get_routes_mapper_with_bad_match_cache_size_setting(self):
+        from pyramid.exceptions import ConfigurationError
+        config = self._makeOne(
+            settings={'pyramid.route_match_cache_size':'-1'})
+        self.assertRaises(ConfigurationError, config.get_routes_mapper)
+
     def test_get_routes_mapper_already_registered(self):
         from pyramid.interfaces import IRoutesMapper
         config = self._makeOne()
@@ -44,6 +66,37 @@ class RoutesConfiguratorMixinTests(unittest.TestCase):
         config.add_route('name', 'path')
         self._assertRoute(config, 'name', 'path')
 
+    def test_add_route_clears_view_lookup_cache(self):
+        config = self._makeOne(autocommit=True)
+        cache = config.registry._view_lookup_cache
+        config.add_route('name', 'path')
+        self.assertFalse(config.registry._view_lookup_cache is cache)
+
+    def test_add_route_with_host(self):
+        config = self._makeOne(autocommit=True)
+        config.add_route('name', 'path', host=('*.example.com', 'a.org'))
+        route = self._assertRoute(config, 'name', 'path')
+        self.assertEqual(route.host, ('*.example.com', 'a.org'))
+
+    def test_add_route_custom_mapper_without_host(self):
+        from pyramid.interfaces import IRoutesMapper
+        config = self._makeOne(autocommit=True)
+        connected = []
+        class Mapper(object):
+            def connect(self, name, pattern, factory=None, predicates=(),
+                        pregenerator=None, static=False):
+                connected.append((name, pattern))
+        config.registry.registerUtility(Mapper(), IRoutesMapper)
+        config.add_route('name', 'path')
+        self.assertEqual(connected, [('name', 'path')])
+
+    def test_add_route_with_bad_host(self):
+        from pyramid.exceptions import ConfigurationError
+        config = self._makeOne(autocommit=True)
+        for host in ('', 'a.*.org', '*', '**.org'):
+            self.assertRaises(ConfigurationError, config.add_route,
+                              'name', 'path', host=host)
+
     def test_add_route_with_route_prefix(self):
         config = self._makeOne(autocommit=True)
         config.route_prefix = 'root'
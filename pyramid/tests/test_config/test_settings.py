@@ -557,6 +557,20 @@ class TestSettings(unittest.TestCase):
         self.assertEqual(result['default_locale_name'], 'abc')
         self.assertEqual(result['pyramid.default_locale_name'], 'abc')
 
+    def test_cache_authentication(self):
+        result = self._makeOne({})
+        self.assertEqual(result['pyramid.cache_authentication'], False)
+        result = self._makeOne({'pyramid.cache_authentication':'true'})
+        self.assertEqual(result['pyramid.cache_authentication'], True)
+        result = self._makeOne({'pyramid.cache_authentication':'false'})
+        self.assertEqual(result['pyramid.cache_authentication'], False)
+
+    def test_auto_etag(self):
+        result = self._makeOne({})
+        self.assertEqual(result['pyramid.auto_etag'], False)
+        result = self._makeOne({'pyramid.auto_etag':'true'})
+        self.assertEqual(result['pyramid.auto_etag'], True)
+
     def test_originals_kept(self):
         result = self._makeOne({'a':'i am so a'})
         self.assertEqual(result['a'], 'i am so a')
@@ -235,6 +235,31 @@ class TestViewsConfigurationMixin(unittest.TestCase):
         result = wrapper(None, None)
         self.assertEqual(result, 'wrapped2wrapped1OK')
 
+    def test_add_view_with_response_cache(self):
+        from pyramid.request import Request
+        from pyramid.response import Response
+        calls = []
+        def view(request):
+            calls.append(request)
+            return Response('OK')
+        config = self._makeOne(autocommit=True)
+        config.add_view(view=view, response_cache=60)
+        wrapper = self._getViewCallable(config)
+        self.assertEqual(wrapper(None, Request.blank('/')).body, b'OK')
+        self.assertEqual(wrapper(None, Request.blank('/')).body, b'OK')
+        self.assertEqual(len(calls), 1)
+
+    def test_add_view_with_etag(self):
+        from pyramid.request import Request
+        from pyramid.response import Response
+        def view(request):
+            return Response('OK')
+        config = self._makeOne(autocommit=True)
+        config.add_view(view=view, etag_key=lambda request: 'abc')
+        wrapper = self._getViewCallable(config)
+        request = Request.blank('/', if_none_match='"abc"')
+        self.assertEqual(wrapper(None, request).status_int, 304)
+
     def test_add_view_with_http_cache(self):
         import datetime
         from pyramid.response import Response
@@ -2293,6 +2318,35 @@ class TestMultiView(unittest.TestCase):
         mv.media_views['text/html'] = html_views
         self.assertEqual(mv.get_views(request), html_views + mv.views)
 
+    def test_get_views_cached_by_accept_header(self):
+        request = DummyRequest()
+        request.accept = DummyAccept('text/html')
+        request.accept.header_value = 'text/html, */*'
+        mv = self._makeOne()
+        mv.add('view', 99)
+        mv.add('html_view', 98, 'text/html')
+        expected = [(98, 'html_view', None), (99, 'view', None)]
+        self.assertEqual(mv.get_views(request), expected)
+        request = DummyRequest()
+        request.accept = DummyAccept() # would match nothing
+        request.accept.header_value = 'text/html,*/*'
+        self.assertEqual(mv.get_views(request), expected)
+        self.assertEqual(mv.accept_cache.get('text/html,*/*'), expected)
+        mv.add('view2', 100)
+        self.assertEqual(mv.accept_cache.get('text/html,*/*'), None)
+        self.assertEqual(mv.get_views(request),
+                         [(99, 'view', None), (100, 'view2', None)])
+
+    def test_get_views_cached_no_accept_header(self):
+        request = DummyRequest()
+        request.accept = DummyAccept()
+        request.accept.header_value = None
+        mv = self._makeOne()
+        mv.add('view', 99)
+        mv.add('html_view', 98, 'text/html')
+        self.assertEqual(mv.get_views(request), [(99, 'view', None)])
+        self.assertEqual(mv.accept_cache.get(None), [(99, 'view', None)])
+
     def test_get_views_best_match_returns_None(self):
         request = DummyRequest()
         request.accept = DummyAccept(None)
@@ -2364,6 +2418,160 @@ class TestMultiView(unittest.TestCase):
         request = DummyRequest()
         self.assertRaises(HTTPNotFound, mv, context, request)
 
+    def _makePredicatedView(self, *predicates):
+        from pyramid.exceptions import PredicateMismatch
+        calls = []
+        def inner(context, request):
+            calls.append(True)
+            return calls
+        def view(context, request): # pragma: no cover
+            raise PredicateMismatch
+        view.__predicates__ = predicates
+        view.__call_unpredicated__ = inner
+        return view
+
+    def test___call__predicate_tree(self):
+        from pyramid.config.predicates import RequestMethodPredicate
+        from pyramid.config.predicates import XHRPredicate
+        get = self._makePredicatedView(RequestMethodPredicate('GET', None))
+        post_xhr = self._makePredicatedView(
+            RequestMethodPredicate('POST', None), XHRPredicate(True, None))
+        post = self._makePredicatedView(RequestMethodPredicate('POST', None))
+        mv = self._makeOne()
+        mv.add(get, 100)
+        mv.add(post_xhr, 100)
+        mv.add(post, 100)
+        context = DummyContext()
+        request = DummyRequest()
+        request.method = 'POST'
+        request.is_xhr = False
+        self.assertEqual(mv(context, request), [True])
+        self.assertEqual(mv.match(context, request), post)
+        request.is_xhr = True
+        self.assertEqual(mv(context, request), [True])
+        self.assertEqual(mv.match(context, request), post_xhr)
+        request.method = 'HEAD'
+        self.assertEqual(mv(context, request), [True])
+        self.assertEqual(mv.match(context, request), get)
+
+    def test___call__predicate_tree_no_match(self):
+        from pyramid.exceptions import PredicateMismatch
+        from pyramid.config.predicates import RequestMethodPredicate
+        get = self._makePredicatedView(RequestMethodPredicate('GET', None))
+        mv = self._makeOne()
+        mv.add(get, 100)
+        context = DummyContext()
+        request = DummyRequest()
+        request.method = 'DELETE'
+        self.assertRaises(PredicateMismatch, mv, context, request)
+        self.assertRaises(PredicateMismatch, mv.match, context, request)
+
+    def test___call__predicate_tree_evaluates_predicates_once(self):
+        from pyramid.config.predicates import RequestParamPredicate
+        class Predicate(RequestParamPredicate):
+            def __call__(self, context, request):
+                calls.append(True)
+                return False
+        calls = []
+        view1 = self._makePredicatedView(Predicate('a', None))
+        view2 = self._makePredicatedView(Predicate('a', None))
+        view3 = self._makePredicatedView(RequestParamPredicate('b', None))
+        mv = self._makeOne()
+        mv.add(view1, 100)
+        mv.add(view2, 100)
+        mv.add(view3, 100)
+        context = DummyContext()
+        request = DummyRequest()
+        request.params = {'b': '1'}
+        self.assertEqual(mv(context, request), [True])
+        self.assertEqual(calls, [True])
+
+    def test___call__predicate_tree_several_predicates_per_key(self):
+        from pyramid.exceptions import PredicateMismatch
+        from pyramid.config.predicates import RequestMethodPredicate
+        from pyramid.config.predicates import RequestParamPredicate
+        from pyramid.config.predicates import XHRPredicate
+        def make_view(name, *predicates):
+            def predicated(context, request):
+                for predicate in predicates:
+                    if not predicate(context, request):
+                        return False
+                return True
+            def view(context, request):
+                if not predicated(context, request):
+                    raise PredicateMismatch(name)
+                return name
+            view.__predicates__ = predicates
+            view.__predicated__ = predicated
+            view.__call_unpredicated__ = lambda context, request: name
+            return view
+        views = [
+            make_view('post_a',
+                      RequestMethodPredicate(('GET', 'POST'), None),
+                      RequestMethodPredicate(('POST', 'PUT'), None),
+                      RequestParamPredicate('a', None)),
+            make_view('never',
+                      XHRPredicate(True, None),
+                      XHRPredicate(False, None)),
+            make_view('put_xhr',
+                      RequestMethodPredicate(('GET', 'PUT'), None),
+                      RequestMethodPredicate('PUT', None),
+                      XHRPredicate(True, None),
+                      XHRPredicate(True, None)),
+            make_view('post',
+                      RequestMethodPredicate(('DELETE', 'POST'), None),
+                      RequestMethodPredicate(('POST', 'PATCH'), None)),
+            make_view('get', RequestMethodPredicate('GET', None)),
+            ]
+        indexed = self._makeOne()
+        unindexed = self._makeOne()
+        for order, view in enumerate(views):
+            indexed.add(view, order)
+            # views not added via add() are checked one by one
+            unindexed.views.append((order, view, None))
+        def outcome(mv, context, request):
+            try:
+                called = mv(context, request)
+            except PredicateMismatch:
+                called = None
+            try:
+                matched = mv.match(context, request)(context, request)
+            except PredicateMismatch:
+                matched = None
+            return called, matched
+        context = DummyContext()
+        results = {}
+        for method in ('GET', 'HEAD', 'POST', 'PUT', 'DELETE', 'PATCH'):
+            for xhr in (False, True):
+                for params in ({}, {'a': '1'}):
+                    request = DummyRequest()
+                    request.method = method
+                    request.is_xhr = xhr
+                    request.params = params
+                    expected = outcome(unindexed, context, request)
+                    self.assertEqual(outcome(indexed, context, request),
+                                     expected)
+                    results[(method, xhr, bool(params))] = expected[0]
+        self.assertEqual(results[('POST', False, True)], 'post_a')
+        self.assertEqual(results[('POST', False, False)], 'post')
+        self.assertEqual(results[('PUT', True, False)], 'put_xhr')
+        self.assertEqual(results[('PUT', False, False)], None)
+        self.assertEqual(results[('HEAD', True, True)], 'get')
+        self.assertEqual(results[('DELETE', False, False)], None)
+
+    def test___call__predicate_tree_view_not_added(self):
+        from pyramid.config.predicates import RequestMethodPredicate
+        get = self._makePredicatedView(RequestMethodPredicate('GET', None))
+        mv = self._makeOne()
+        mv.add(get, 100)
+        context = DummyContext()
+        request = DummyRequest()
+        request.method = 'POST'
+        def view(context, request):
+            return 'OK'
+        mv.views.append((101, view, None))
+        self.assertEqual(mv(context, request), 'OK')
+
     def test___call__intermediate_not_found(self):
         from pyramid.exceptions import PredicateMismatch
         mv = self._makeOne()
@@ -3216,6 +3424,15 @@ class TestViewDeriver(unittest.TestCase):
         self.assertEqual(next, True)
         self.assertEqual(predicates, [True, True])
 
+    def test_with_predicates_call_unpredicated(self):
+        response = DummyResponse()
+        view = lambda *arg: response
+        def predicate1(context, request):
+            return False
+        deriver = self._makeOne(predicates=[predicate1])
+        result = deriver(view)
+        self.assertEqual(result.__call_unpredicated__(None, None), response)
+
     def test_with_predicates_notall(self):
         from pyramid.httpexceptions import HTTPNotFound
         view = lambda *arg: 'OK'
@@ -3235,6 +3452,48 @@ class TestViewDeriver(unittest.TestCase):
         self.assertRaises(HTTPNotFound, result, None, None)
         self.assertEqual(predicates, [True, True])
 
+    def test_fused_view(self):
+        from pyramid.response import Response
+        from pyramid.httpexceptions import HTTPForbidden
+        from pyramid.exceptions import PredicateMismatch
+        response = Response('OK')
+        def view(context, request):
+            return response
+        self._registerSecurityPolicy(True)
+        predicate_results = [True]
+        def predicate(context, request):
+            return predicate_results[0]
+        predicate.text = lambda: 'predicate'
+        deriver = self._makeOne(permission='view', http_cache=3600,
+                                predicates=[predicate], phash='abc')
+        result = deriver(view)
+        # a single callable wraps the view
+        self.assertTrue(result.__wraps__ is view)
+        self.assertEqual(result.__name__, 'view')
+        self.assertEqual(result.__phash__, 'abc')
+        self.assertEqual(result.__permission__, 'view')
+        self.assertTrue(result.__call_permissive__.__wraps__ is view)
+        self.assertTrue(result.__call_unpredicated__.__wraps__ is view)
+        request = self._makeRequest()
+        self.assertEqual(result(None, request), response)
+        self.assertEqual(response.cache_control.max_age, 3600)
+        predicate_results[0] = False
+        self.assertRaises(PredicateMismatch, result, None, request)
+        self.assertFalse(result.__predicated__(None, request))
+        from pyramid.interfaces import IAuthorizationPolicy
+        self.config.registry.getUtility(
+            IAuthorizationPolicy).permitted = False
+        self.assertRaises(HTTPForbidden, result.__call_unpredicated__,
+                          None, request)
+        self.assertEqual(result.__call_permissive__(None, request), response)
+
+    def test_fused_view_no_stages(self):
+        from pyramid.renderers import null_renderer
+        def view(context, request):
+            """ """
+        deriver = self._makeOne(renderer=null_renderer)
+        self.assertTrue(deriver(view) is view)
+
     def test_with_wrapper_viewname(self):
         from pyramid.response import Response
         from pyramid.interfaces import IView
@@ -3484,6 +3743,28 @@ class TestViewDeriver(unittest.TestCase):
         result = deriver(view)
         self.assertNotEqual(result, view)
 
+    def test_attr_wrapped_view_decorated_nondefault_phash(self):
+        from pyramid.response import Response
+        response = Response('OK')
+        decorated = []
+        def decorator(view):
+            def decorated_view(context, request):
+                return view(context, request)
+            decorated.append(decorated_view)
+            return decorated_view
+        def view(context, request):
+            return response
+        deriver = self._makeOne(decorator=decorator, phash='nondefault',
+                                accept='text/html', order=5)
+        result = deriver(view)
+        # the decorated view is wrapped rather than given the attributes
+        self.assertFalse(result is decorated[0])
+        self.assertFalse(hasattr(decorated[0], '__phash__'))
+        self.assertEqual(result.__phash__, 'nondefault')
+        self.assertEqual(result.__accept__, 'text/html')
+        self.assertEqual(result.__order__, 5)
+        self.assertEqual(result(None, self._makeRequest()), response)
+
     def test_http_cached_view_integer(self):
         import datetime
         from pyramid.response import Response
@@ -3596,6 +3877,372 @@ class TestViewDeriver(unittest.TestCase):
         def view(request): pass
         self.assertRaises(ConfigurationError, deriver, view)
 
+    def test_response_cached_view(self):
+        from pyramid.request import Request
+        from pyramid.response import Response
+        calls = []
+        def inner_view(context, request):
+            calls.append(request)
+            return Response('OK %d' % len(calls))
+        deriver = self._makeOne(response_cache=3600, http_cache=60)
+        result = deriver(inner_view)
+        self.assertFalse(result is inner_view)
+        self.assertEqual(inner_view.__module__, result.__module__)
+        response = result(None, Request.blank('/a?x=1&y=2'))
+        self.assertEqual(response.body, b'OK 1')
+        response = result(None, Request.blank('/a?y=2&x=1'))
+        self.assertEqual(response.body, b'OK 1')
+        self.assertEqual(response.cache_control.max_age, 60)
+        self.assertEqual(len(calls), 1)
+        response = result(None, Request.blank('/a?x=2'))
+        self.assertEqual(response.body, b'OK 2')
+        response = result(None, Request.blank('/b'))
+        self.assertEqual(response.body, b'OK 3')
+        response = result(None, Request.blank('/b', POST={'a': '1'}))
+        self.assertEqual(response.body, b'OK 4')
+        response = result(None, Request.blank('/b', POST={'a': '1'}))
+        self.assertEqual(response.body, b'OK 5')
+
+    def test_response_cached_view_head(self):
+        from pyramid.request import Request
+        from pyramid.response import Response
+        calls = []
+        def inner_view(context, request):
+            calls.append(request)
+            if request.method == 'HEAD':
+                return Response()
+            return Response('OK %d' % len(calls))
+        deriver = self._makeOne(response_cache=3600)
+        result = deriver(inner_view)
+        response = result(None, Request.blank('/a', method='HEAD'))
+        self.assertEqual(response.body, b'')
+        response = result(None, Request.blank('/a'))
+        self.assertEqual(response.body, b'OK 2')
+        response = result(None, Request.blank('/a', method='HEAD'))
+        self.assertEqual(response.body, b'OK 2')
+        response = result(None, Request.blank('/a'))
+        self.assertEqual(response.body, b'OK 2')
+        self.assertEqual(len(calls), 2)
+
+    def test_response_cached_view_rendered(self):
+        from pyramid.request import Request
+        calls = []
+        def inner_view(context, request):
+            calls.append(request)
+            return {'a': '1'}
+        class moo(object):
+            def render_view(inself, req, resp, view_inst, ctx):
+                from pyramid.response import Response
+                return Response('rendered')
+            def clone(self):
+                return self
+        renderer = moo()
+        deriver = self._makeOne(renderer=renderer, response_cache=3600)
+        result = deriver(inner_view)
+        for i in range(2):
+            request = Request.blank('/')
+            request.registry = self.config.registry
+            response = result(None, request)
+            self.assertEqual(response.body, b'rendered')
+        self.assertEqual(len(calls), 1)
+
+    def test_response_cached_view_tuple(self):
+        from pyramid.request import Request
+        from pyramid.response import Response
+        calls = []
+        def inner_view(context, request):
+            calls.append(request)
+            return Response('OK %d' % len(calls))
+        def key(request):
+            if request.path_info != '/nocache':
+                return request.path_info
+        deriver = self._makeOne(response_cache=(3600, {'key': key,
+                                                       'size': 1}))
+        result = deriver(inner_view)
+        self.assertEqual(result(None, Request.blank('/a?x=1')).body, b'OK 1')
+        self.assertEqual(result(None, Request.blank('/a?x=2')).body, b'OK 1')
+        self.assertEqual(result(None, Request.blank('/nocache')).body,
+                         b'OK 2')
+        self.assertEqual(result(None, Request.blank('/nocache')).body,
+                         b'OK 3')
+        self.assertEqual(result(None, Request.blank('/b')).body, b'OK 4')
+        self.assertEqual(result(None, Request.blank('/a')).body, b'OK 5')
+
+    def test_response_cached_view_timedelta(self):
+        import datetime
+        def view(request): pass
+        deriver = self._makeOne(response_cache=datetime.timedelta(hours=1))
+        result = deriver(view)
+        self.assertEqual(
+            result.__wraps__.__original_view__, view) # doesn't blow up
+
+    def test_response_cached_view_bad_tuple(self):
+        deriver = self._makeOne(response_cache=(None,))
+        def view(request): pass
+        self.assertRaises(ConfigurationError, deriver, view)
+
+    def test_response_cached_view_unknown_option(self):
+        deriver = self._makeOne(response_cache=(60, {'wrong': True}))
+        def view(request): pass
+        self.assertRaises(ConfigurationError, deriver, view)
+
+    def test_etag_view(self):
+        from pyramid.request import Request
+        from pyramid.response import Response
+        def inner_view(context, request):
+            return Response('OK')
+        deriver = self._makeOne(etag=True, http_cache=60)
+        result = deriver(inner_view)
+        response = result(None, Request.blank('/'))
+        self.assertEqual(response.status_int, 200)
+        etag = response.etag
+        self.assertTrue(etag)
+        request = Request.blank('/', if_none_match='"%s"' % etag)
+        response = result(None, request)
+        self.assertEqual(response.status_int, 304)
+        self.assertEqual(response.body, b'')
+        self.assertEqual(response.etag, etag)
+        self.assertEqual(response.cache_control.max_age, 60)
+        request = Request.blank('/', if_none_match='"other"')
+        self.assertEqual(result(None, request).status_int, 200)
+
+    def test_etag_view_etag_key(self):
+        from pyramid.request import Request
+        from pyramid.response import Response
+        calls = []
+        def inner_view(context, request):
+            calls.append(request)
+            return Response('OK')
+        deriver = self._makeOne(etag_key=lambda request: 'v1', http_cache=60)
+        result = deriver(inner_view)
+        response = result(None, Request.blank('/'))
+        self.assertEqual(response.etag, 'v1')
+        request = Request.blank('/', if_none_match='"v1"')
+        response = result(None, request)
+        self.assertEqual(response.status_int, 304)
+        self.assertEqual(response.etag, 'v1')
+        self.assertEqual(response.cache_control.max_age, 60)
+        self.assertEqual(len(calls), 1)
+
+    def test_etag_view_setting(self):
+        from pyramid.request import Request
+        from pyramid.response import Response
+        class moo(object):
+            def render_view(inself, req, resp, view_inst, ctx):
+                return Response('rendered')
+            def clone(self):
+                return self
+        def inner_view(context, request):
+            return {}
+        self.config.registry.settings['pyramid.auto_etag'] = True
+        result = self._makeOne(renderer=moo())(inner_view)
+        self.assertTrue(result(None, Request.blank('/')).etag)
+        result = self._makeOne(renderer=moo(), etag=False)(inner_view)
+        self.assertEqual(result(None, Request.blank('/')).etag, None)
+
+    def test_etag_view_setting_null_renderer(self):
+        from pyramid.renderers import null_renderer
+        def inner_view(context, request):
+            pass
+        self.config.registry.settings['pyramid.auto_etag'] = True
+        deriver = self._makeOne(renderer=null_renderer)
+        self.assertTrue(deriver(inner_view) is inner_view)
+
+class TestResponseCache(unittest.TestCase):
+    def _makeOne(self, seconds=3600, **kw):
+        from pyramid.config.views import ResponseCache
+        return ResponseCache(seconds, **kw)
+
+    def _makeRequest(self, path='/', **kw):
+        from pyramid.request import Request
+        return Request.blank(path, **kw)
+
+    def _store(self, cache, request, response):
+        key, cached = cache.get(request)
+        self.assertEqual(cached, None)
+        cache.put(key, request, response)
+
+    def test_get_miss(self):
+        cache = self._makeOne()
+        key, response = cache.get(self._makeRequest('/a?b=1'))
+        self.assertEqual(key, ('http://localhost', '/a', (('b', '1'),)))
+        self.assertEqual(response, None)
+
+    def test_get_hit(self):
+        from pyramid.response import Response
+        cache = self._makeOne()
+        response = Response('OK')
+        response.headers['X-Foo'] = 'bar'
+        self._store(cache, self._makeRequest(), response)
+        key, cached = cache.get(self._makeRequest())
+        self.assertFalse(cached is response)
+        self.assertEqual(cached.status, '200 OK')
+        self.assertEqual(cached.body, b'OK')
+        self.assertEqual(cached.headers['X-Foo'], 'bar')
+        self.assertEqual(cached.content_length, 2)
+
+    def test_get_matched_route(self):
+        cache = self._makeOne()
+        request = self._makeRequest('/a/1')
+        request.matched_route = DummyRoute('a')
+        request.matchdict = {'id': '1'}
+        key, response = cache.get(request)
+        self.assertEqual(key, ('http://localhost', ('a', (('id', '1'),)), ()))
+
+    def test_get_expired(self):
+        from pyramid.response import Response
+        cache = self._makeOne(seconds=-1)
+        self._store(cache, self._makeRequest(), Response('OK'))
+        key, cached = cache.get(self._makeRequest())
+        self.assertEqual(cached, None)
+
+    def test_get_bad_method(self):
+        cache = self._makeOne()
+        request = self._makeRequest(method='PUT')
+        self.assertEqual(cache.get(request), (None, None))
+
+    def test_put_head(self):
+        from pyramid.response import Response
+        cache = self._makeOne()
+        self._store(cache, self._makeRequest(method='HEAD'), Response())
+        key, cached = cache.get(self._makeRequest())
+        self.assertEqual(cached, None)
+
+    def test_get_key_None(self):
+        cache = self._makeOne(key=lambda request: None)
+        self.assertEqual(cache.get(self._makeRequest()), (None, None))
+
+    def test_put_vary(self):
+        from pyramid.response import Response
+        cache = self._makeOne()
+        response = Response('json')
+        response.vary = ('Accept',)
+        request = self._makeRequest(headers={'Accept': 'application/json'})
+        self._store(cache, request, response)
+        request = self._makeRequest(headers={'Accept': 'text/html'})
+        self.assertEqual(cache.get(request)[1], None)
+        request = self._makeRequest(headers={'Accept': 'application/json'})
+        self.assertEqual(cache.get(request)[1].body, b'json')
+
+    def test_put_vary_star(self):
+        from pyramid.response import Response
+        cache = self._makeOne()
+        response = Response('OK')
+        response.vary = ('*',)
+        self._store(cache, self._makeRequest(), response)
+        self.assertEqual(cache.get(self._makeRequest())[1], None)
+
+    def test_put_not_ok(self):
+        from pyramid.response import Response
+        cache = self._makeOne()
+        self._store(cache, self._makeRequest(), Response(status=404))
+        self.assertEqual(cache.get(self._makeRequest())[1], None)
+
+    def test_put_set_cookie(self):
+        from pyramid.response import Response
+        cache = self._makeOne()
+        response = Response('OK')
+        response.set_cookie('a', 'b')
+        self._store(cache, self._makeRequest(), response)
+        self.assertEqual(cache.get(self._makeRequest())[1], None)
+
+    def test_clear(self):
+        from pyramid.response import Response
+        cache = self._makeOne()
+        self._store(cache, self._makeRequest(), Response('OK'))
+        cache.clear()
+        self.assertEqual(cache.get(self._makeRequest())[1], None)
+
+class TestAutoETag(unittest.TestCase):
+    def _makeOne(self, key=None):
+        from pyramid.config.views import AutoETag
+        return AutoETag(key)
+
+    def _makeRequest(self, **kw):
+        from pyramid.request import Request
+        return Request.blank('/', **kw)
+
+    def test_call_sets_md5_etag(self):
+        from pyramid.response import Response
+        etagger = self._makeOne()
+        response = etagger(self._makeRequest(), Response('OK'))
+        expected = Response('OK')
+        expected.md5_etag()
+        self.assertEqual(response.etag, expected.etag)
+        other = etagger(self._makeRequest(), Response('Other'))
+        self.assertNotEqual(response.etag, other.etag)
+
+    def test_call_streamed_body_not_hashed(self):
+        from pyramid.response import Response
+        consumed = []
+        def app_iter():
+            consumed.append(True)
+            yield b'OK'
+        response = Response(app_iter=app_iter())
+        response.content_length = 2
+        response = self._makeOne()(self._makeRequest(), response)
+        self.assertEqual(response.etag, None)
+        self.assertEqual(consumed, [])
+        self.assertEqual(b''.join(response.app_iter), b'OK')
+
+    def test_call_unknown_length_not_hashed(self):
+        from pyramid.response import Response
+        response = Response(app_iter=[b'OK'])
+        response.content_length = None
+        response = self._makeOne()(self._makeRequest(), response)
+        self.assertEqual(response.etag, None)
+
+    def test_call_streamed_body_with_etag(self):
+        from pyramid.response import Response
+        response = Response(app_iter=iter([b'OK']))
+        response = self._makeOne()(self._makeRequest(), response, 'v2')
+        self.assertEqual(response.etag, 'v2')
+
+    def test_call_keeps_view_etag(self):
+        from pyramid.response import Response
+        response = Response('OK')
+        response.etag = 'abc'
+        response = self._makeOne()(self._makeRequest(), response)
+        self.assertEqual(response.etag, 'abc')
+
+    def test_call_with_etag(self):
+        from pyramid.response import Response
+        response = self._makeOne()(self._makeRequest(), Response('OK'), 'v2')
+        self.assertEqual(response.etag, 'v2')
+
+    def test_call_not_modified(self):
+        from pyramid.response import Response
+        response = Response('OK')
+        response.etag = 'abc'
+        response.vary = ('Accept',)
+        response.headers['X-Foo'] = 'bar'
+        request = self._makeRequest(if_none_match='"abc"')
+        result = self._makeOne()(request, response)
+        self.assertEqual(result.status, '304 Not Modified')
+        self.assertEqual(result.etag, 'abc')
+        self.assertEqual(result.headers['Vary'], 'Accept')
+        self.assertFalse('X-Foo' in result.headers)
+
+    def test_call_bad_method(self):
+        from pyramid.response import Response
+        request = self._makeRequest(method='POST')
+        response = self._makeOne()(request, Response('OK'))
+        self.assertEqual(response.etag, None)
+
+    def test_call_not_ok(self):
+        from pyramid.response import Response
+        response = self._makeOne()(self._makeRequest(), Response(status=404))
+        self.assertEqual(response.etag, None)
+
+    def test_matches(self):
+        etagger = self._makeOne()
+        request = self._makeRequest(if_none_match='"abc"')
+        self.assertTrue(etagger.matches(request, 'abc'))
+        self.assertFalse(etagger.matches(request, 'def'))
+        self.assertFalse(etagger.matches(request, None))
+        request = self._makeRequest(if_none_match='"abc"', method='POST')
+        self.assertFalse(etagger.matches(request, 'abc'))
+
 class TestDefaultViewMapper(unittest.TestCase):
     def setUp(self):
         self.config = testing.setUp()
@@ -4066,6 +4713,15 @@ class TestStaticURLInfo(unittest.TestCase):
         self.assertEqual(config.view_kw['permission'], NO_PERMISSION_REQUIRED)
         self.assertEqual(config.view_kw['view'].__class__, static_view)
 
+    def test_add_viewname_with_file_cache(self):
+        from pyramid.static import StaticFileCache
+        config = self._makeConfig()
+        inst = self._makeOne()
+        file_cache = StaticFileCache()
+        inst.add(config, 'view', 'anotherpackage:path', file_cache=file_cache)
+        self.assertEqual(config.view_kw['view'].file_cache, file_cache)
+        self.assertFalse('file_cache' in config.route_kw)
+
     def test_add_viewname_with_route_prefix(self):
         config = self._makeConfig()
         config.route_prefix = '/abc'
@@ -4182,6 +4838,10 @@ class DummyRequest:
 class DummyContext:
     pass
 
+class DummyRoute(object):
+    def __init__(self, name):
+        self.name = name
+
 class DummyAccept(object):
     def __init__(self, *matches):
         self.matches = list(matches)
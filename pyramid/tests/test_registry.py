@@ -22,6 +22,21 @@ class TestRegistry(unittest.TestCase):
         registry._clear_view_lookup_cache()
         self.assertEqual(registry._view_lookup_cache, {})
 
+    def test_clear_view_cache_lookup_no_miss_cache(self):
+        registry = self._makeOne()
+        self.assertEqual(registry.view_miss_cache, None)
+
+    def test_clear_view_cache_lookup_miss_cache(self):
+        registry = self._makeOne()
+        registry.view_miss_cache_size = 10
+        registry._clear_view_lookup_cache()
+        registry.view_miss_cache.put(1, True)
+        cache = registry.view_miss_cache
+        registry._clear_view_lookup_cache()
+        self.assertFalse(registry.view_miss_cache is cache)
+        self.assertEqual(registry.view_miss_cache.size, 10)
+        self.assertEqual(registry.view_miss_cache.get(1), None)
+
     def test_package_name(self):
         package_name = 'testing'
         registry = self._getTargetClass()(package_name)
@@ -47,6 +62,34 @@ class TestRegistry(unittest.TestCase):
                                              [IDummyEvent], Interface)
         self.assertEqual(registry.has_listeners, True)
 
+    def test__has_subscribers(self):
+        from zope.interface import implementedBy
+        registry = self._makeOne()
+        spec = implementedBy(DummyEvent)
+        self.assertFalse(registry._has_subscribers(spec))
+        def f(event): pass
+        registry.registerHandler(f, [IDummyEvent])
+        self.assertTrue(registry._has_subscribers(spec))
+        self.assertEqual(registry._subscribed, {spec: True})
+        self.assertFalse(registry._has_subscribers(implementedBy(object)))
+        registry.unregisterHandler(f, [IDummyEvent])
+        self.assertEqual(registry._subscribed, {})
+        self.assertFalse(registry._has_subscribers(spec))
+
+    def test__has_subscribers_subscription_adapter(self):
+        from zope.interface import Interface, implementedBy
+        registry = self._makeOne()
+        spec = implementedBy(DummyEvent)
+        self.assertFalse(registry._has_subscribers(spec))
+        registry.registerSubscriptionAdapter(DummyEvent,
+                                             [IDummyEvent], Interface)
+        self.assertEqual(registry._subscribed, {})
+        # subscription adapters aren't notified of events
+        self.assertFalse(registry._has_subscribers(spec))
+        registry.unregisterSubscriptionAdapter(DummyEvent,
+                                               [IDummyEvent], Interface)
+        self.assertEqual(registry._subscribed, {})
+
     def test__get_settings(self):
         registry = self._makeOne()
         registry._settings = 'foo'
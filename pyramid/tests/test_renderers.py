@@ -1,3 +1,4 @@
+import json
 import unittest
 
 from pyramid.testing import cleanUp
@@ -94,6 +95,50 @@ class TestJSON(unittest.TestCase):
         renderer = self._makeOne()(None)
         self.assertRaises(TypeError, renderer, objects, {})
 
+    def test_with_custom_adapter_cached_per_class(self):
+        from zope.interface import Interface, directlyProvides
+        class IFoo(Interface):
+            pass
+        class MyObject(object):
+            def __init__(self, x):
+                self.x = x
+        calls = []
+        def adapter(obj, req):
+            calls.append(obj)
+            return obj.x
+        renderer = self._makeOne(adapters=((MyObject, adapter),))
+        renderer.components = DummyComponents(renderer.components)
+        special = MyObject(3)
+        directlyProvides(special, IFoo)
+        renderer.add_adapter(IFoo, lambda obj, req: 'foo')
+        objects = [MyObject(1), MyObject(2), special, MyObject(4)]
+        result = renderer(None)(objects, {})
+        self.assertEqual(result, '[1, 2, "foo", 4]')
+        self.assertEqual(renderer.encoders, {MyObject: adapter})
+        self.assertEqual(renderer.components.lookups, 2)
+        renderer.add_adapter(MyObject, lambda obj, req: 'new')
+        self.assertEqual(renderer.encoders, {})
+        result = renderer(None)(objects[:2], {})
+        self.assertEqual(result, '["new", "new"]')
+
+    def test_with_custom_serializer_using_encoders(self):
+        from datetime import datetime
+        def serializer(obj, default):
+            encoder = default.encoders.get(obj.__class__)
+            if encoder is None:
+                return default(obj)
+            return 'cached %s' % encoder(obj, default.request)
+        request = testing.DummyRequest()
+        def adapter(obj, req):
+            self.assertEqual(req, request)
+            return obj.year
+        renderer = self._makeOne(serializer=serializer)
+        renderer.add_adapter(datetime, adapter)
+        now = datetime(2015, 1, 1)
+        self.assertEqual(renderer(None)(now, {'request':request}), 2015)
+        self.assertEqual(renderer(None)(now, {'request':request}),
+                         'cached 2015')
+
 class Test_string_renderer_factory(unittest.TestCase):
     def _callFUT(self, name):
         from pyramid.renderers import string_renderer_factory
@@ -241,6 +286,29 @@ class TestRendererHelper(unittest.TestCase):
         self.assertEqual(reg.event, {})
         self.assertEqual(reg.event.__class__.__name__, 'BeforeRender')
 
+    def test_render_no_before_render_subscribers(self):
+        from pyramid.registry import Registry
+        from pyramid.interfaces import IBeforeRender
+        from pyramid.interfaces import IRendererFactory
+        reg = Registry()
+        reg.registerUtility(lambda info: lambda *arg: arg, IRendererFactory,
+                            name='foo')
+        helper = self._makeOne('foo', registry=reg)
+        system = {'a': 1}
+        result = helper.render('value', system)
+        self.assertEqual(result[1], system)
+        self.assertFalse(result[1] is system)
+        self.assertEqual(result[1].__class__, dict)
+        events = []
+        reg.registerHandler(events.append, (IBeforeRender,))
+        result = helper.render('value', system)
+        self.assertEqual(result[1].__class__.__name__, 'BeforeRender')
+        self.assertEqual(events, [result[1]])
+        reg.unregisterHandler(events.append, (IBeforeRender,))
+        result = helper.render('value', system)
+        self.assertEqual(result[1].__class__, dict)
+        self.assertEqual(len(events), 1)
+
     def test_render_system_values_is_None(self):
         self._registerRendererFactory()
         request = Dummy()
@@ -510,6 +578,169 @@ class Test_render(unittest.TestCase):
         self.assertEqual(result, '{"a": 1}')
         self.assertFalse('response' in request.__dict__)
 
+class Test_render_cached(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _callFUT(self, renderer_name, value_factory, key, **kw):
+        from pyramid.renderers import render_cached
+        return render_cached(renderer_name, value_factory, key, **kw)
+
+    def _registerRenderer(self):
+        renderer = self.config.testing_add_renderer(
+            'pyramid.tests:abc/def.pt')
+        renderer.string_response = 'abc'
+        return renderer
+
+    def _registerCache(self, registry=None):
+        from pyramid.interfaces import IFragmentCache
+        from pyramid.renderers import FragmentCache
+        if registry is None:
+            registry = self.config.registry
+        cache = FragmentCache()
+        registry.registerUtility(cache, IFragmentCache)
+        return cache
+
+    def _makeValueFactory(self, calls):
+        def value_factory():
+            calls.append(1)
+            return {'a': len(calls)}
+        return value_factory
+
+    def test_no_cache(self):
+        renderer = self._registerRenderer()
+        calls = []
+        factory = self._makeValueFactory(calls)
+        self.assertEqual(self._callFUT('abc/def.pt', factory, 'key'), 'abc')
+        self.assertEqual(self._callFUT('abc/def.pt', factory, 'key'), 'abc')
+        self.assertEqual(len(calls), 2)
+        renderer.assert_(a=2)
+
+    def test_with_cache(self):
+        renderer = self._registerRenderer()
+        cache = self._registerCache()
+        calls = []
+        factory = self._makeValueFactory(calls)
+        self.assertEqual(self._callFUT('abc/def.pt', factory, 'key',
+                                       tags=('menu',)), 'abc')
+        renderer.string_response = 'def'
+        self.assertEqual(self._callFUT('abc/def.pt', factory, 'key'), 'abc')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.invalidate_tag('menu')
+        self.assertEqual(self._callFUT('abc/def.pt', factory, 'key'), 'def')
+        self.assertEqual(len(calls), 2)
+
+    def test_with_request_registry(self):
+        from pyramid.registry import Registry
+        renderer = self._registerRenderer()
+        registry = Registry()
+        cache = self._registerCache(registry)
+        request = testing.DummyRequest()
+        request.registry = registry
+        cache.put('key', 'cached')
+        result = self._callFUT('abc/def.pt', lambda: {}, 'key',
+                               request=request)
+        self.assertEqual(result, 'cached')
+        self.assertEqual(renderer._received, {})
+
+    def test_with_ttl(self):
+        self._registerRenderer()
+        cache = self._registerCache()
+        calls = []
+        factory = self._makeValueFactory(calls)
+        self._callFUT('abc/def.pt', factory, 'key', ttl=-1)
+        self._callFUT('abc/def.pt', factory, 'key', ttl=-1)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cache.misses, 2)
+
+class TestFragmentCache(unittest.TestCase):
+    def _makeOne(self, size=10, ttl=None):
+        from pyramid.renderers import FragmentCache
+        return FragmentCache(size, ttl)
+
+    def test_class_implements_IFragmentCache(self):
+        from zope.interface.verify import verifyClass
+        from pyramid.interfaces import IFragmentCache
+        from pyramid.renderers import FragmentCache
+        verifyClass(IFragmentCache, FragmentCache)
+
+    def test_get_put(self):
+        cache = self._makeOne()
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(cache.get('a', 'default'), 'default')
+        cache.put('a', 'fragment')
+        self.assertEqual(cache.get('a'), 'fragment')
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_ttl(self):
+        cache = self._makeOne(ttl=-1)
+        cache.put('a', 'fragment')
+        self.assertEqual(cache.get('a'), None)
+        cache.put('a', 'fragment', ttl=60)
+        self.assertEqual(cache.get('a'), 'fragment')
+
+    def test_invalidate(self):
+        cache = self._makeOne()
+        cache.put('a', 'fragment')
+        cache.put('b', 'fragment')
+        cache.invalidate('a')
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(cache.get('b'), 'fragment')
+
+    def test_invalidate_tag(self):
+        cache = self._makeOne()
+        cache.put('a', 'fragment', tags=('x', 'y'))
+        cache.put('b', 'fragment', tags=('y',))
+        cache.put('c', 'fragment')
+        cache.invalidate_tag('x')
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(cache.get('b'), 'fragment')
+        cache.invalidate_tag('y')
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('c'), 'fragment')
+        cache.put('a', 'new', tags=('x',))
+        self.assertEqual(cache.get('a'), 'new')
+
+    def test_evictions(self):
+        cache = self._makeOne(size=1)
+        cache.put('a', 'fragment')
+        cache.put('b', 'fragment')
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.get('a'), None)
+
+    def test_invalidate_tag_bounded(self):
+        cache = self._makeOne(size=4)
+        cache.put('old', 'fragment', tags=('a',))
+        cache.put('untagged', 'fragment')
+        for tag in 'bcde':
+            cache.invalidate_tag(tag)
+        cache.put('new', 'fragment', tags=('a',))
+        cache.invalidate_tag('f')
+        self.assertEqual(sorted(cache.invalidated), ['e', 'f'])
+        self.assertEqual(cache.get('old'), None)
+        self.assertEqual(cache.get('untagged'), 'fragment')
+        self.assertEqual(cache.get('new'), 'fragment')
+        cache.invalidate_tag('a')
+        self.assertEqual(cache.get('new'), None)
+
+    def test_clear(self):
+        cache = self._makeOne(size=1)
+        cache.put('a', 'fragment')
+        cache.put('b', 'fragment', tags=('x',))
+        cache.get('b')
+        cache.invalidate_tag('x')
+        cache.clear()
+        self.assertEqual((cache.hits, cache.misses, cache.evictions),
+                         (1, 0, 1))
+        self.assertEqual(cache.invalidated, {})
+        self.assertEqual(cache.get('b'), None)
+        cache.put('b', 'fragment', tags=('x',))
+        self.assertEqual(cache.get('b'), 'fragment')
+
 class Test_render_to_response(unittest.TestCase):
     def setUp(self):
         self.config = testing.setUp()
@@ -706,10 +937,122 @@ class TestJSONP(unittest.TestCase):
         request.GET['callback'] = '78mycallback'
         self.assertRaises(HTTPBadRequest, renderer, {'a':'1'}, {'request':request})
 
+class TestStreamingJSON(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _makeOne(self, **kw):
+        from pyramid.renderers import StreamingJSON
+        return StreamingJSON(**kw)
+
+    def _render(self, value, system=None, **kw):
+        renderer = self._makeOne(**kw)(None)
+        return list(renderer(value, system or {}))
+
+    def test_it(self):
+        self.assertEqual(self._render({'a':1}), [b'{"a": 1}'])
+
+    def test_list(self):
+        self.assertEqual(self._render([1, {'a':[2, 3]}, 'x']),
+                         [b'[1, {"a": [2, 3]}, "x"]'])
+
+    def test_generator(self):
+        consumed = []
+        def gen():
+            for i in range(3):
+                consumed.append(i)
+                yield [i]
+        result = self._makeOne()(None)(gen(), {})
+        self.assertEqual(consumed, [])
+        self.assertEqual(list(result), [b'[[0], [1], [2]]'])
+        self.assertEqual(consumed, [0, 1, 2])
+
+    def test_empty(self):
+        self.assertEqual(self._render(iter([])), [b'[]'])
+        self.assertEqual(self._render([], indent=2), [b'[]'])
+
+    def test_chunk_size(self):
+        result = self._render(('a' * 10 for i in range(10)), chunk_size=30)
+        self.assertTrue(len(result) > 1)
+        for chunk in result[:-1]:
+            self.assertTrue(30 <= len(chunk) < 45)
+        self.assertEqual(json.loads(b''.join(result).decode('utf-8')),
+                         ['a' * 10] * 10)
+
+    def test_indent(self):
+        value = [1, [2, {'a': [3, 4]}], (), {'b': 'c'}]
+        result = b''.join(self._render(value, indent=4)).decode('utf-8')
+        self.assertEqual(result, json.dumps(value, indent=4))
+
+    def test_with_request_content_type_notset(self):
+        request = testing.DummyRequest()
+        self._render({'a':1}, {'request':request})
+        self.assertEqual(request.response.content_type, 'application/json')
+
+    def test_with_request_content_type_set(self):
+        request = testing.DummyRequest()
+        request.response.content_type = 'text/mishmash'
+        self._render({'a':1}, {'request':request})
+        self.assertEqual(request.response.content_type, 'text/mishmash')
+
+    def test_with_custom_adapter(self):
+        from datetime import datetime
+        request = testing.DummyRequest()
+        def adapter(obj, req):
+            self.assertEqual(req, request)
+            return obj.isoformat()
+        now = datetime.utcnow()
+        renderer = self._makeOne()
+        renderer.add_adapter(datetime, adapter)
+        result = list(renderer(None)(iter([now]), {'request':request}))
+        self.assertEqual(result, [('["%s"]' % now.isoformat()).encode()])
+
+    def test_with_object_json_method(self):
+        class Iterable(object):
+            def __iter__(self):
+                return self
+            def __next__(self): # pragma: no cover
+                raise StopIteration
+            next = __next__
+            def __json__(self, request):
+                return {'a': 1}
+        self.assertEqual(self._render([Iterable()]), [b'[{"a": 1}]'])
+
+    def test_with_custom_encoder(self):
+        class Encoder(json.JSONEncoder):
+            item_separator = ';'
+        self.assertEqual(self._render([1, [2, 3]], cls=Encoder),
+                         [b'[1;[2;3]]'])
+
+    def test_render_to_response(self):
+        from pyramid.renderers import RendererHelper
+        self.config.add_renderer('jsonstream', self._makeOne())
+        helper = RendererHelper('jsonstream', registry=self.config.registry)
+        request = testing.DummyRequest()
+        response = helper.render_to_response(iter([1, 2]), None, request)
+        self.assertEqual(list(response.app_iter), [b'[1, 2]'])
+        self.assertEqual(response.content_type, 'application/json')
+
 
 class Dummy:
     pass
 
+class DummyComponents(object):
+    def __init__(self, components):
+        self.components = components
+        self.lookups = 0
+        self.adapters = self
+
+    def registerAdapter(self, *arg):
+        self.components.registerAdapter(*arg)
+
+    def lookup(self, *arg, **kw):
+        self.lookups += 1
+        return self.components.adapters.lookup(*arg, **kw)
+
 class DummyResponse:
     status = '200 OK'
     default_content_type = 'text/html'
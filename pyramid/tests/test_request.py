@@ -475,6 +475,31 @@ class Test_apply_request_extensions(unittest.TestCase):
         self.assertEqual(request.bar, 'bar')
         self.assertEqual(request.foo('abc'), 'abc')
 
+    def test_it_caches_derived_class(self):
+        extensions = Dummy()
+        extensions.methods = {'foo': lambda x, y: y}
+        extensions.descriptors = {'bar': property(lambda x: 'bar')}
+        extensions._request_classes = {}
+        request1 = DummyRequest()
+        request2 = DummyRequest()
+        self._callFUT(request1, extensions=extensions)
+        self._callFUT(request2, extensions=extensions)
+        self.assertTrue(request1.__class__ is request2.__class__)
+        self.assertTrue(request1.__class__ is not DummyRequest)
+        self.assertEqual(extensions._request_classes,
+                         {DummyRequest: request1.__class__})
+        self.assertEqual(request2.bar, 'bar')
+        self.assertEqual(request2.foo('abc'), 'abc')
+        self.assertFalse('foo' in request2.__dict__)
+
+    def test_it_no_extensions(self):
+        extensions = Dummy()
+        extensions.methods = {}
+        extensions.descriptors = {}
+        request = DummyRequest()
+        self._callFUT(request, extensions=extensions)
+        self.assertTrue(request.__class__ is DummyRequest)
+
 class Dummy(object):
     pass
 
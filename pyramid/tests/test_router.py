@@ -119,6 +119,47 @@ class TestRouter(unittest.TestCase):
         self.assertFalse('debug_notfound' in router.__dict__)
         self.assertFalse('debug_routematch' in router.__dict__)
 
+    def test_ctor_chooses_generic_handler_without_routes(self):
+        router = self._makeOne()
+        self.assertEqual(router.orig_handle_request.__name__,
+                         'handle_request')
+
+    def test_ctor_chooses_routed_handler(self):
+        self._connectRoute('foo', 'foo')
+        router = self._makeOne()
+        self.assertEqual(router.orig_handle_request.__name__,
+                         'handle_routed_request')
+
+    def test_ctor_chooses_generic_handler_with_traverser(self):
+        self._connectRoute('foo', 'foo')
+        self._registerTraverserFactory(DummyContext())
+        router = self._makeOne()
+        self.assertEqual(router.orig_handle_request.__name__,
+                         'handle_request')
+
+    def test_ctor_chooses_generic_handler_with_debug_routematch(self):
+        self._registerSettings(debug_routematch=True)
+        self._connectRoute('foo', 'foo')
+        router = self._makeOne()
+        self.assertEqual(router.orig_handle_request.__name__,
+                         'handle_request')
+
+    def test_ctor_chooses_generic_handler_with_contextfound_listener(self):
+        from pyramid.interfaces import IContextFound
+        self._connectRoute('foo', 'foo')
+        self._registerEventListener(IContextFound)
+        router = self._makeOne()
+        self.assertEqual(router.orig_handle_request.__name__,
+                         'handle_request')
+
+    def test_ctor_chooses_routed_handler_with_other_listener(self):
+        from pyramid.interfaces import INewResponse
+        self._connectRoute('foo', 'foo')
+        self._registerEventListener(INewResponse)
+        router = self._makeOne()
+        self.assertEqual(router.orig_handle_request.__name__,
+                         'handle_routed_request')
+
     def test_root_policy(self):
         context = DummyContext()
         self._registerTraverserFactory(context)
@@ -697,6 +738,150 @@ class TestRouter(unittest.TestCase):
             "predicates: 'predicate'" in logger.messages[0]
             )
 
+    def test_call_routed_handler_route_matches(self):
+        from pyramid.interfaces import IViewClassifier
+        iface = self._registerRouteRequest('foo')
+        root = object()
+        def factory(request):
+            return root
+        self._connectRoute('foo', 'archives/{action}/{subpath:.*}', factory)
+        response = DummyResponse()
+        response.app_iter = ['Hello world']
+        view = DummyView(response)
+        environ = self._makeEnviron(PATH_INFO='/archives/action1/a/b')
+        self._registerView(view, '', IViewClassifier, iface, None)
+        router = self._makeOne()
+        self.assertEqual(router.orig_handle_request.__name__,
+                         'handle_routed_request')
+        start_response = DummyStartResponse()
+        result = router(environ, start_response)
+        self.assertEqual(result, ['Hello world'])
+        request = view.request
+        self.assertEqual(request.view_name, '')
+        self.assertEqual(request.subpath, ('a', 'b'))
+        self.assertEqual(request.context, root)
+        self.assertEqual(request.root, root)
+        self.assertEqual(request.virtual_root, root)
+        self.assertEqual(request.virtual_root_path, ())
+        self.assertEqual(request.traversed, ())
+        self.assertEqual(request.matched_route.name, 'foo')
+        self.assertEqual(request.request_iface, iface)
+
+    def test_call_routed_handler_route_traverses(self):
+        from pyramid.interfaces import IViewClassifier
+        self._registerRouteRequest('foo')
+        context = DummyContext()
+        root = {'a':context}
+        def factory(request):
+            return root
+        self._connectRoute('foo', 'archives/*traverse', factory)
+        response = DummyResponse()
+        response.app_iter = ['Hello world']
+        view = DummyView(response)
+        environ = self._makeEnviron(PATH_INFO='/archives/a/b')
+        self._registerView(view, 'b', IViewClassifier, None, None)
+        router = self._makeOne()
+        start_response = DummyStartResponse()
+        result = router(environ, start_response)
+        self.assertEqual(result, ['Hello world'])
+        request = view.request
+        self.assertEqual(request.view_name, 'b')
+        self.assertEqual(request.context, context)
+        self.assertEqual(request.traversed, ('a',))
+
+    def test_ctor_resolves_route_request_info(self):
+        from pyramid.interfaces import IRequest
+        iface = self._registerRouteRequest('foo')
+        def factory(request): pass
+        foo = self._connectRoute('foo', 'archives/{action}', factory)
+        bar = self._connectRoute('bar', 'bar')
+        router = self._makeOne()
+        self.assertEqual(foo._request_info[1:], (iface, factory))
+        self.assertEqual(bar._request_info[1:],
+                         (IRequest, router.root_factory))
+
+    def test_call_route_request_info_stale(self):
+        from pyramid.interfaces import IRequest
+        from pyramid.interfaces import IViewClassifier
+        self._connectRoute('foo', 'archives/{action}')
+        router = self._makeOne()
+        self.assertEqual(router.routes_mapper.get_route('foo')
+                         ._request_info[1], IRequest)
+        iface = self._registerRouteRequest('foo')
+        response = DummyResponse()
+        response.app_iter = ['Hello world']
+        view = DummyView(response)
+        self._registerView(view, '', IViewClassifier, iface, None)
+        self.registry._clear_view_lookup_cache()
+        environ = self._makeEnviron(PATH_INFO='/archives/action1')
+        start_response = DummyStartResponse()
+        result = router(environ, start_response)
+        self.assertEqual(result, ['Hello world'])
+        self.assertEqual(view.request.request_iface, iface)
+
+    def test_call_route_added_after_router_created(self):
+        from pyramid.interfaces import IViewClassifier
+        from pyramid.interfaces import INewRequest
+        self._registerEventListener(INewRequest)
+        self._connectRoute('bar', 'bar')
+        router = self._makeOne()
+        self.assertEqual(router.orig_handle_request.__name__,
+                         'handle_request')
+        iface = self._registerRouteRequest('foo')
+        route = self._connectRoute('foo', 'archives/{action}')
+        self.assertEqual(route._request_info, None)
+        response = DummyResponse()
+        response.app_iter = ['Hello world']
+        view = DummyView(response)
+        self._registerView(view, '', IViewClassifier, iface, None)
+        environ = self._makeEnviron(PATH_INFO='/archives/action1')
+        start_response = DummyStartResponse()
+        result = router(environ, start_response)
+        self.assertEqual(result, ['Hello world'])
+        self.assertEqual(view.request.request_iface, iface)
+        self.assertEqual(route._request_info[1], iface)
+
+    def test_call_custom_mapper_route_without_request_info(self):
+        from pyramid.interfaces import IRoutesMapper
+        from pyramid.interfaces import IViewClassifier
+        from pyramid.interfaces import INewRequest
+        iface = self._registerRouteRequest('foo')
+        class Route(object):
+            name = 'foo'
+            factory = None
+        class Mapper(object):
+            def get_routes(self):
+                return []
+            def __call__(self, request):
+                return {'route':Route(), 'match':{}}
+        self.registry.registerUtility(Mapper(), IRoutesMapper)
+        response = DummyResponse()
+        response.app_iter = ['Hello world']
+        view = DummyView(response)
+        self._registerView(view, '', IViewClassifier, iface, None)
+        environ = self._makeEnviron()
+        router = self._makeOne()
+        self.assertEqual(router.orig_handle_request.__name__,
+                         'handle_routed_request')
+        result = router(environ, DummyStartResponse())
+        self.assertEqual(result, ['Hello world'])
+        self.assertEqual(view.request.request_iface, iface)
+        self._registerEventListener(INewRequest)
+        router = self._makeOne()
+        self.assertEqual(router.orig_handle_request.__name__,
+                         'handle_request')
+        result = router(environ, DummyStartResponse())
+        self.assertEqual(result, ['Hello world'])
+        self.assertEqual(view.request.request_iface, iface)
+
+    def test_call_routed_handler_no_route_matches(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        self._connectRoute('foo', 'archives/:action/:article')
+        environ = self._makeEnviron(PATH_INFO='/wontmatch')
+        router = self._makeOne()
+        start_response = DummyStartResponse()
+        self.assertRaises(HTTPNotFound, router, environ, start_response)
+
     def test_call_route_match_miss_debug_routematch(self):
         from pyramid.httpexceptions import HTTPNotFound
         logger = self._registerLogger()
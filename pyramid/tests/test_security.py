@@ -388,6 +388,52 @@ class TestEffectivePrincipals(unittest.TestCase):
         _registerAuthenticationPolicy(registry, 'yo')
         self.assertEqual(request.effective_principals, 'yo')
 
+    def test_cache_authentication_disabled(self):
+        request = _makeRequest()
+        policy = _registerAuthenticationPolicy(request.registry, ['yo'])
+        self.assertEqual(request.effective_principals, ['yo'])
+        policy.result = ['other']
+        self.assertEqual(request.effective_principals, ['other'])
+        self.assertFalse('_security_cache' in request.__dict__)
+
+    def test_cache_authentication_enabled(self):
+        request = _makeRequest()
+        request.registry.settings = {'pyramid.cache_authentication': True}
+        policy = _registerAuthenticationPolicy(request.registry, ['yo'])
+        result = request.effective_principals
+        self.assertEqual(result, ['yo'])
+        result.append('mutated')
+        policy.result = ['other']
+        self.assertEqual(request.effective_principals, ['yo'])
+
+    def test_cache_authentication_cleared_by_remember_and_forget(self):
+        from pyramid.security import remember, forget
+        request = _makeRequest()
+        request.registry.settings = {'pyramid.cache_authentication': True}
+        policy = _registerAuthenticationPolicy(request.registry, ['yo'])
+        self.assertEqual(request.effective_principals, ['yo'])
+        policy.result = ['fred']
+        remember(request, 'fred')
+        self.assertEqual(request.effective_principals, ['fred'])
+        policy.result = ['anon']
+        forget(request)
+        self.assertEqual(request.effective_principals, ['anon'])
+
+    def test_cache_authentication_subclass_override(self):
+        from pyramid.authentication import RemoteUserAuthenticationPolicy
+        from pyramid.interfaces import IAuthenticationPolicy
+        class Policy(RemoteUserAuthenticationPolicy):
+            def effective_principals(self, request):
+                principals = super(Policy, self).effective_principals(request)
+                return [p for p in principals if p != 'g:admin']
+        policy = Policy(callback=lambda userid, request: ['g:admin'])
+        request = _makeRequest()
+        request.environ['REMOTE_USER'] = 'fred'
+        request.registry.settings = {'pyramid.cache_authentication': True}
+        request.registry.registerUtility(policy, IAuthenticationPolicy)
+        self.assertFalse('g:admin' in policy.effective_principals(request))
+        self.assertFalse('g:admin' in request.effective_principals)
+
 class TestHasPermission(unittest.TestCase):
     def setUp(self):
         testing.setUp()
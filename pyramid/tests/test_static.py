@@ -1,4 +1,5 @@
 import datetime
+import os
 import unittest
 
 # 5 years from now (more or less)
@@ -368,6 +369,179 @@ class Test_static_view_use_subpath_True(unittest.TestCase):
         from pyramid.httpexceptions import HTTPNotFound
         self.assertRaises(HTTPNotFound, inst, context, request)
 
+class Test_static_view_file_cache(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tempdir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.tempdir, 'subdir'))
+        self._write('style.css', b'body {}')
+        self._write('subdir/index.html', b'<html></html>')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tempdir)
+
+    def _write(self, name, data):
+        with open(os.path.join(self.tempdir, name), 'wb') as f:
+            f.write(data)
+
+    def _makeOne(self, **kw):
+        from pyramid.static import static_view
+        kw.setdefault('file_cache', True)
+        return static_view(self.tempdir, use_subpath=True, **kw)
+
+    def _makeRequest(self, path_info, subpath, headers=None):
+        from pyramid.request import Request
+        request = Request.blank(path_info, headers=headers)
+        request.subpath = subpath
+        return request
+
+    def _fail(self, *arg):
+        raise AssertionError('filesystem accessed')
+
+    def test_ctor_file_cache_default(self):
+        from pyramid.static import static_view
+        inst = static_view(self.tempdir)
+        self.assertEqual(inst.file_cache, None)
+
+    def test_ctor_file_cache_true(self):
+        from pyramid.static import StaticFileCache
+        inst = self._makeOne()
+        self.assertTrue(isinstance(inst.file_cache, StaticFileCache))
+
+    def test_cached(self):
+        from pyramid import static
+        inst = self._makeOne(cache_max_age=60)
+        request = self._makeRequest('/style.css', ('style.css',))
+        response = inst(None, request)
+        self.assertEqual(response.body, b'body {}')
+        self.assertEqual(response.content_type, 'text/css')
+        self.assertEqual(response.content_length, 7)
+        self.assertTrue(response.etag)
+        self.assertTrue(response.last_modified)
+        self.assertEqual(response.cache_control.max_age, 60)
+        etag = response.etag
+        os_stat, static.os.stat = static.os.stat, self._fail
+        exists, static.exists = static.exists, self._fail
+        try:
+            response = inst(None, request)
+        finally:
+            static.os.stat = os_stat
+            static.exists = exists
+        self.assertEqual(response.body, b'body {}')
+        self.assertEqual(response.etag, etag)
+
+    def test_conditional(self):
+        inst = self._makeOne()
+        request = self._makeRequest('/style.css', ('style.css',))
+        etag = inst(None, request).etag
+        request = self._makeRequest('/style.css', ('style.css',),
+                                    {'If-None-Match': '"%s"' % etag})
+        response = request.get_response(inst(None, request))
+        self.assertEqual(response.status_int, 304)
+
+    def test_changed_on_disk(self):
+        inst = self._makeOne()
+        inst.file_cache.stat_interval = 0
+        request = self._makeRequest('/style.css', ('style.css',))
+        inst(None, request)
+        self._write('style.css', b'body { color: red }')
+        response = inst(None, request)
+        self.assertEqual(response.body, b'body { color: red }')
+
+    def test_removed_from_disk(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        inst = self._makeOne()
+        inst.file_cache.stat_interval = 0
+        request = self._makeRequest('/style.css', ('style.css',))
+        inst(None, request)
+        os.remove(os.path.join(self.tempdir, 'style.css'))
+        self.assertRaises(HTTPNotFound, inst, None, request)
+
+    def test_not_checked_within_stat_interval(self):
+        inst = self._makeOne()
+        inst.file_cache.stat_interval = 3600
+        request = self._makeRequest('/style.css', ('style.css',))
+        inst(None, request)
+        self._write('style.css', b'body { color: red }')
+        response = inst(None, request)
+        self.assertEqual(response.body, b'body {}')
+
+    def test_index_adds_slash(self):
+        from pyramid.httpexceptions import HTTPMovedPermanently
+        inst = self._makeOne()
+        request = self._makeRequest('/subdir/', ('subdir',))
+        response = inst(None, request)
+        self.assertEqual(response.body, b'<html></html>')
+        request = self._makeRequest('/subdir', ('subdir',))
+        self.assertRaises(HTTPMovedPermanently, inst, None, request)
+
+    def test_mmap(self):
+        from pyramid.static import StaticFileCache
+        from pyramid.response import _BLOCK_SIZE
+        data = b'0123456789' * (_BLOCK_SIZE // 5)
+        self._write('big.js', data)
+        inst = self._makeOne(file_cache=StaticFileCache(max_memory_size=10))
+        request = self._makeRequest('/big.js', ('big.js',))
+        response = inst(None, request)
+        self.assertFalse(isinstance(response.app_iter, list))
+        chunks = list(response.app_iter)
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(b''.join(chunks), data)
+        request = self._makeRequest('/big.js', ('big.js',),
+                                    {'Range': 'bytes=5-14'})
+        response = request.get_response(inst(None, request))
+        self.assertEqual(response.status_int, 206)
+        self.assertEqual(response.body, b'5678901234')
+
+class TestStaticFileCache(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.static import StaticFileCache
+        return StaticFileCache(**kw)
+
+    def _path(self, name):
+        here = os.path.dirname(__file__)
+        return os.path.join(here, 'fixtures', 'static', name)
+
+    def test_get_missing(self):
+        inst = self._makeOne()
+        self.assertEqual(inst.get('key'), None)
+
+    def test_load_and_get(self):
+        inst = self._makeOne()
+        cached = inst.load('key', self._path('index.html'))
+        self.assertEqual(inst.get('key'), cached)
+        self.assertFalse(cached.is_index)
+        self.assertTrue(cached.data.startswith(b'<html>'))
+
+    def test_get_unchanged_after_stat_interval(self):
+        inst = self._makeOne(stat_interval=60)
+        cached = inst.load('key', self._path('index.html'))
+        cached.checked -= 120
+        checked = cached.checked
+        self.assertTrue(inst.get('key') is cached)
+        self.assertTrue(cached.checked > checked + 60)
+        self.assertTrue(inst.get('key') is cached)
+
+    def test_max_entries(self):
+        inst = self._makeOne(max_entries=1)
+        inst.load('a', self._path('index.html'))
+        inst.load('b', self._path('arcs.svg.tgz'))
+        self.assertEqual(inst.get('a'), None)
+        self.assertNotEqual(inst.get('b'), None)
+
+    def test_clear(self):
+        inst = self._makeOne()
+        inst.load('key', self._path('index.html'))
+        inst.clear()
+        self.assertEqual(inst.get('key'), None)
+
+    def test_content_encoding(self):
+        inst = self._makeOne()
+        response = inst.load('key', self._path('arcs.svg.tgz')).response()
+        self.assertEqual(response.content_type, 'application/x-tar')
+        self.assertEqual(response.content_encoding, 'gzip')
+
 class TestMd5AssetTokenGenerator(unittest.TestCase):
     _fspath = None
     _tmp = None
@@ -0,0 +1,256 @@
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+
+from pyramid import testing
+
+class Test_compression_tween_factory(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _makeOne(self, response, settings=None):
+        from pyramid.tweens import compression_tween_factory
+        registry = self.config.registry
+        registry.settings = settings or {}
+        def handler(request):
+            return response
+        return compression_tween_factory(handler, registry)
+
+    def _makeRequest(self, accept_encoding='gzip, deflate', **kw):
+        from pyramid.request import Request
+        headers = {}
+        if accept_encoding is not None:
+            headers['Accept-Encoding'] = accept_encoding
+        return Request.blank('/', headers=headers, **kw)
+
+    def _makeResponse(self, body=b'x' * 2000, content_type='text/html'):
+        from pyramid.response import Response
+        return Response(body, content_type=content_type)
+
+    def test_gzip(self):
+        tween = self._makeOne(self._makeResponse())
+        response = tween(self._makeRequest())
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+        self.assertEqual(response.content_length, len(response.body))
+        body = gzip.GzipFile(fileobj=io.BytesIO(response.body)).read()
+        self.assertEqual(body, b'x' * 2000)
+
+    def test_deflate(self):
+        tween = self._makeOne(self._makeResponse())
+        response = tween(self._makeRequest('gzip;q=0.5, deflate'))
+        self.assertEqual(response.content_encoding, 'deflate')
+        self.assertEqual(zlib.decompress(response.body), b'x' * 2000)
+
+    def test_not_accepted(self):
+        tween = self._makeOne(self._makeResponse())
+        response = tween(self._makeRequest('identity, gzip;q=0'))
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+        self.assertEqual(response.body, b'x' * 2000)
+
+    def test_no_accept_encoding(self):
+        tween = self._makeOne(self._makeResponse())
+        response = tween(self._makeRequest(None))
+        self.assertEqual(response.content_encoding, None)
+
+    def test_accept_any(self):
+        tween = self._makeOne(self._makeResponse())
+        response = tween(self._makeRequest('*'))
+        self.assertEqual(response.content_encoding, 'gzip')
+
+    def test_too_small(self):
+        tween = self._makeOne(self._makeResponse(b'x' * 10))
+        response = tween(self._makeRequest())
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, None)
+
+    def test_min_size_setting(self):
+        tween = self._makeOne(self._makeResponse(b'x' * 10),
+                              {'pyramid.compression_min_size': '10'})
+        response = tween(self._makeRequest())
+        self.assertEqual(response.content_encoding, 'gzip')
+
+    def test_content_type_not_compressible(self):
+        tween = self._makeOne(self._makeResponse(content_type='image/png'))
+        response = tween(self._makeRequest())
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, None)
+
+    def test_compression_types_setting(self):
+        settings = {'pyramid.compression_types': 'image/ application/foo'}
+        response = self._makeResponse(content_type='image/png')
+        response = self._makeOne(response, settings)(self._makeRequest())
+        self.assertEqual(response.content_encoding, 'gzip')
+        response = self._makeResponse(content_type='application/foo')
+        response = self._makeOne(response, settings)(self._makeRequest())
+        self.assertEqual(response.content_encoding, 'gzip')
+        response = self._makeResponse(content_type='text/html')
+        response = self._makeOne(response, settings)(self._makeRequest())
+        self.assertEqual(response.content_encoding, None)
+
+    def test_already_encoded(self):
+        response = self._makeResponse()
+        response.content_encoding = 'br'
+        response = self._makeOne(response)(self._makeRequest())
+        self.assertEqual(response.content_encoding, 'br')
+        self.assertEqual(response.body, b'x' * 2000)
+
+    def test_invalid_quality(self):
+        tween = self._makeOne(self._makeResponse())
+        response = tween(self._makeRequest('gzip;q=abc, deflate;q=0.5'))
+        self.assertEqual(response.content_encoding, 'deflate')
+        response = self._makeOne(self._makeResponse())(
+            self._makeRequest('gzip;q=abc'))
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+
+    def test_head(self):
+        get = self._makeOne(self._makeResponse())(self._makeRequest())
+        tween = self._makeOne(self._makeResponse())
+        response = tween(self._makeRequest(method='HEAD'))
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+        self.assertEqual(response.content_length, get.content_length)
+
+    def test_head_app_iter(self):
+        from pyramid.response import Response
+        app_iter = [b'x' * 2000]
+        response = Response(app_iter=app_iter, content_type='text/plain')
+        tween = self._makeOne(response)
+        response = tween(self._makeRequest(method='HEAD'))
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+        self.assertTrue(response.app_iter is app_iter)
+
+    def test_not_modified(self):
+        response = self._makeResponse()
+        response.status = 304
+        response = self._makeOne(response)(self._makeRequest())
+        self.assertEqual(response.content_encoding, None)
+
+    def test_no_transform(self):
+        response = self._makeResponse()
+        response.cache_control.no_transform = True
+        response = self._makeOne(response)(self._makeRequest())
+        self.assertEqual(response.content_encoding, None)
+
+    def test_existing_vary_and_etag(self):
+        response = self._makeResponse()
+        response.vary = ('Accept',)
+        response.etag = 'abc'
+        response = self._makeOne(response)(self._makeRequest())
+        self.assertEqual(response.vary, ('Accept', 'Accept-Encoding'))
+        self.assertEqual(response.headers['ETag'], 'W/"abc"')
+
+    def test_app_iter(self):
+        from pyramid.response import Response
+        closed = []
+        class AppIter(object):
+            def __iter__(self):
+                yield b'a' * 10
+                yield b''
+                yield b'b' * 10
+            def close(self):
+                closed.append(True)
+        response = Response(app_iter=AppIter(), content_type='text/plain')
+        response = self._makeOne(response)(self._makeRequest())
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(response.content_length, None)
+        self.assertEqual(closed, [])
+        compressed = b''.join(response.app_iter)
+        self.assertEqual(closed, [True])
+        self.assertEqual(zlib.decompress(compressed, 16 + zlib.MAX_WBITS),
+                         b'a' * 10 + b'b' * 10)
+
+class Test_compression_tween_factory_files(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp()
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'file.txt')
+        with open(self.path, 'wb') as f:
+            f.write(b'x' * 2000)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+        testing.tearDown()
+
+    def _makeOne(self, response):
+        from pyramid.tweens import compression_tween_factory
+        self.config.registry.settings = {}
+        def handler(request):
+            return response
+        return compression_tween_factory(handler, self.config.registry)
+
+    def _makeRequest(self, accept_encoding='gzip', environ=None):
+        from pyramid.request import Request
+        return Request.blank('/', environ or {},
+                             headers={'Accept-Encoding': accept_encoding})
+
+    def _writePrecompressed(self):
+        with open(self.path + '.gz', 'wb') as f:
+            f.write(b'compressed')
+
+    def _makeResponse(self, request):
+        from pyramid.response import FileResponse
+        return FileResponse(self.path, request, content_type='text/plain')
+
+    def test_file_not_compressed(self):
+        request = self._makeRequest()
+        response = self._makeOne(self._makeResponse(request))(request)
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.vary, ('Accept-Encoding',))
+        self.assertEqual(b''.join(response.app_iter), b'x' * 2000)
+        response.app_iter.close()
+
+    def test_file_precompressed(self):
+        self._writePrecompressed()
+        request = self._makeRequest()
+        original = self._makeResponse(request)
+        original_iter = original.app_iter
+        response = self._makeOne(original)(request)
+        self.assertTrue(original_iter.file.closed)
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(response.content_type, 'text/plain')
+        self.assertEqual(response.content_length, 10)
+        self.assertEqual(b''.join(response.app_iter), b'compressed')
+        response.app_iter.close()
+
+    def test_file_precompressed_deflate_only(self):
+        self._writePrecompressed()
+        request = self._makeRequest('deflate')
+        response = self._makeOne(self._makeResponse(request))(request)
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(b''.join(response.app_iter), b'x' * 2000)
+        response.app_iter.close()
+
+    def test_file_precompressed_older(self):
+        self._writePrecompressed()
+        os.utime(self.path + '.gz', (0, 0))
+        request = self._makeRequest()
+        response = self._makeOne(self._makeResponse(request))(request)
+        self.assertEqual(response.content_encoding, None)
+        response.app_iter.close()
+
+    def test_file_wrapper_precompressed(self):
+        self._writePrecompressed()
+        class FileWrapper(object):
+            def __init__(self, filelike, block_size):
+                self.filelike = filelike
+            def __iter__(self):
+                return iter(lambda: self.filelike.read(), b'')
+            def close(self):
+                self.filelike.close()
+        request = self._makeRequest(environ={'wsgi.file_wrapper':FileWrapper})
+        response = self._makeOne(self._makeResponse(request))(request)
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertTrue(isinstance(response.app_iter, FileWrapper))
+        self.assertEqual(b''.join(response.app_iter), b'compressed')
+        response.app_iter.close()
@@ -28,6 +28,12 @@ class TestRoute(unittest.TestCase):
         self.assertTrue(route.generate.__class__ is types.FunctionType)
         self.assertTrue(route.match.__class__ is types.FunctionType)
 
+    def test_ctor_host(self):
+        route = self._makeOne('name', ':path', None, (), None, 'Example.com')
+        self.assertEqual(route.host, ('example.com',))
+        route = self._makeOne('name', ':path', None, (), None, ['A', '*.B'])
+        self.assertEqual(route.host, ('a', '*.b'))
+
     def test_ctor_defaults(self):
         import types
         route = self._makeOne('name', ':path')
@@ -35,6 +41,7 @@ class TestRoute(unittest.TestCase):
         self.assertEqual(route.path, ':path')
         self.assertEqual(route.name, 'name')
         self.assertEqual(route.factory, None)
+        self.assertEqual(route.host, None)
         self.assertTrue(route.generate.__class__ is types.FunctionType)
         self.assertTrue(route.match.__class__ is types.FunctionType)
 
@@ -167,6 +174,19 @@ class RoutesMapperTests(unittest.TestCase):
         request = self._getRequest(PATH_INFO='/archives/action1/article1')
         mapper(request)
 
+    def test___call__reuses_info_for_each_candidate(self):
+        mapper = self._makeOne()
+        infos = []
+        def pred(info, request):
+            infos.append(info)
+            return info['route'].name == 'bar'
+        mapper.connect('foo', 'archives/:action', predicates=[pred])
+        mapper.connect('bar', 'archives/:action', predicates=[pred])
+        request = self._getRequest(PATH_INFO='/archives/action1')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['bar'])
+        self.assertTrue(infos[0] is infos[1] is result)
+
     def test_cc_bug(self):
         # "unordered" as reported in IRC by author of
         # http://labs.creativecommons.org/2010/01/13/cc-engine-and-web-non-frameworks/
@@ -228,6 +248,206 @@ class RoutesMapperTests(unittest.TestCase):
         self.assertEqual(result['route'], mapper.routes['root'])
         self.assertEqual(result['match'], {})
 
+    def test___call__prefix_index_preserves_order(self):
+        mapper = self._makeOne()
+        mapper.connect('catchall', '{anything:.*}',
+                       predicates=[lambda *arg: False])
+        mapper.connect('users', 'users/{id}')
+        mapper.connect('user_edit', 'users/{id}/edit')
+        mapper.connect('pages', '/pages/{page}')
+        mapper.connect('fallback', '*traverse')
+        request = self._getRequest(PATH_INFO='/users/1/edit')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['user_edit'])
+        request = self._getRequest(PATH_INFO='/users/1')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['users'])
+        request = self._getRequest(PATH_INFO='/pages')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['fallback'])
+        self.assertEqual(result['match'], {'traverse':('pages',)})
+
+    def test___call__prefix_index_rebuilt_on_connect(self):
+        mapper = self._makeOne()
+        mapper.connect('foo', 'foo/{id}')
+        request = self._getRequest(PATH_INFO='/bar/1')
+        self.assertEqual(mapper(request)['route'], None)
+        mapper.connect('bar', 'bar/{id}')
+        self.assertEqual(mapper(request)['route'], mapper.routes['bar'])
+
+    def test_ctor_unknown_matching(self):
+        klass = self._getTargetClass()
+        self.assertRaises(ValueError, klass, matching='wrong')
+
+    def test___call__regex_matching(self):
+        klass = self._getTargetClass()
+        mapper = klass(matching='regex')
+        mapper.connect('foo', 'archives/:action/article1',
+                       predicates=[lambda *arg: False])
+        mapper.connect('bar', 'archives/:action/:article')
+        mapper.connect('baz', 'archives/{action}/{article:\\d+}')
+        request = self._getRequest(PATH_INFO='/archives/action1/article1')
+        result = mapper(request)
+        self.assertEqual(result['route'], mapper.routes['bar'])
+        self.assertEqual(result['match'],
+                         {'action':'action1', 'article':'article1'})
+        request = self._getRequest(PATH_INFO='/nothing')
+        result = mapper(request)
+        self.assertEqual(result['route'], None)
+
+    def test___call__match_cache_hit(self):
+        klass = self._getTargetClass()
+        mapper = klass(cache_size=10)
+        mapper.connect('foo', 'archives/:action/:article')
+        request = self._getRequest(PATH_INFO='/archives/action1/article1')
+        result = mapper(request)
+        self.assertEqual(mapper.match_cache.misses, 1)
+        result['match']['action'] = 'changed'
+        result = mapper(request)
+        self.assertEqual(mapper.match_cache.hits, 1)
+        self.assertEqual(result['route'], mapper.routes['foo'])
+        self.assertEqual(result['match'].__class__, dict)
+        self.assertEqual(dict(result['match']),
+                         {'action':'action1', 'article':'article1'})
+        result['match']['action'] = 'changed'
+        result = mapper(request)
+        self.assertEqual(result['match']['action'], 'action1')
+
+    def test___call__match_cache_skips_predicated_routes(self):
+        klass = self._getTargetClass()
+        mapper = klass(cache_size=10)
+        mapper.connect('foo', 'archives/:action/article1',
+                       predicates=[lambda *arg: False])
+        mapper.connect('bar', 'archives/:action/:article')
+        mapper.connect('baz', 'other/:action',
+                       predicates=[lambda *arg: True])
+        request = self._getRequest(PATH_INFO='/archives/action1/article1')
+        self.assertEqual(mapper(request)['route'], mapper.routes['bar'])
+        request = self._getRequest(PATH_INFO='/other/action1')
+        self.assertEqual(mapper(request)['route'], mapper.routes['baz'])
+        self.assertEqual(mapper.match_cache.data, {})
+        request = self._getRequest(PATH_INFO='/archives/action1/article2')
+        self.assertEqual(mapper(request)['route'], mapper.routes['bar'])
+        self.assertEqual(len(mapper.match_cache.data), 1)
+
+    def test_connect_clears_match_cache(self):
+        klass = self._getTargetClass()
+        mapper = klass(cache_size=10)
+        mapper.connect('foo', 'archives/:action')
+        request = self._getRequest(PATH_INFO='/archives/action1')
+        mapper(request)
+        mapper.connect('bar', 'archives/action1')
+        self.assertEqual(mapper.match_cache.data, {})
+
+    def test___call__partitions_by_request_method(self):
+        from pyramid.config.predicates import RequestMethodPredicate
+        mapper = self._makeOne()
+        tried = []
+        def match(path):
+            tried.append(path)
+        mapper.connect('get', 'things/:id',
+                       predicates=[RequestMethodPredicate('GET', None)])
+        mapper.routes['get'].match = match
+        mapper.connect('any', 'things/:id')
+        mapper.connect('post', 'things/:id',
+                       predicates=[RequestMethodPredicate('POST', None)])
+        request = self._getRequest(PATH_INFO='/things/1',
+                                   REQUEST_METHOD='POST')
+        request.method = 'POST'
+        self.assertEqual(mapper(request)['route'], mapper.routes['any'])
+        self.assertEqual(tried, [])
+        request = self._getRequest(PATH_INFO='/things/1',
+                                   REQUEST_METHOD='HEAD')
+        mapper(request)
+        self.assertEqual(tried, ['/things/1'])
+
+    def test___call__partitions_by_several_request_methods(self):
+        from pyramid.config.predicates import RequestMethodPredicate
+        from pyramid.urldispatch import _request_methods
+        mapper = self._makeOne()
+        tried = []
+        def match(path):
+            tried.append(path)
+            return {}
+        predicates = [RequestMethodPredicate(('GET', 'POST'), None),
+                      RequestMethodPredicate(('POST', 'PUT'), None)]
+        mapper.connect('both', 'things/:id', predicates=predicates)
+        mapper.routes['both'].match = match
+        mapper.connect('any', 'things/:id')
+        self.assertEqual(_request_methods(mapper.routes['both']),
+                         set(['POST']))
+        for method in ('GET', 'PUT'):
+            request = self._getRequest(PATH_INFO='/things/1',
+                                       REQUEST_METHOD=method)
+            request.method = method
+            self.assertEqual(mapper(request)['route'], mapper.routes['any'])
+        self.assertEqual(tried, [])
+        request = self._getRequest(PATH_INFO='/things/1',
+                                   REQUEST_METHOD='POST')
+        request.method = 'POST'
+        self.assertEqual(mapper(request)['route'], mapper.routes['both'])
+        self.assertEqual(tried, ['/things/1'])
+
+    def test___call__unknown_request_method_uses_agnostic_routes(self):
+        from pyramid.config.predicates import RequestMethodPredicate
+        mapper = self._makeOne()
+        mapper.connect('post', 'things/:id',
+                       predicates=[RequestMethodPredicate('POST', None)])
+        mapper.connect('any', 'things/:id')
+        request = self._getRequest(PATH_INFO='/things/1',
+                                   REQUEST_METHOD='PROPFIND')
+        self.assertEqual(mapper(request)['route'], mapper.routes['any'])
+        self.assertEqual(list(mapper._indexes), [(frozenset(), None)])
+
+    def test___call__partitions_by_host(self):
+        mapper = self._makeOne()
+        mapper.connect('a', 'things/:id', host='a.example.com')
+        mapper.connect('wild', 'things/:id', host=('*.example.com',))
+        mapper.connect('any', 'things/:id')
+        mapper.connect('b', 'things/:id', host='B.example.com')
+        def route_for(host):
+            request = self._getRequest(PATH_INFO='/things/1', HTTP_HOST=host)
+            return mapper(request)['route'].name
+        self.assertEqual(route_for('a.example.com'), 'a')
+        self.assertEqual(route_for('A.Example.com:8080'), 'a')
+        self.assertEqual(route_for('b.example.com'), 'wild')
+        self.assertEqual(route_for('x.y.example.com'), 'wild')
+        self.assertEqual(route_for('example.com'), 'any')
+        self.assertEqual(route_for('other.org'), 'any')
+
+    def test___call__host_from_server_name(self):
+        mapper = self._makeOne()
+        mapper.connect('local', 'things/:id', host='localhost')
+        request = self._getRequest(PATH_INFO='/things/1')
+        self.assertEqual(mapper(request)['route'], mapper.routes['local'])
+
+    def test___call__match_cache_per_host(self):
+        klass = self._getTargetClass()
+        mapper = klass(cache_size=10)
+        mapper.connect('a', 'things/:id', host='a.example.com')
+        mapper.connect('any', 'things/:id')
+        request = self._getRequest(PATH_INFO='/things/1',
+                                   HTTP_HOST='b.example.com')
+        self.assertEqual(mapper(request)['route'], mapper.routes['any'])
+        request = self._getRequest(PATH_INFO='/things/1',
+                                   HTTP_HOST='a.example.com')
+        self.assertEqual(mapper(request)['route'], mapper.routes['a'])
+
+    def test___call__match_cache_per_request_method(self):
+        from pyramid.config.predicates import RequestMethodPredicate
+        klass = self._getTargetClass()
+        mapper = klass(cache_size=10)
+        mapper.connect('post', 'things/:id',
+                       predicates=[RequestMethodPredicate('POST', None)])
+        mapper.connect('any', 'things/:id')
+        request = self._getRequest(PATH_INFO='/things/1',
+                                   REQUEST_METHOD='GET')
+        self.assertEqual(mapper(request)['route'], mapper.routes['any'])
+        request = self._getRequest(PATH_INFO='/things/1',
+                                   REQUEST_METHOD='POST')
+        request.method = 'POST'
+        self.assertEqual(mapper(request)['route'], mapper.routes['post'])
+
     def test_has_routes(self):
         mapper = self._makeOne()
         self.assertEqual(mapper.has_routes(), False)
@@ -262,6 +482,230 @@ class RoutesMapperTests(unittest.TestCase):
         mapper.routes['abc'] =  route
         self.assertEqual(mapper.generate('abc', {}), 123)
 
+class TestMatch(unittest.TestCase):
+    def _makeOne(self, path='/a/1/b/c'):
+        from pyramid.urldispatch import _compile_route
+        matcher = _compile_route('/a/{x}*rest')[0]
+        return matcher(path)
+
+    def test_values_extracted_on_read(self):
+        from pyramid.urldispatch import Match
+        match = self._makeOne()
+        self.assertTrue(isinstance(match, Match))
+        if PY3:
+            # values are extracted up front on Python 2
+            self.assertFalse(dict.__getitem__(match, 'x') == '1')
+        self.assertEqual(match['x'], '1')
+        self.assertEqual(dict.__getitem__(match, 'x'), '1')
+        self.assertEqual(match.get('rest'), ('b', 'c'))
+        self.assertEqual(match.get('missing', 'default'), 'default')
+        self.assertEqual(match.setdefault('x', 'other'), '1')
+        self.assertRaises(KeyError, match.__getitem__, 'missing')
+
+    def test_setdefault_unread_key(self):
+        match = self._makeOne()
+        self.assertEqual(match.setdefault('rest', 'other'), ('b', 'c'))
+        self.assertEqual(match.setdefault('new', 'value'), 'value')
+        self.assertEqual(match, {'x':'1', 'rest':('b', 'c'), 'new':'value'})
+
+    def test_keys_present_without_extraction(self):
+        match = self._makeOne()
+        self.assertEqual(len(match), 2)
+        self.assertTrue('x' in match)
+        self.assertEqual(sorted(match), ['rest', 'x'])
+        self.assertEqual(sorted(match.keys()), ['rest', 'x'])
+
+    def test_bulk_reads(self):
+        match = self._makeOne()
+        self.assertEqual(sorted(match.items()),
+                         [('rest', ('b', 'c')), ('x', '1')])
+        match = self._makeOne()
+        self.assertEqual(sorted(match.values(), key=str),
+                         [('b', 'c'), '1'])
+        match = self._makeOne()
+        self.assertEqual(dict(match), {'x':'1', 'rest':('b', 'c')})
+        updated = {}
+        updated.update(self._makeOne())
+        self.assertEqual(updated, {'x':'1', 'rest':('b', 'c')})
+        match = self._makeOne()
+        self.assertEqual(match.copy(), {'x':'1', 'rest':('b', 'c')})
+        match = self._makeOne()
+        self.assertEqual(repr(match), repr(match.copy()))
+
+    def test_mutation(self):
+        match = self._makeOne()
+        match['x'] = 'changed'
+        match['new'] = 'value'
+        del match['rest']
+        self.assertEqual(match, {'x':'changed', 'new':'value'})
+        match = self._makeOne()
+        self.assertEqual(match.pop('x'), '1')
+        self.assertEqual(match.popitem(), ('rest', ('b', 'c')))
+
+    def test_equality(self):
+        self.assertEqual(self._makeOne(), self._makeOne())
+        self.assertNotEqual(self._makeOne(), self._makeOne('/a/2'))
+        self.assertEqual({'x':'1', 'rest':('b', 'c')}, self._makeOne())
+
+    def test_as_kwargs_and_json(self):
+        import json
+        def kw(**kw):
+            return kw
+        self.assertEqual(kw(**self._makeOne()), {'x':'1', 'rest':('b', 'c')})
+        self.assertEqual(json.loads(json.dumps(self._makeOne())),
+                         {'x':'1', 'rest':['b', 'c']})
+
+    def test_copy_and_pickle(self):
+        import copy
+        import pickle
+        expected = {'x':'1', 'rest':('b', 'c')}
+        self.assertEqual(copy.copy(self._makeOne()), expected)
+        self.assertEqual(copy.deepcopy(self._makeOne()), expected)
+        self.assertEqual(pickle.loads(pickle.dumps(self._makeOne())),
+                         expected)
+
+class TestCompilePredicates(unittest.TestCase):
+    def _callFUT(self, predicates):
+        from pyramid.urldispatch import _compile_predicates
+        return _compile_predicates(predicates)
+
+    def _makeRequest(self, **kw):
+        from pyramid.request import Request
+        return Request.blank('/', **kw)
+
+    def test_all_true(self):
+        from pyramid.config.predicates import (
+            HeaderPredicate,
+            RequestMethodPredicate,
+            XHRPredicate,
+            )
+        check = self._callFUT([
+            HeaderPredicate('X-Foo:b.*', None),
+            HeaderPredicate('X-Bar', None),
+            XHRPredicate(True, None),
+            RequestMethodPredicate('GET', None),
+            lambda info, request: info['ok'],
+            ])
+        request = self._makeRequest(
+            headers={'X-Foo':'baz', 'X-Bar':'1',
+                     'X-Requested-With':'XMLHttpRequest'})
+        self.assertTrue(check({'ok':True}, request))
+        self.assertFalse(check({'ok':False}, request))
+
+    def test_each_inlined_predicate_can_fail(self):
+        from pyramid.config.predicates import (
+            HeaderPredicate,
+            RequestMethodPredicate,
+            XHRPredicate,
+            )
+        request = self._makeRequest(headers={'X-Foo':'qux'})
+        for predicate in (
+            HeaderPredicate('X-Foo:b.*', None),
+            HeaderPredicate('X-Missing:.*', None),
+            HeaderPredicate('X-Bar', None),
+            XHRPredicate(True, None),
+            RequestMethodPredicate('POST', None),
+            ):
+            check = self._callFUT([predicate])
+            self.assertEqual(check({}, request), predicate(None, request))
+            self.assertFalse(check({}, request))
+
+    def test_inlined_before_called(self):
+        from pyramid.config.predicates import RequestMethodPredicate
+        called = []
+        def predicate(info, request):
+            called.append(True)
+            return True
+        check = self._callFUT(
+            [predicate, RequestMethodPredicate('POST', None)])
+        self.assertFalse(check({}, self._makeRequest()))
+        self.assertEqual(called, [])
+
+class TestPrefixTrie(unittest.TestCase):
+    def _makeOne(self, patterns):
+        from pyramid.urldispatch import (
+            _PrefixTrie,
+            Route,
+            )
+        routes = [Route(pattern, pattern) for pattern in patterns]
+        return _PrefixTrie(routes)
+
+    def _candidates(self, trie, path):
+        return [route.name for route in trie.candidates(path)]
+
+    def test_no_routes(self):
+        trie = self._makeOne([])
+        self.assertEqual(self._candidates(trie, '/a/b'), [])
+
+    def test_filters_by_complete_segments(self):
+        trie = self._makeOne(
+            ['/a/{x}', '/a/b/{x}', '/c/{x}', '/{x}', '/a/bc{x}'])
+        self.assertEqual(self._candidates(trie, '/a/b/c'),
+                         ['/a/{x}', '/a/b/{x}', '/{x}', '/a/bc{x}'])
+        self.assertEqual(self._candidates(trie, '/a/b'),
+                         ['/a/{x}', '/{x}', '/a/bc{x}'])
+        self.assertEqual(self._candidates(trie, '/c/d'),
+                         ['/c/{x}', '/{x}'])
+        self.assertEqual(self._candidates(trie, '/d/e'), ['/{x}'])
+
+    def test_oldstyle_and_star_patterns(self):
+        trie = self._makeOne(['a/:x', 'static/*subpath', '*traverse'])
+        self.assertEqual(self._candidates(trie, '/a/b'),
+                         ['a/:x', '*traverse'])
+        self.assertEqual(self._candidates(trie, '/static/css/a.css'),
+                         ['static/*subpath', '*traverse'])
+
+class TestCombinedRegex(unittest.TestCase):
+    def _makeOne(self, patterns):
+        from pyramid.urldispatch import (
+            _CombinedRegex,
+            Route,
+            )
+        routes = [Route(pattern, pattern) for pattern in patterns]
+        return _CombinedRegex(routes)
+
+    def _candidates(self, index, path):
+        return [route.name for route in index.candidates(path)]
+
+    def test_no_routes(self):
+        index = self._makeOne([])
+        self.assertEqual(self._candidates(index, '/a'), [])
+
+    def test_starts_at_first_structural_match(self):
+        index = self._makeOne(['/a/{x}', '/b/{x}', '/{x}/{y}', '/c'])
+        self.assertEqual(self._candidates(index, '/b/1'),
+                         ['/b/{x}', '/{x}/{y}', '/c'])
+        self.assertEqual(self._candidates(index, '/c'), ['/c'])
+        self.assertEqual(self._candidates(index, '/d'), [])
+
+    def test_duplicate_and_nested_group_names(self):
+        index = self._makeOne(['/a/{id:(\\d)+}', '/b/{id}', '/c*id'])
+        self.assertEqual(self._candidates(index, '/b/1'), ['/b/{id}', '/c*id'])
+        self.assertEqual(self._candidates(index, '/c/1/2'), ['/c*id'])
+
+    def test_unembeddable_expression_always_candidate(self):
+        pattern = '/a/{x:(\\d)\\2}'
+        index = self._makeOne([pattern, '/b'])
+        self.assertEqual(self._candidates(index, '/b'), [pattern, '/b'])
+
+    def test_chunks(self):
+        index = self._makeOne(['/%s/{x}' % i for i in range(120)])
+        self.assertEqual(len(index.chunks), 2)
+        self.assertEqual(self._candidates(index, '/119/a'), ['/119/{x}'])
+
+class TestLiteralPrefix(unittest.TestCase):
+    def _callFUT(self, pattern):
+        from pyramid.urldispatch import _literal_prefix
+        return _literal_prefix(pattern)
+
+    def test_it(self):
+        self.assertEqual(self._callFUT(''), '/')
+        self.assertEqual(self._callFUT('/a/b'), '/a/b')
+        self.assertEqual(self._callFUT('a/{b}/c'), '/a/')
+        self.assertEqual(self._callFUT('a/:b/c'), '/a/')
+        self.assertEqual(self._callFUT('/a/b*traverse'), '/a/b')
+        self.assertEqual(self._callFUT('/a{b:\\d{4}}'), '/a')
+
 class TestCompileRoute(unittest.TestCase):
     def _callFUT(self, pattern):
         from pyramid.urldispatch import _compile_route
@@ -409,6 +853,27 @@ class TestCompileRoute(unittest.TestCase):
         # should be a native string
         self.assertEqual(type(result), str)
 
+    def test_generate_with_int_and_safe_values(self):
+        _, generator = self._callFUT('/{a}/{b}/{c}/{d}')
+        result = generator({'a':1, 'b':'two', 'c':'th/ree', 'd':'f our'})
+        self.assertEqual(result, '/1/two/th/ree/f%20our')
+
+    def test_generate_with_string_subclass_and_bool(self):
+        class Name(str):
+            def __str__(self):
+                return 'other'
+        _, generator = self._callFUT('/{a}/{b}')
+        result = generator({'a':Name('name'), 'b':True})
+        self.assertEqual(result, '/other/True')
+
+    def test_generate_missing_value(self):
+        _, generator = self._callFUT('/{a}/{b}')
+        self.assertRaises(KeyError, generator, {'a':1})
+
+    def test_generate_ignores_extra_values(self):
+        _, generator = self._callFUT('/{a}')
+        self.assertEqual(generator({'a':1, 'b':object()}), '/1')
+
 class TestCompileRouteFunctional(unittest.TestCase):
     def matches(self, pattern, path, expected):
         from pyramid.urldispatch import _compile_route
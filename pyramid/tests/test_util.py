@@ -144,6 +144,15 @@ class Test_InstancePropertyHelper(unittest.TestCase):
         self.assertEqual(1, foo.x)
         self.assertEqual(2, foo.y)
 
+    def test_make_class(self):
+        helper = self._getTargetClass()
+        x = helper.make_property(lambda _: 1, name='x')
+        newcls = helper.make_class(Dummy, [x])
+        self.assertTrue(issubclass(newcls, Dummy))
+        self.assertEqual(newcls.__name__, 'Dummy')
+        self.assertEqual(newcls().x, 1)
+        self.assertFalse(hasattr(Dummy, 'x'))
+
     def test_make_property_unicode(self):
         from pyramid.compat import text_
         from pyramid.exceptions import ConfigurationError
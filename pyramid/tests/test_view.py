@@ -144,6 +144,22 @@ class RenderViewToResponseTests(BaseTest, unittest.TestCase):
         result = self._callFUT(context, request, name='notregistered')
         self.assertEqual(result, None)
 
+    def test_call_no_view_registered_miss_cached(self):
+        request = self._makeRequest()
+        registry = request.registry
+        registry.view_miss_cache_size = 10
+        registry._clear_view_lookup_cache()
+        context = self._makeContext()
+        result = self._callFUT(context, request, name='notregistered')
+        self.assertEqual(result, None)
+        cache = registry.view_miss_cache
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(registry._view_lookup_cache, {})
+        registry.adapters.registered = None # would fail if called
+        result = self._callFUT(context, request, name='notregistered')
+        self.assertEqual(result, None)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
     def test_call_no_registry_on_request(self):
         request = self._makeRequest()
         del request.registry
@@ -313,6 +329,77 @@ class RenderViewTests(BaseTest, unittest.TestCase):
         s = self._callFUT(context, request, name='registered', secure=False)
         self.assertEqual(s, b'anotherview')
 
+class Test_precompute_views(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp(autocommit=False)
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _callFUT(self, registry):
+        from pyramid.view import _precompute_views
+        return _precompute_views(registry)
+
+    def test_it(self):
+        from zope.interface import Interface
+        from zope.interface import implementedBy
+        from pyramid.interfaces import IRouteRequest
+        from pyramid.traversal import DefaultRootFactory
+        class Context(object):
+            pass
+        class SubContext(Context):
+            pass
+        class Root(object):
+            pass
+        def view(context, request): pass
+        def other(context, request): pass
+        def routeview(context, request): pass
+        config = self.config
+        config.add_route('foo', '/foo')
+        config.add_route('bar', '/bar', factory=Root)
+        config.add_view(view, context=Context, name='view')
+        config.add_view(other, context=SubContext, name='other')
+        config.add_view(routeview, route_name='foo')
+        config.commit()
+        registry = config.registry
+        self._callFUT(registry)
+        foo_iface = registry.getUtility(IRouteRequest, name='foo')
+        context = implementedBy(Context)
+        subcontext = implementedBy(SubContext)
+        cache = registry._view_lookup_cache
+        names = {IRequest: 'request', foo_iface: 'foo',
+                 Interface: 'Interface', context: 'Context',
+                 subcontext: 'SubContext',
+                 implementedBy(DefaultRootFactory): 'DefaultRootFactory',
+                 implementedBy(Root): 'Root'}
+        self.assertEqual(
+            sorted([(names[k[0]], names[k[1]], k[2]) for k in cache]),
+            [('foo', 'Context', ''),
+             ('foo', 'DefaultRootFactory', ''),
+             ('foo', 'Interface', ''),
+             ('foo', 'Root', ''),
+             ('foo', 'SubContext', ''),
+             ('request', 'Context', 'view'),
+             ('request', 'SubContext', 'other'),
+             ('request', 'SubContext', 'view')])
+        self.assertEqual(len(cache[(IRequest, subcontext, 'view')]), 1)
+        self.assertEqual(cache[(IRequest, context, 'view')],
+                         cache[(IRequest, subcontext, 'view')])
+
+    def test_it_skips_exception_contexts(self):
+        from zope.interface import implementedBy
+        class Context(Exception):
+            pass
+        def view(context, request): pass
+        config = self.config
+        config.add_view(view, context=Context)
+        config.commit()
+        registry = config.registry
+        self._callFUT(registry)
+        self.assertFalse(
+            (IRequest, implementedBy(Context), '')
+            in registry._view_lookup_cache)
+
 class TestViewConfigDecorator(unittest.TestCase):
     def setUp(self):
         testing.setUp()
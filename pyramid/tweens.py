@@ -1,4 +1,6 @@
+import os
 import sys
+import zlib
 
 from pyramid.interfaces import (
     IExceptionViewClassifier,
@@ -6,6 +8,11 @@ from pyramid.interfaces import (
     )
 
 from zope.interface import providedBy
+from pyramid.response import (
+    FileIter,
+    FileResponse,
+    )
+from pyramid.settings import aslist
 from pyramid.view import _call_view
 
 def excview_tween_factory(handler, registry):
@@ -54,6 +61,176 @@ def excview_tween_factory(handler, registry):
 
     return excview_tween
 
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/javascript',
+    'application/json',
+    'application/x-javascript',
+    'application/xml',
+    'image/svg+xml',
+    )
+
+def compression_tween_factory(handler, registry):
+    """ A :term:`tween` factory which produces a tween that compresses the
+    body of responses using the ``gzip`` or ``deflate`` content coding, if
+    the ``Accept-Encoding`` header of the request accepts one.
+
+    Add it using :meth:`pyramid.config.Configurator.add_tween`:
+
+    .. code-block:: python
+
+       config.add_tween('pyramid.tweens.compression_tween_factory')
+
+    Bodies of responses with a known length are compressed at once, and
+    other ``app_iter`` bodies are compressed incrementally as they are
+    iterated over.  Only responses whose content type is listed by the
+    ``pyramid.compression_types`` setting (by default text, JSON,
+    JavaScript, XML and SVG types; a type ending with ``/`` matches every
+    subtype) and whose length is unknown or at least the
+    ``pyramid.compression_min_size`` setting (by default 1024 bytes) are
+    compressed, at the zlib level given by the ``pyramid.compression_level``
+    setting (by default 6).  Responses which already have a
+    ``Content-Encoding``, responses without a body or with partial content
+    and responses with a ``Cache-Control: no-transform`` header are left
+    alone.  Responses to ``HEAD`` requests get the same ``Vary`` and
+    ``Content-Encoding`` headers as responses to the matching ``GET``
+    requests.
+
+    Responses serving a file, such as a
+    :class:`pyramid.response.FileResponse`, are never compressed on the fly,
+    so that they may still be sent using ``wsgi.file_wrapper``.  If a
+    ``gzip`` compressed variant of the file named after it with a ``.gz``
+    suffix exists and isn't older, it is sent instead if the client accepts
+    it.
+
+    .. versionadded:: 1.7
+    """
+    settings = registry.settings or {}
+    level = int(settings.get('pyramid.compression_level', 6))
+    min_size = int(settings.get('pyramid.compression_min_size', 1024))
+    types = tuple(aslist(settings.get('pyramid.compression_types', ''))
+                  or COMPRESSIBLE_TYPES)
+
+    def compression_tween(request):
+        response = handler(request)
+        if not _compressible(request, response, types):
+            return response
+        served_file = _served_file(request, response)
+        if served_file is None:
+            length = response.content_length
+            if length is not None and length < min_size:
+                return response
+        vary = tuple(response.vary or ())
+        if 'accept-encoding' not in [name.lower() for name in vary]:
+            response.vary = vary + ('Accept-Encoding',)
+        encoding = _accepted_encoding(
+            request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+        if served_file is not None:
+            file_name = getattr(served_file, 'name', None)
+            if encoding == 'gzip' and isinstance(file_name, str):
+                _use_precompressed(request, response, file_name)
+            return response
+        if encoding == 'gzip':
+            compressor = zlib.compressobj(level, zlib.DEFLATED,
+                                          16 + zlib.MAX_WBITS)
+        else:
+            compressor = zlib.compressobj(level)
+        if response.content_length is not None:
+            response.body = compressor.compress(response.body) + \
+                compressor.flush()
+        elif request.method != 'HEAD':
+            # the body of a response to a HEAD request is never sent, so
+            # only its headers need to match those of a GET request
+            response.app_iter = _compressed(response.app_iter, compressor)
+        response.content_encoding = encoding
+        etag = response.headers.get('ETag')
+        if etag is not None and not etag.startswith('W/'):
+            # the compressed body isn't byte for byte the same anymore
+            response.headers['ETag'] = 'W/' + etag
+        return response
+
+    return compression_tween
+
+def _compressible(request, response, types):
+    if response.content_encoding:
+        return False
+    if response.status_int in (204, 206, 304) or response.status_int < 200:
+        return False
+    if response.cache_control.no_transform:
+        return False
+    content_type = (response.content_type or '').lower()
+    for compressible in types:
+        if compressible.endswith('/'):
+            if content_type.startswith(compressible):
+                return True
+        elif content_type == compressible:
+            return True
+    return False
+
+def _accepted_encoding(header):
+    # the compressed content coding most preferred by an Accept-Encoding
+    # header, if it accepts any
+    qualities = {}
+    for item in header.split(','):
+        params = item.split(';')
+        name = params[0].strip().lower()
+        quality = 1.0
+        for param in params[1:]:
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+    best = None
+    for encoding in ('gzip', 'deflate'):
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > 0 and (best is None or quality > best[0]):
+            best = (quality, encoding)
+    if best is not None:
+        return best[1]
+
+def _served_file(request, response):
+    # the file served by the response, if it is served by a FileIter or by
+    # the server's wsgi.file_wrapper
+    app_iter = response.app_iter
+    if isinstance(app_iter, FileIter):
+        return app_iter.file
+    file_wrapper = request.environ.get('wsgi.file_wrapper')
+    if isinstance(file_wrapper, type) and isinstance(app_iter, file_wrapper):
+        return getattr(app_iter, 'filelike', app_iter)
+
+def _use_precompressed(request, response, file_name):
+    compressed_name = file_name + '.gz'
+    try:
+        if os.path.getmtime(compressed_name) < os.path.getmtime(file_name):
+            return
+    except OSError:
+        return
+    compressed = FileResponse(compressed_name, request,
+                              content_type=response.content_type)
+    close = getattr(response.app_iter, 'close', None)
+    if close is not None:
+        close()
+    response.app_iter = compressed.app_iter
+    response.content_length = compressed.content_length
+    response.content_encoding = 'gzip'
+
+def _compressed(app_iter, compressor):
+    try:
+        for chunk in app_iter:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        close = getattr(app_iter, 'close', None)
+        if close is not None:
+            close()
+
 MAIN = 'MAIN'
 INGRESS = 'INGRESS'
 EXCVIEW = 'pyramid.tweens.excview_tween_factory'
@@ -1,4 +1,7 @@
 import re
+from itertools import islice
+
+from repoze.lru import LRUCache
 from zope.interface import implementer
 
 from pyramid.interfaces import (
@@ -15,6 +18,7 @@ from pyramid.compat import (
     binary_type,
     is_nonstr_iter,
     decode_path_info,
+    exec_,
     )
 
 from pyramid.exceptions import URLDecodeError
@@ -25,11 +29,16 @@ from pyramid.traversal import (
     )
 
 _marker = object()
+_unset = object()
 
 @implementer(IRoute)
 class Route(object):
+    # (view lookup cache, request interface, root factory), filled in by
+    # the router
+    _request_info = None
+
     def __init__(self, name, pattern, factory=None, predicates=(),
-                 pregenerator=None):
+                 pregenerator=None, host=None):
         self.pattern = pattern
         self.path = pattern # indefinite b/w compat, not in interface
         self.match, self.generate = _compile_route(pattern)
@@ -37,14 +46,46 @@ class Route(object):
         self.factory = factory
         self.predicates = predicates
         self.pregenerator = pregenerator
+        if host is not None:
+            if isinstance(host, string_types):
+                host = (host,)
+            host = tuple([h.lower() for h in host])
+        self.host = host
 
 @implementer(IRoutesMapper)
 class RoutesMapper(object):
-    def __init__(self):
+    """ Maps incoming requests to routes.
+
+    ``matching`` names the strategy used to find the first route which
+    matches a path.  ``prefix`` (the default) indexes routes by the literal
+    segments which begin their patterns.  ``regex`` compiles every route
+    into a single regular expression so that the C regex engine finds the
+    first structurally matching route.
+
+    Routes with a ``request_method`` predicate are only tried for requests
+    using one of the methods it accepts, and routes with a ``host`` are only
+    tried for requests to a matching host.
+
+    If ``cache_size`` is nonzero, up to that many paths are remembered
+    along with the route they matched, as long as neither that route nor any
+    other route which matched the path before it has predicates; the outcome
+    for such a path cannot depend on anything but the path itself.  The
+    cache's ``hits`` and ``misses`` counters are available via the
+    ``match_cache`` attribute."""
+    def __init__(self, matching='prefix', cache_size=0):
+        if matching not in route_indexes:
+            raise ValueError(
+                'Unknown route matching strategy %r (must be one of %s)' % (
+                    matching, ', '.join(sorted(route_indexes))))
+        self.matching = matching
+        self.match_cache = None
+        if cache_size:
+            self.match_cache = LRUCache(cache_size)
         self.routelist = []
         self.static_routes = []
 
         self.routes = {}
+        self._indexes = None
 
     def has_routes(self):
         return bool(self.routelist)
@@ -59,24 +100,77 @@ class RoutesMapper(object):
         return self.routes.get(name)
 
     def connect(self, name, pattern, factory=None, predicates=(),
-                pregenerator=None, static=False):
+                pregenerator=None, static=False, host=None):
         if name in self.routes:
             oldroute = self.routes[name]
             if oldroute in self.routelist:
                 self.routelist.remove(oldroute)
 
-        route = Route(name, pattern, factory, predicates, pregenerator)
+        route = Route(name, pattern, factory, predicates, pregenerator,
+                      host=host)
         if not static:
             self.routelist.append(route)
         else:
             self.static_routes.append(route)
 
         self.routes[name] = route
+        self._indexes = None
+        if self.match_cache is not None:
+            self.match_cache.clear()
         return route
 
     def generate(self, name, kw):
         return self.routes[name].generate(kw)
 
+    def _get_index(self, environ):
+        # the indexes are built lazily and thrown away by ``connect``, so
+        # routes added during a configuration commit cost nothing until the
+        # first request is matched
+        if self._indexes is None:
+            self._prepare()
+        method = environ.get('REQUEST_METHOD')
+        if method not in self._methods:
+            # methods no route asks for share the method-agnostic index
+            method = None
+        hosts = _no_hosts
+        if self._host_patterns:
+            hosts = _request_hosts(environ, self._host_patterns)
+        key = (hosts, method)
+        index = self._indexes.get(key)
+        if index is None:
+            # the routes which accept this host and method, plus the host-
+            # and method-agnostic ones, in the order they were connected
+            routes = [
+                route for route, rhosts, rmethods in self._entries
+                if (rhosts is None or not rhosts.isdisjoint(hosts)) and
+                   (rmethods is None or method in rmethods)
+                ]
+            factory = route_indexes[self.matching]
+            index = self._indexes[key] = factory(routes)
+        return index
+
+    def _prepare(self):
+        entries = []
+        methods = set()
+        host_patterns = set()
+        checks = {}
+        for route in self.routelist:
+            rmethods = _request_methods(route)
+            if rmethods is not None:
+                methods.update(rmethods)
+            rhosts = getattr(route, 'host', None)
+            if rhosts is not None:
+                rhosts = frozenset(rhosts)
+                host_patterns.update(rhosts)
+            entries.append((route, rhosts, rmethods))
+            if route.predicates:
+                checks[route] = _compile_predicates(route.predicates)
+        self._entries = entries
+        self._methods = methods
+        self._host_patterns = host_patterns
+        self._checks = checks
+        self._indexes = {}
+
     def __call__(self, request):
         environ = request.environ
         try:
@@ -87,17 +181,320 @@ class RoutesMapper(object):
         except UnicodeDecodeError as e:
             raise URLDecodeError(e.encoding, e.object, e.start, e.end, e.reason)
 
-        for route in self.routelist:
+        index = self._get_index(environ)
+
+        cache = self.match_cache
+        if cache is not None:
+            # routes skipped for this host or method do not count as
+            # predicated, so a path may have a different outcome in each
+            # index
+            key = (index, path)
+            cached = cache.get(key)
+            if cached is not None:
+                route, match = cached
+                return {'match':dict(match), 'route':route}
+
+        checks = self._checks
+        cacheable = cache is not None
+        info = {'match':None, 'route':None}
+        for route in index.candidates(path):
             match = route.match(path)
             if match is not None:
-                preds = route.predicates
-                info = {'match':match, 'route':route}
-                if preds and not all((p(info, request) for p in preds)):
-                    continue
+                info['match'] = match
+                info['route'] = route
+                check = checks.get(route)
+                if check is not None:
+                    cacheable = False
+                    if not check(info, request):
+                        continue
+                if cacheable:
+                    # copy() rather than dict(): the values of a Match are
+                    # only guaranteed to be extracted by its own methods
+                    cache.put(key, (route, match.copy()))
                 return info
 
         return {'route':None, 'match':None}
 
+_no_hosts = frozenset()
+
+def _request_hosts(environ, patterns):
+    # the host patterns among ``patterns`` matched by the request's host: the
+    # host itself and every ``*.``-prefixed suffix of it
+    host = environ.get('HTTP_HOST') or environ.get('SERVER_NAME', '')
+    host = host.lower()
+    if ':' in host and not host.endswith(']'):
+        host = host.rsplit(':', 1)[0]
+    hosts = []
+    if host in patterns:
+        hosts.append(host)
+    labels = host.split('.')
+    for i in range(1, len(labels)):
+        wildcard = '*.' + '.'.join(labels[i:])
+        if wildcard in patterns:
+            hosts.append(wildcard)
+    if not hosts:
+        return _no_hosts
+    return frozenset(hosts)
+
+def _request_methods(route):
+    # the request methods accepted by the route's request_method predicate,
+    # or None if it accepts any method
+    from pyramid.config.predicates import RequestMethodPredicate # circdep
+    methods = None
+    for predicate in route.predicates:
+        if isinstance(predicate, RequestMethodPredicate):
+            if methods is None:
+                methods = set(predicate.val)
+            else:
+                methods.intersection_update(predicate.val)
+    return methods
+
+class Match(dict):
+    """ The :term:`matchdict` of a route which matched a path.
+
+    A ``Match`` is a dictionary which holds on to the regular expression
+    match object and its route's table of keys, and only extracts the value
+    of a key (splitting a ``*stararg`` value into a tuple of segments) the
+    first time that value is read.  Its keys are always present, so
+    membership tests, length and key iteration cost nothing extra; every
+    value is extracted as soon as the values are read in bulk or the
+    dictionary is copied or compared.
+
+    On Python 2, whose C code reads the values of a dictionary directly when
+    it is copied or passed as ``**kw``, every value is extracted up front."""
+    __slots__ = ('_match', '_keys')
+
+    def __init__(self, match, keys, template):
+        # ``keys`` maps each key to its group index in ``match`` and whether
+        # it is a stararg, ``template`` maps each key to ``_unset``; both
+        # are shared by every match of the same route
+        dict.update(self, template)
+        self._match = match
+        self._keys = keys
+        if not PY3: # pragma: no cover
+            self._load()
+
+    def _extract(self, key):
+        index, stararg = self._keys[key]
+        value = self._match.group(index)
+        if stararg:
+            value = split_path_info(value)
+        dict.__setitem__(self, key, value)
+        return value
+
+    def _load(self):
+        if self._match is not None:
+            for key, value in list(dict.items(self)):
+                if value is _unset:
+                    self._extract(key)
+            self._match = None
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if value is _unset:
+            value = self._extract(key)
+        return value
+
+    def get(self, key, default=None):
+        value = dict.get(self, key, default)
+        if value is _unset:
+            value = self._extract(key)
+        return value
+
+    def setdefault(self, key, default=None):
+        value = dict.setdefault(self, key, default)
+        if value is _unset:
+            value = self._extract(key)
+        return value
+
+    def __iter__(self):
+        # overriding __iter__ makes C code which copies dictionaries (e.g.
+        # ``dict(match)`` or ``**match``) use __getitem__ instead of reading
+        # the values directly
+        return dict.__iter__(self)
+
+    def pop(self, *arg):
+        self._load()
+        return dict.pop(self, *arg)
+
+    def popitem(self):
+        self._load()
+        return dict.popitem(self)
+
+    def values(self):
+        self._load()
+        return dict.values(self)
+
+    def items(self):
+        self._load()
+        return dict.items(self)
+
+    if not PY3: # pragma: no cover
+        def itervalues(self):
+            self._load()
+            return dict.itervalues(self)
+
+        def iteritems(self):
+            self._load()
+            return dict.iteritems(self)
+
+    def copy(self):
+        self._load()
+        return dict.copy(self)
+
+    def __eq__(self, other):
+        self._load()
+        if isinstance(other, Match):
+            other._load()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._load()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        return (dict, (self.copy(),))
+
+def _compile_predicates(predicates):
+    """ Return a single callable accepting ``info`` and ``request`` which
+    returns ``True`` if every predicate in ``predicates`` does.  The tests
+    made by ``request_method``, ``xhr`` and ``header`` predicates are
+    inlined and made first, cheapest first (as measured); every other
+    predicate is called in its original order after them. """
+    from pyramid.config.predicates import ( # circdep
+        HeaderPredicate,
+        RequestMethodPredicate,
+        XHRPredicate,
+        )
+    namespace = {}
+    inlined = []
+    called = []
+    for i, predicate in enumerate(predicates):
+        p = 'p%d' % i
+        namespace[p] = predicate
+        cls = predicate.__class__
+        if cls is RequestMethodPredicate:
+            inlined.append((0, [
+                'if request.method not in %s.val:' % p,
+                ]))
+        elif cls is XHRPredicate:
+            inlined.append((1, [
+                'if bool(request.is_xhr) is not %s.val:' % p,
+                ]))
+        elif cls is HeaderPredicate and predicate.val is None:
+            inlined.append((2, [
+                'if %s.name not in request.headers:' % p,
+                ]))
+        elif cls is HeaderPredicate:
+            inlined.append((3, [
+                'value = request.headers.get(%s.name)' % p,
+                'if value is None or %s.val.match(value) is None:' % p,
+                ]))
+        else:
+            called.append(['if not %s(info, request):' % p])
+    inlined.sort(key=lambda item: item[0]) # stable
+    body = []
+    for lines in [lines for cost, lines in inlined] + called:
+        body.extend(lines)
+        body.append('    return False')
+    source = 'def check(info, request):\n%s\n    return True\n' % (
+        '\n'.join('    ' + line for line in body))
+    exec_(source, namespace)
+    return namespace['check']
+
+class _PrefixTrie(object):
+    """ A radix tree of routes keyed on the complete literal path segments
+    which begin each route pattern (e.g. ``/users/{id}/edit`` is filed under
+    ``users``; ``/static/*subpath`` under ``static``).  A route can only ever
+    match a path which begins with the same segments, so walking the tree
+    along the segments of the path yields every route which could possibly
+    match it.  Candidates are returned in the order in which they were
+    connected, which preserves first-match-wins semantics. """
+    def __init__(self, routes):
+        self.root = ({}, [])
+        for order, route in enumerate(routes):
+            segments = _literal_prefix(route.pattern).split('/')[1:-1]
+            node = self.root
+            for segment in segments:
+                children = node[0]
+                node = children.get(segment)
+                if node is None:
+                    node = children[segment] = ({}, [])
+            node[1].append((order, route))
+
+    def candidates(self, path):
+        node = self.root
+        found = [node[1]] if node[1] else []
+        # only segments followed by a slash are complete; the last segment
+        # of the path can never satisfy a route which needs a slash after it
+        for segment in path.split('/')[1:-1]:
+            node = node[0].get(segment)
+            if node is None:
+                break
+            if node[1]:
+                found.append(node[1])
+        if len(found) == 1:
+            return [route for order, route in found[0]]
+        entries = []
+        for each in found:
+            entries.extend(each)
+        entries.sort(key=lambda entry: entry[0])
+        return [route for order, route in entries]
+
+class _CombinedRegex(object):
+    """ Routes compiled into one alternation per chunk of routes, with one
+    capturing marker group around each route's expression.  A single regex
+    call finds the first route whose pattern matches a path; the caller
+    continues with ordinary per-route matching from that route onward when
+    its predicates reject the request. """
+    # Python 2 refuses expressions with more than 100 groups
+    max_groups = 99
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.chunks = []
+        sources = []
+        markers = {}
+        ngroups = 0
+        for order, route in enumerate(routes):
+            source = _anonymous_route_regex(route.pattern)
+            if source is not None:
+                groups = re.compile(source).groups
+            if source is None or groups >= self.max_groups:
+                # an expression we cannot safely embed; its empty marker
+                # makes it a candidate for every path
+                source, groups = '', 0
+            if ngroups + groups + 1 > self.max_groups:
+                self._add_chunk(sources, markers)
+                sources, markers, ngroups = [], {}, 0
+            markers[ngroups + 1] = order
+            ngroups += groups + 1
+            sources.append('(%s)' % source)
+        if sources:
+            self._add_chunk(sources, markers)
+
+    def _add_chunk(self, sources, markers):
+        self.chunks.append((re.compile('|'.join(sources)).match, markers))
+
+    def candidates(self, path):
+        for match, markers in self.chunks:
+            m = match(path)
+            if m is not None:
+                # the marker group encloses its route's own groups, so it is
+                # always the last group to close
+                return islice(self.routes, markers[m.lastindex], None)
+        return ()
+
+route_indexes = {
+    'prefix': _PrefixTrie,
+    'regex': _CombinedRegex,
+    }
+
 # stolen from bobo and modified
 old_route_re = re.compile(r'(\:[_a-zA-Z]\w*)')
 star_at_end = re.compile(r'\*(\w*)$')
@@ -112,7 +509,7 @@ def update_pattern(matchobj):
     name = matchobj.group(0)
     return '{%s}' % name[1:]
 
-def _compile_route(route):
+def _normalize_route(route):
     # This function really wants to consume Unicode patterns natively, but if
     # someone passes us a bytestring, we allow it by converting it to Unicode
     # using the ASCII decoding.  We decode it using ASCII because we don't
@@ -137,20 +534,58 @@ def _compile_route(route):
     if star_at_end.search(route):
         route, remainder = route.rsplit('*', 1)
 
+    return route, remainder
+
+def _literal_prefix(route):
+    """ Return the literal text which every path matched by the route
+    pattern ``route`` must begin with (the text before its first
+    replacement marker). """
+    route, remainder = _normalize_route(route)
+    return route_re.split(route)[0]
+
+# group references would point at the wrong groups once a route's
+# expression is embedded in a larger one
+group_reference_re = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+
+def _anonymous_route_regex(route):
+    """ Return the source of a regular expression which matches the same
+    paths as the route pattern ``route`` but which defines no named groups,
+    or ``None`` if its replacement marker expressions cannot be embedded in
+    another expression. """
+    route, remainder = _normalize_route(route)
+    pat = route_re.split(route)
+    rpat = [re.escape(pat[0])]
+    for name, s in zip(pat[1::2], pat[2::2]):
+        name = name[1:-1]
+        if ':' in name:
+            reg = name.split(':', 1)[1]
+            if '(?P<' in reg or group_reference_re.search(reg):
+                return None
+        else:
+            reg = '[^/]+'
+        rpat.append('(?:%s)' % reg)
+        if s:
+            rpat.append(re.escape(s))
+    if remainder:
+        rpat.append('.*?')
+    return ''.join(rpat) + '$'
+
+def _compile_route(route):
+    route, remainder = _normalize_route(route)
+
     pat = route_re.split(route)
 
     # every element in "pat" will be Unicode (regardless of whether the
     # route_re regex pattern is itself Unicode or str)
     pat.reverse()
     rpat = []
-    gen = []
+    literals = []
+    names = []
     prefix = pat.pop() # invar: always at least one element (route='/'+route)
 
     # We want to generate URL-encoded URLs, so we url-quote the prefix, being
-    # careful not to quote any embedded slashes.  We have to replace '%' with
-    # '%%' afterwards, as the strings that go into "gen" are used as string
-    # replacement targets.
-    gen.append(quote_path_segment(prefix, safe='/').replace('%', '%%')) # native
+    # careful not to quote any embedded slashes.
+    literals.append(quote_path_segment(prefix, safe='/')) # native
     rpat.append(re.escape(prefix)) # unicode
 
     while pat:
@@ -162,26 +597,34 @@ def _compile_route(route):
             name, reg = name.split(':', 1)
         else:
             reg = '[^/]+'
-        gen.append('%%(%s)s' % native_(name)) # native
+        names.append(native_(name)) # native
         name = '(?P<%s>%s)' % (name, reg) # unicode
         rpat.append(name)
         s = pat.pop() # unicode
         if s:
             rpat.append(re.escape(s)) # unicode
-            # We want to generate URL-encoded URLs, so we url-quote this
-            # literal in the pattern, being careful not to quote the embedded
-            # slashes.  We have to replace '%' with '%%' afterwards, as the
-            # strings that go into "gen" are used as string replacement
-            # targets.  What is appended to gen is a native string.
-            gen.append(quote_path_segment(s, safe='/').replace('%', '%%'))
+        # We want to generate URL-encoded URLs, so we url-quote this literal
+        # in the pattern, being careful not to quote the embedded slashes.
+        # What is appended to literals is a native string.
+        literals.append(quote_path_segment(s, safe='/'))
 
     if remainder:
         rpat.append('(?P<%s>.*?)' % remainder) # unicode
-        gen.append('%%(%s)s' % native_(remainder)) # native
+        names.append(native_(remainder)) # native
+        literals.append('')
 
     pattern = ''.join(rpat) + '$' # unicode
 
-    match = re.compile(pattern).match
+    regex = re.compile(pattern)
+    match = regex.match
+    # group names will be Unicode; 2.6.4 and lower doesnt accept unicode
+    # kwargs as **kw, so we explicitly cast the keys to native strings in
+    # case someone wants to pass the matchdict as **kw
+    keys = dict(
+        (native_(k, 'ascii'), (index, k == remainder))
+        for k, index in regex.groupindex.items()
+        )
+    template = dict.fromkeys(keys, _unset)
     def matcher(path):
         # This function really wants to consume Unicode patterns natively,
         # but if someone passes us a bytestring, we allow it by converting it
@@ -194,51 +637,83 @@ def _compile_route(route):
         m = match(path)
         if m is None:
             return None
-        d = {}
-        for k, v in m.groupdict().items():
-            # k and v will be Unicode 2.6.4 and lower doesnt accept unicode
-            # kwargs as **kw, so we explicitly cast the keys to native
-            # strings in case someone wants to pass the result as **kw
-            nk = native_(k, 'ascii')
-            if k == remainder:
-                d[nk] = split_path_info(v)
-            else:
-                d[nk] = v
-        return d
-
-    gen = ''.join(gen)
-    def generator(dict):
-        newdict = {}
-        for k, v in dict.items():
-            if PY3:
-                if v.__class__ is binary_type:
-                    # url_quote below needs a native string, not bytes on Py3
-                    v = v.decode('utf-8')
-            else:
-                if v.__class__ is text_type:
-                    # url_quote below needs bytes, not unicode on Py2
-                    v = v.encode('utf-8')
-
-            if k == remainder:
-                # a stararg argument
-                if is_nonstr_iter(v):
-                    v = '/'.join(
-                        [quote_path_segment(x, safe='/') for x in v]
-                        ) # native
-                else:
-                    if v.__class__ not in string_types:
-                        v = str(v)
-                    v = quote_path_segment(v, safe='/')
-            else:
-                if v.__class__ not in string_types:
-                    v = str(v)
-                # v may be bytes (py2) or native string (py3)
-                v = quote_path_segment(v, safe='/')
+        return Match(m, keys, template)
 
-            # at this point, the value will be a native string
-            newdict[k] = v
-
-        result = gen % newdict # native string result
-        return result
+    generator = _make_generator(literals, names, remainder)
 
     return matcher, generator
+
+# characters which url-quoting a path segment with safe='/' leaves alone on
+# every supported version of Python
+safe_segment_match = re.compile(r'[A-Za-z0-9_.\-/]*\Z').match
+
+def _quote_segment(v):
+    if PY3:
+        if v.__class__ is binary_type:
+            # url_quote below needs a native string, not bytes on Py3
+            v = v.decode('utf-8')
+    else:
+        if v.__class__ is text_type:
+            # url_quote below needs bytes, not unicode on Py2
+            v = v.encode('utf-8')
+    if v.__class__ not in string_types:
+        v = str(v)
+    # v may be bytes (py2) or native string (py3)
+    return quote_path_segment(v, safe='/') # native
+
+def _quote_remainder_segment(v):
+    return quote_path_segment(v, safe='/')
+
+def _quote_remainder(v):
+    # a stararg argument
+    if PY3:
+        if v.__class__ is binary_type:
+            v = v.decode('utf-8')
+    else:
+        if v.__class__ is text_type:
+            v = v.encode('utf-8')
+    if is_nonstr_iter(v):
+        return '/'.join(map(_quote_remainder_segment, v)) # native
+    if v.__class__ not in string_types:
+        v = str(v)
+    return quote_path_segment(v, safe='/')
+
+def _make_generator(literals, names, remainder):
+    """ Return a function which generates a path from a dictionary of
+    replacement marker values.  ``literals`` holds the url-quoted text
+    before, between and after the markers named in ``names``.  The function
+    is generated from source so that each marker gets its own local slot and
+    no loop over the dictionary is needed; ``int`` values and native strings
+    which quoting would not change skip quoting altogether. """
+    namespace = {
+        'quote':_quote_segment,
+        'quote_remainder':_quote_remainder,
+        'safe':safe_segment_match,
+        }
+    body = []
+    parts = []
+    for i, name in enumerate(names):
+        literal = literals[i]
+        if literal:
+            namespace['l%d' % i] = literal
+            parts.append('l%d' % i)
+        slot = 'v%d' % i
+        body.append('    %s = kw[%r]' % (slot, name))
+        if name == remainder:
+            body.append('    %s = quote_remainder(%s)' % (slot, slot))
+        else:
+            body.append('    if %s.__class__ is str:' % slot)
+            body.append('        if not safe(%s):' % slot)
+            body.append('            %s = quote(%s)' % (slot, slot))
+            body.append('    elif %s.__class__ is int:' % slot)
+            body.append('        %s = str(%s)' % (slot, slot))
+            body.append('    else:')
+            body.append('        %s = quote(%s)' % (slot, slot))
+        parts.append(slot)
+    namespace['tail'] = literals[-1]
+    if literals[-1] or not parts:
+        parts.append('tail')
+    source = 'def generator(kw):\n%s\n    return %s\n' % (
+        '\n'.join(body), ' + '.join(parts))
+    exec_(source, namespace)
+    return namespace['generator']
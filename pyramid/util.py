@@ -84,28 +84,36 @@ class InstancePropertyHelper(object):
         """
         attrs = dict(properties)
         if attrs:
-            parent = target.__class__
-            newcls = type(parent.__name__, (parent, object), attrs)
-            # We assign __provides__ and __implemented__ below to prevent a
-            # memory leak that results from from the usage of this instance's
-            # eventual use in an adapter lookup.  Adapter lookup results in
-            # ``zope.interface.implementedBy`` being called with the
-            # newly-created class as an argument.  Because the newly-created
-            # class has no interface specification data of its own, lookup
-            # causes new ClassProvides and Implements instances related to our
-            # just-generated class to be created and set into the newly-created
-            # class' __dict__.  We don't want these instances to be created; we
-            # want this new class to behave exactly like it is the parent class
-            # instead.  See GitHub issues #1212, #1529 and #1568 for more
-            # information.
-            for name in ('__implemented__', '__provides__'):
-                # we assign these attributes conditionally to make it possible
-                # to test this class in isolation without having any interfaces
-                # attached to it
-                val = getattr(parent, name, _marker)
-                if val is not _marker:
-                    setattr(newcls, name, val)
-            target.__class__ = newcls
+            target.__class__ = cls.make_class(target.__class__, attrs)
+
+    @classmethod
+    def make_class(cls, parent, properties):
+        """Return a new subclass of ``parent`` which has the ``properties``
+        (a list or dict generated from :meth:`.make_property`) as class
+        attributes, suitable for assignment to the ``__class__`` of an
+        instance of ``parent``.
+        """
+        newcls = type(parent.__name__, (parent, object), dict(properties))
+        # We assign __provides__ and __implemented__ below to prevent a
+        # memory leak that results from from the usage of this instance's
+        # eventual use in an adapter lookup.  Adapter lookup results in
+        # ``zope.interface.implementedBy`` being called with the
+        # newly-created class as an argument.  Because the newly-created
+        # class has no interface specification data of its own, lookup
+        # causes new ClassProvides and Implements instances related to our
+        # just-generated class to be created and set into the newly-created
+        # class' __dict__.  We don't want these instances to be created; we
+        # want this new class to behave exactly like it is the parent class
+        # instead.  See GitHub issues #1212, #1529 and #1568 for more
+        # information.
+        for name in ('__implemented__', '__provides__'):
+            # we assign these attributes conditionally to make it possible
+            # to test this class in isolation without having any interfaces
+            # attached to it
+            val = getattr(parent, name, _marker)
+            if val is not _marker:
+                setattr(newcls, name, val)
+        return newcls
 
     @classmethod
     def set_property(cls, target, callable, name=None, reify=False):
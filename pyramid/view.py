@@ -1,10 +1,16 @@
 import itertools
 import venusian
 
-from zope.interface import providedBy
+from zope.interface import (
+    implementedBy,
+    providedBy,
+    )
 
 from pyramid.interfaces import (
+    IExceptionViewClassifier,
+    IRootFactory,
     IRoutesMapper,
+    IRouteRequest,
     IMultiView,
     ISecuredView,
     IView,
@@ -12,7 +18,10 @@ from pyramid.interfaces import (
     IRequest,
     )
 
-from pyramid.compat import decode_path_info
+from pyramid.compat import (
+    class_types,
+    decode_path_info,
+    )
 
 from pyramid.exceptions import PredicateMismatch
 
@@ -22,6 +31,7 @@ from pyramid.httpexceptions import (
     )
 
 from pyramid.threadlocal import get_current_registry
+from pyramid.traversal import DefaultRootFactory
 
 _marker = object()
 
@@ -165,7 +175,8 @@ class view_config(object):
     ``request_type``, ``route_name``, ``request_method``, ``request_param``,
     ``containment``, ``xhr``, ``accept``, ``header``, ``path_info``,
     ``custom_predicates``, ``decorator``, ``mapper``, ``http_cache``,
-    ``match_param``, ``csrf_token``, ``physical_path``, and ``predicates``.
+    ``response_cache``, ``etag``, ``etag_key``, ``match_param``,
+    ``csrf_token``, ``physical_path``, and ``predicates``.
 
     The meanings of these arguments are the same as the arguments passed to
     :meth:`pyramid.config.Configurator.add_view`.  If any argument is left
@@ -469,35 +480,120 @@ def _find_views(
         view_types = (IView, ISecuredView, IMultiView)
     if view_classifier is None:
         view_classifier = IViewClassifier
-    registered = registry.adapters.registered
     cache = registry._view_lookup_cache
     views = cache.get((request_iface, context_iface, view_name))
     if views is None:
-        views = []
-        for req_type, ctx_type in itertools.product(
-            request_iface.__sro__, context_iface.__sro__
-        ):
-            source_ifaces = (view_classifier, req_type, ctx_type)
-            for view_type in view_types:
-                view_callable = registered(
-                    source_ifaces,
-                    view_type,
-                    name=view_name,
-                )
-                if view_callable is not None:
-                    views.append(view_callable)
+        miss_cache = registry.view_miss_cache
+        if (miss_cache is not None and
+            miss_cache.get((request_iface, context_iface, view_name))):
+            return []
+        views = _lookup_views(
+            registry,
+            request_iface,
+            context_iface,
+            view_name,
+            view_types,
+            view_classifier,
+            )
         if views:
-            # do not cache view lookup misses.  rationale: dont allow cache to
-            # grow without bound if somebody tries to hit the site with many
-            # missing URLs.  we could use an LRU cache instead, but then
-            # purposeful misses by an attacker would just blow out the cache
-            # anyway. downside: misses will almost always consume more CPU than
-            # hits in steady state.
             with registry._lock:
                 cache[(request_iface, context_iface, view_name)] = views
+        elif miss_cache is not None:
+            # do not cache view lookup misses alongside the hits.  rationale:
+            # dont allow the cache to grow without bound if somebody tries to
+            # hit the site with many missing URLs.  misses go to a bounded LRU
+            # cache instead, which purposeful misses by an attacker can only
+            # churn.
+            miss_cache.put((request_iface, context_iface, view_name), True)
 
     return views
 
+def _lookup_views(
+    registry,
+    request_iface,
+    context_iface,
+    view_name,
+    view_types,
+    view_classifier,
+    ):
+    registered = registry.adapters.registered
+    views = []
+    for req_type, ctx_type in itertools.product(
+        request_iface.__sro__, context_iface.__sro__
+    ):
+        source_ifaces = (view_classifier, req_type, ctx_type)
+        for view_type in view_types:
+            view_callable = registered(
+                source_ifaces,
+                view_type,
+                name=view_name,
+            )
+            if view_callable is not None:
+                views.append(view_callable)
+    return views
+
+def _precompute_views(registry):
+    """ Fill the view lookup cache of ``registry`` with the views found for
+    every combination of a request interface and a context interface which
+    have views registered under the same view name, so that requests need
+    not look them up in the adapter registry.  Besides the registered
+    context interfaces, the context interfaces looked up at runtime are
+    those provided by the instances of class contexts and of class root
+    factories, such as the default root factory.  Context interfaces with
+    exception views are left alone: the view lookup cache is shared by
+    view lookups for exceptions, which use a different classifier."""
+    view_types = (IView, ISecuredView, IMultiView)
+    request_ifaces = set([IRequest])
+    for reg in registry.registeredUtilities():
+        if reg.provided is IRouteRequest:
+            request_ifaces.add(reg.component)
+    contexts = set()
+    exception_contexts = set()
+    names = {}
+    for reg in registry.registeredAdapters():
+        if reg.provided not in view_types or len(reg.required) != 3:
+            continue
+        classifier, req_type, ctx_type = reg.required
+        if classifier is IExceptionViewClassifier:
+            exception_contexts.add(ctx_type)
+        elif classifier is IViewClassifier:
+            req_types, ctx_types = names.setdefault(reg.name, (set(), set()))
+            req_types.add(req_type)
+            ctx_types.add(ctx_type)
+            request_ifaces.add(req_type)
+            contexts.add(ctx_type)
+    factories = [registry.queryUtility(IRootFactory,
+                                       default=DefaultRootFactory)]
+    mapper = registry.queryUtility(IRoutesMapper)
+    if mapper is not None:
+        factories.extend(route.factory for route in mapper.get_routes())
+    for factory in factories:
+        if isinstance(factory, class_types):
+            contexts.add(implementedBy(factory))
+    contexts -= exception_contexts
+
+    table = {}
+    for view_name, (req_types, ctx_types) in names.items():
+        for request_iface in request_ifaces:
+            if req_types.isdisjoint(request_iface.__sro__):
+                continue
+            for context_iface in contexts:
+                if ctx_types.isdisjoint(context_iface.__sro__):
+                    continue
+                views = _lookup_views(
+                    registry,
+                    request_iface,
+                    context_iface,
+                    view_name,
+                    view_types,
+                    IViewClassifier,
+                    )
+                if views:
+                    table[(request_iface, context_iface, view_name)] = views
+
+    registry._clear_view_lookup_cache()
+    registry._view_lookup_cache.update(table)
+
 def _call_view(
     registry,
     request,
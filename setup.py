@@ -40,7 +40,7 @@ except IOError:
 install_requires=[
     'setuptools',
     'WebOb >= 1.3.1', # request.domain and CookieProfile
-    'repoze.lru >= 0.4', # py3 compat
+    'repoze.lru >= 0.6', # LRUCache statistics
     'zope.interface >= 3.8.0',  # has zope.interface.registry
     'zope.deprecation >= 3.5.0', # py3 compat
     'venusian >= 1.0a3', # ``ignore``